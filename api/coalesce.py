@@ -0,0 +1,56 @@
+import threading
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it."""
+
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result = None
+        self.error  = None
+        self.shared = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent computations.
+
+    The first caller for a key runs the computation; callers arriving with the
+    same key while it is still running wait for it and receive the same result
+    (or the same exception) instead of repeating the work. Nothing is kept once
+    the computation finishes, so the next call for that key runs afresh.
+    """
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._calls: dict = {}
+        self.stats  = {'calls': 0, 'shared': 0}
+
+    def do(self, key, fn):
+        """Return fn(), sharing one run of it among concurrent callers with the same key."""
+        with self._lock:
+            self.stats['calls'] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.shared += 1
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -0,0 +1,65 @@
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class ConfigStore:
+    """
+    Cached, write-serialized access to securities_config.json.
+
+    load() parses the file once and serves the parsed dict until the file's
+    mtime or size changes (so hand edits are still picked up); a cache hit
+    costs one stat. Writes go through edit(), which holds a lock for the whole
+    read-modify-write and replaces the file atomically via a temp file, so
+    concurrent edits cannot interleave and readers never see a partial file.
+
+    Parameters
+    ----------
+    path : Path
+        The JSON config file.
+    """
+
+    def __init__(self, path: Path):
+        self.path   = Path(path)
+        self._lock  = threading.Lock()
+        self._data  = None
+        self._stamp = None   # (mtime_ns, size) the cached data was read at
+
+    def load(self) -> dict:
+        """The parsed config. Shared between callers: treat it as read-only."""
+        stamp = self._stat()
+        data = self._data
+        if data is None or stamp != self._stamp:
+            with self._lock:
+                data = self._read()
+        return data
+
+    @contextmanager
+    def edit(self):
+        """
+        Yield a private copy of the config to modify; it is written back when
+        the block exits normally and discarded if the block raises.
+        """
+        with self._lock:
+            data = copy.deepcopy(self._read())
+            yield data
+            text = json.dumps(data, indent=2)
+            tmp  = self.path.with_suffix('.tmp')
+            tmp.write_text(text)
+            os.replace(tmp, self.path)
+            self._data, self._stamp = data, self._stat()
+
+    def _read(self) -> dict:
+        """Current config, re-parsing the file if it changed (lock held)."""
+        stamp = self._stat()
+        if self._data is None or stamp != self._stamp:
+            self._data  = json.loads(self.path.read_text())
+            self._stamp = stamp
+        return self._data
+
+    def _stat(self) -> tuple:
+        st = self.path.stat()
+        return st.st_mtime_ns, st.st_size
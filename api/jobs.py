@@ -0,0 +1,250 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import Counter
+
+
+# Lower runs first; equal priorities run in submission order
+PRIORITY_SHORT = 0
+PRIORITY_LONG  = 1
+
+FINISHED = ('done', 'error', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised from a job's own progress hook to stop work that has no cancel_event support."""
+
+
+class Job:
+    """
+    One unit of background work run by a JobScheduler.
+
+    work(progress_callback, emit, cancel_event) runs on a scheduler thread and
+    returns the result. progress_callback(current, total, status="") and
+    emit(name, payload) publish to every attached subscriber; emitted events
+    and the final outcome are also replayed to subscribers that attach later.
+    A job still running `timeout` seconds after it started is cancelled with
+    timeout_message as its error.
+    """
+
+    def __init__(self, job_id: str, kind: str, user: str, priority: int, work,
+                 timeout: float = None, timeout_message: str = "Timed out"):
+        self.id          = job_id
+        self.kind        = kind
+        self.user        = user
+        self.priority    = priority
+        self.work        = work
+        self.timeout     = timeout
+        self.timeout_message = timeout_message
+        self.status      = 'queued'
+        self.result      = None
+        self.error       = None
+        self.progress    = (0, 1, 'Queued')
+        self.cancel_event = threading.Event()
+        self.created_at  = time.time()
+        self.started_at  = None
+        self.finished_at = None
+        self._lock        = threading.Lock()
+        self._events      = []
+        self._subscribers = []
+
+    # ------------------------------------------------------------
+    # Publishing (scheduler thread)
+    # ------------------------------------------------------------
+    def report(self, current: int, total: int, status: str = "") -> None:
+        self._publish(('progress', current, total, status))
+
+    def emit(self, name: str, payload) -> None:
+        self._publish(('event', name, payload))
+
+    def _publish(self, item: tuple) -> None:
+        with self._lock:
+            if item[0] == 'progress':
+                self.progress = item[1:]
+            else:
+                self._events.append(item)
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def _finish(self, status: str, result=None, error: str = None) -> None:
+        self.status      = status
+        self.result      = result
+        self.error       = error
+        self.finished_at = time.time()
+        if status == 'done':
+            self._publish(('result', result))
+        elif status == 'error':
+            self._publish(('error', error))
+        else:
+            self._publish(('cancelled', error))
+        with self._lock:
+            self._subscribers.clear()
+
+    # ------------------------------------------------------------
+    # Subscribing (event loop)
+    # ------------------------------------------------------------
+    def subscribe(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        """Queue of this job's items: replayed history first, then live updates."""
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            replay = [('progress', *self.progress)] + self._events
+            if self.status not in FINISHED:
+                self._subscribers.append((loop, queue))
+        for item in replay:
+            queue.put_nowait(item)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers = [(l, q) for l, q in self._subscribers if q is not queue]
+
+    def info(self) -> dict:
+        current, total, status = self.progress
+        return {
+            'job_id':      self.id,
+            'kind':        self.kind,
+            'user':        self.user,
+            'priority':    self.priority,
+            'status':      self.status,
+            'progress':    {'current': current, 'total': total, 'status': status},
+            'error':       self.error,
+            'created_at':  self.created_at,
+            'started_at':  self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobScheduler:
+    """
+    Fixed pool of worker threads fed from a priority queue.
+
+    Parameters
+    ----------
+    workers : int
+        Worker threads, i.e. jobs running at once across all users.
+    per_user : int
+        Jobs one user may have running at once; further jobs from that user
+        stay queued (without blocking other users' jobs) until one finishes.
+        Jobs submitted without a user ("") are not capped.
+    retention : float
+        Seconds a finished job stays available for status/result lookups.
+    """
+
+    def __init__(self, workers: int = 2, per_user: int = 1, retention: float = 3600.0):
+        self.per_user  = max(1, int(per_user))
+        self.retention = retention
+        self._cond     = threading.Condition()
+        self._queue: list = []
+        self._seq      = itertools.count()
+        self._jobs: dict[str, Job] = {}
+        self._running  = Counter()
+        for i in range(max(1, int(workers))):
+            threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True).start()
+
+    def submit(self, kind: str, work, user: str = "", priority: int = PRIORITY_LONG,
+               job_id: str = None, timeout: float = None,
+               timeout_message: str = "Timed out") -> Job:
+        """
+        Queue work and return its Job. If job_id names a job that is still
+        queued or running, that job is returned instead of starting another.
+        A job still running `timeout` seconds after it starts is cancelled,
+        whether or not anyone is attached to it.
+        """
+        with self._cond:
+            self._prune()
+            existing = self._jobs.get(job_id) if job_id else None
+            if existing is not None and existing.status not in FINISHED:
+                return existing
+            job = Job(job_id or uuid.uuid4().hex, kind, user, priority, work,
+                      timeout=timeout, timeout_message=timeout_message)
+            self._jobs[job.id] = job
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+            self._cond.notify()
+            return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        with self._cond:
+            self._prune()
+            return sorted(self._jobs.values(), key=lambda j: j.created_at)
+
+    def cancel(self, job_id: str, reason: str = "Cancelled") -> Job | None:
+        """Cancel a queued job outright, or signal a running one to stop."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            job.cancel_event.set()
+            if job.status == 'queued':
+                self._queue = [entry for entry in self._queue if entry[2] is not job]
+                heapq.heapify(self._queue)
+                job._finish('cancelled', error=reason)
+            else:
+                job.error = reason
+            return job
+
+    def position(self, job: Job) -> int | None:
+        """1-based place among queued jobs in run order, or None if not queued."""
+        with self._cond:
+            order = [j for _, _, j in sorted(self._queue)]
+        return order.index(job) + 1 if job in order else None
+
+    # ------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------
+    def _take(self) -> Job | None:
+        """Highest-priority queued job whose user is under the cap (lock held)."""
+        for entry in sorted(self._queue):
+            job = entry[2]
+            if not job.user or self._running[job.user] < self.per_user:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return job
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._take()
+                while job is None:
+                    self._cond.wait()
+                    job = self._take()
+                self._running[job.user] += 1
+                job.status     = 'running'
+                job.started_at = time.time()
+            deadline = None
+            if job.timeout is not None:
+                deadline = threading.Timer(job.timeout, self.cancel, (job.id, job.timeout_message))
+                deadline.daemon = True
+                deadline.start()
+            job.report(0, 1, 'Started')
+            try:
+                result = job.work(job.report, job.emit, job.cancel_event)
+                if job.cancel_event.is_set():
+                    job._finish('cancelled', error=job.error or "Cancelled")
+                else:
+                    job._finish('done', result)
+            except JobCancelled:
+                job._finish('cancelled', error=job.error or "Cancelled")
+            except Exception as exc:
+                job._finish('error', error=str(exc))
+            finally:
+                if deadline is not None:
+                    deadline.cancel()
+                with self._cond:
+                    self._running[job.user] -= 1
+                    self._cond.notify_all()
+
+    def _prune(self) -> None:
+        """Forget finished jobs past retention (lock held)."""
+        cutoff = time.time() - self.retention
+        for job_id in [j.id for j in self._jobs.values()
+                       if j.finished_at is not None and j.finished_at < cutoff]:
+            del self._jobs[job_id]
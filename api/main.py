@@ -1,16 +1,16 @@
 import os
 import sys
 import re
+import hashlib
 import json
 import math
 import asyncio
-import threading
+import time
+import uuid
 import requests as _requests
-import concurrent.futures
 import pandas as _pd
 from datetime import date as _date, datetime as _datetime
 from pathlib import Path
-from typing import AsyncGenerator
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
@@ -18,15 +18,19 @@ load_dotenv(Path(__file__).parent.parent / ".env.local", override=True)
 
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 CODE_DIR  = Path(__file__).resolve().parent.parent / "backend"
 INPUT_DIR = Path(__file__).resolve().parent.parent / "inputs"
+CACHE_DIR = Path(__file__).resolve().parent.parent / "cache"
 sys.path.insert(0, str(CODE_DIR))
 
-from data_source import ApiSource, ApiData, _api_cache  # noqa: E402
-from data_loader import WeeklyDataLoader          # noqa: E402
+from data_source import ApiSource, ApiData, api_cache  # noqa: E402
+from data_loader import WeeklyDataLoader, DEFAULT_INDICATORS, indicator_columns  # noqa: E402
+from fred_store import FredStore                   # noqa: E402
+from series_store import SeriesStore, price_series, fred_series  # noqa: E402
+from alpha_vantage import compact_url, merge_compact  # noqa: E402
 from indicators import IndicatorEngine             # noqa: E402
 from strategy_generic import GenericStrategy       # noqa: E402
 from strategy_buyhold import BuyAndHoldStrategy    # noqa: E402
@@ -54,12 +58,82 @@ from models import (                               # noqa: E402
     ValidateWindowResult,
     DiscoverWindowResult,
     FactorStability,
+    WalkForwardStudyRequest,
+    WalkForwardStudyRow,
+    WalkForwardStudyResponse,
+    JobRef,
+    JobStatus,
 )
+from jobs import JobScheduler, JobCancelled, PRIORITY_SHORT, PRIORITY_LONG  # noqa: E402
+from coalesce import SingleFlight                                           # noqa: E402
+from config_store import ConfigStore                                        # noqa: E402
+from result_cache import ResultCache                                        # noqa: E402
+from refresh import TokenBucket, fetch_all                                  # noqa: E402
 
 app = FastAPI(title="strat-opt API")
 
 CONFIG_PATH = Path(__file__).parent / "securities_config.json"
 
+# Parsed securities config, re-read only when the file changes; edits are locked and atomic
+CONFIG = ConfigStore(CONFIG_PATH)
+
+# Background jobs (optimizer / walk-forward): threads shared by all users, and
+# jobs one identified user may run at once (default: no cap below the worker
+# count; callers without an identity, see _job_user, are never capped).
+# Optimizer grids up to SHORT_JOB_COMBOS combos and walk-forward validate runs
+# jump ahead of long jobs in the queue.
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOBS = JobScheduler(
+    workers=JOB_WORKERS,
+    per_user=int(os.environ.get("JOB_USER_LIMIT", JOB_WORKERS)),
+)
+
+# Worker processes per walk-forward job for independent windows. Up to
+# JOB_WORKERS jobs run at once, so each gets its share of the CPUs.
+WALK_FORWARD_WORKERS = int(os.environ.get(
+    "WALK_FORWARD_WORKERS", max(1, (os.cpu_count() or 1) // max(1, JOB_WORKERS))))
+SHORT_JOB_COMBOS = 1000
+
+# Discover checkpoints, one per job ID. A finished job deletes its own; ones
+# left by interrupted jobs are pruned at startup once older than
+# JOB_CHECKPOINT_DAYS.
+CHECKPOINT_DIR = CACHE_DIR / "jobs"
+JOB_CHECKPOINT_DAYS = float(os.environ.get("JOB_CHECKPOINT_DAYS", 7))
+
+
+def _prune_checkpoints(max_age_days: float = JOB_CHECKPOINT_DAYS) -> int:
+    """Delete discover checkpoints not written for max_age_days. Returns the number removed."""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in CHECKPOINT_DIR.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+_prune_checkpoints()
+
+# SQLite mirror of the input CSVs: range reads for loaders, coverage for date queries
+SERIES_STORE = SeriesStore(CACHE_DIR / "series.sqlite")
+
+# Identical signal / buy-and-hold / date-range requests arriving together share one computation
+FLIGHTS = SingleFlight()
+
+# Finished signal / buy-and-hold results, keyed like FLIGHTS and dropped when fetches rewrite inputs
+RESULTS = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_ENTRIES", 256)),
+    max_bytes=int(os.environ.get("RESULT_CACHE_MB", 64)) * 1024 * 1024,
+)
+
+# Provider quotas for bulk refreshes (requests per minute), shared across calls
+AV_BUCKET   = TokenBucket(float(os.environ.get("ALPHA_VANTAGE_RATE_PER_MIN", 5)))
+FRED_BUCKET = TokenBucket(float(os.environ.get("FRED_RATE_PER_MIN", 120)))
+REFRESH_CONNECTIONS = int(os.environ.get("REFRESH_CONNECTIONS", 8))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -72,10 +146,6 @@ app.add_middleware(
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _load_config() -> dict:
-    return json.loads(CONFIG_PATH.read_text())
-
-
 def _safe_float(val) -> float | None:
     try:
         if val is None or math.isnan(float(val)):
@@ -175,16 +245,7 @@ def _build_backtest_result(bt_result: dict, spread_delta_n=2, yield10_delta_n=2)
     )
 
 
-def _fetch_and_save_csv(ticker: str) -> bool:
-    """Fetch weekly adjusted CSV from Alpha Vantage and save to inputs dir.
-
-    Returns True if data was already current (no API call made), False if freshly fetched.
-
-    Check order:
-    1. In-memory _api_cache (populated by same-process API runs today) — free.
-    2. CSV file on disk modified today — load it, populate cache, skip API call.
-    3. Alpha Vantage API — fetch, populate cache, write CSV.
-    """
+def _av_url(ticker: str) -> str:
     api_key = os.environ.get("ALPHA_VANTAGE_API_KEY")
     if not api_key:
         raise ValueError("ALPHA_VANTAGE_API_KEY is not set in the environment.")
@@ -192,78 +253,160 @@ def _fetch_and_save_csv(ticker: str) -> bool:
         "ALPHA_VANTAGE_URL",
         "https://www.alphavantage.co/query?function=TIME_SERIES_WEEKLY_ADJUSTED&symbol={ticker}&outputsize=full&datatype=csv&apikey={apikey}",
     )
-    url = url_template.format(ticker=ticker, apikey=api_key)
+    return url_template.format(ticker=ticker, apikey=api_key)
+
+
+def _price_csv_current(ticker: str, url: str) -> bool:
+    """
+    True when the ticker's CSV is current without calling Alpha Vantage:
+    1. api_cache (memory, then disk; fresh within the Alpha Vantage TTL) — write it to
+       CSV when the CSV is missing or older than the cached response.
+    2. CSV file on disk modified today — load it into the cache.
+    """
     csv_path = INPUT_DIR / f"{ticker.lower()}-weekly-adjusted.csv"
-    cache_key = (url, frozenset(), _date.today())
 
-    # 1. In-memory cache hit — write cached data to CSV and return
-    if cache_key in _api_cache:
-        _api_cache[cache_key].to_csv(csv_path, index=False)
+    cached = api_cache.entry(url)
+    if cached is not None:
+        body, fetched_at = cached
+        if not csv_path.exists() or csv_path.stat().st_mtime < fetched_at:
+            ApiSource._parse(body, ApiData.CSV).to_csv(csv_path, index=False)
+            RESULTS.invalidate(ticker.upper())
         return True
 
-    # 2. CSV file already updated today — load into cache and return
     if csv_path.exists():
         mtime = _date.fromtimestamp(csv_path.stat().st_mtime)
         if mtime == _date.today():
-            _api_cache[cache_key] = _pd.read_csv(csv_path)
+            api_cache.put(url, csv_path.read_text(encoding="utf-8"),
+                          fetched_at=csv_path.stat().st_mtime)
             return True
-
-    # 3. Fetch from Alpha Vantage via ApiSource (raises ValueError on error response)
-    source = ApiSource(url, ApiData.CSV)
-    source.data.to_csv(csv_path, index=False)
     return False
 
 
-_FRED_SERIES = ('BAMLH0A0HYM2', 'DGS10', 'DGS2')
+def _save_price_csv(ticker: str, url: str, body: str) -> None:
+    """Validate a fetched Alpha Vantage CSV body, cache it and write the ticker's CSV."""
+    df = ApiSource._parse(body, ApiData.CSV)   # raises ValueError on error response
+    api_cache.put(url, body)
+    csv_path = INPUT_DIR / f"{ticker.lower()}-weekly-adjusted.csv"
+    df.to_csv(csv_path, index=False)
+    SERIES_STORE.upsert_frame(price_series(ticker), df, "timestamp", "adjusted close",
+                              source=csv_path, replace=True, fetched_at=time.time())
+    RESULTS.invalidate(ticker.upper())
+
+
+def _price_update_url(ticker: str, url: str) -> str:
+    """URL to refresh the ticker with: compact when there is stored history to merge into."""
+    compact = compact_url(url)
+    csv_path = INPUT_DIR / f"{ticker.lower()}-weekly-adjusted.csv"
+    return compact if compact and csv_path.exists() else url
+
+
+def _save_price_update(ticker: str, url: str, fetched_url: str, body: str) -> bool:
+    """
+    Save a fetched price body: a full response as is, a compact one merged into
+    the stored history. Returns False when a compact response could not be
+    reconciled with the history and a full fetch is needed.
+    """
+    if fetched_url == url:
+        _save_price_csv(ticker, url, body)
+        return True
+    compact = ApiSource._parse(body, ApiData.CSV)   # raises ValueError on error response
+    history = _pd.read_csv(INPUT_DIR / f"{ticker.lower()}-weekly-adjusted.csv")
+    merged  = merge_compact(history, compact)
+    if merged is None:
+        return False
+    _save_price_csv(ticker, url, merged.to_csv(index=False))
+    return True
+
+
+def _fetch_and_save_csv(ticker: str) -> bool:
+    """Fetch weekly adjusted CSV from Alpha Vantage and save to inputs dir.
+
+    Returns True if data was already current (no API call made), False if freshly fetched.
+    See _price_csv_current for the checks made before calling the API. With stored
+    history only the compact (latest 100 weeks) response is fetched and merged in;
+    the full history is fetched when the two cannot be reconciled.
+    """
+    url = _av_url(ticker)
+    if _price_csv_current(ticker, url):
+        return True
+    fetch_url = _price_update_url(ticker, url)
+    while True:
+        resp = _requests.get(fetch_url, timeout=30)
+        resp.raise_for_status()
+        if _save_price_update(ticker, url, fetch_url, resp.text):
+            return False
+        fetch_url = url
+
+
 _fred_last_fetched: _datetime | None = None
 _FRED_CACHE_SECONDS = 3600
 
 
-def _fetch_and_save_fred(series_id: str) -> None:
-    """Append new FRED observations to existing CSV, preserving full history."""
+def _indicators(ticker: str) -> dict | None:
+    """{column: FRED series ID} configured for a security, or None for the loader default."""
+    sec = CONFIG.load()["securities"].get(ticker.upper()) or {}
+    indicators = sec.get("data_sources", {}).get("indicators")
+    return indicator_columns(indicators) if indicators else None
+
+
+def _fred_labels() -> dict:
+    """
+    {series ID: label} for every FRED series some configured security reads.
+    The label is the lower-cased indicator column (spread, dgs10, dgs2 for the
+    defaults), or the lower-cased series ID when another series already has it.
+    """
+    configured = [_indicators(ticker) or DEFAULT_INDICATORS for ticker in CONFIG.load()["securities"]]
+    labels = {}
+    for columns in configured or [DEFAULT_INDICATORS]:
+        for column, series_id in columns.items():
+            if series_id not in labels:
+                label = column.lower()
+                labels[series_id] = series_id.lower() if label in labels.values() else label
+    return labels
+
+
+def _fred_series_ids() -> list[str]:
+    """Every FRED series some configured security reads, each once."""
+    return list(_fred_labels())
+
+
+def _fred_request(series_id: str) -> tuple[str, dict]:
+    """(url, params) fetching the series' observations from its store's revision window on."""
     api_key = os.environ.get("FRED_API_KEY")
     url = os.environ.get("FRED_URL")
     if not api_key:
         raise ValueError("FRED_API_KEY is not set")
     if not url:
         raise ValueError("FRED_URL is not set")
-
-    csv_path = INPUT_DIR / f"{series_id}.csv"
-
-    # Determine start date: day after max date in existing CSV, or full history
-    existing_df = None
-    observation_start = '2000-01-01'
-    if csv_path.exists():
-        existing_df = _pd.read_csv(csv_path)
-        existing_df['date'] = _pd.to_datetime(existing_df['date'], errors='coerce')
-        existing_df = existing_df.dropna(subset=['date'])
-        if not existing_df.empty:
-            max_date = existing_df['date'].max()
-            observation_start = (max_date + _pd.Timedelta(days=1)).strftime('%Y-%m-%d')
-
-    params = {
+    return url, {
         'api_key': api_key,
         'series_id': series_id,
         'file_type': 'json',
-        'observation_start': observation_start,
+        'observation_start': FredStore(INPUT_DIR, series_id).fetch_start(),
     }
-    resp = _requests.get(url, params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+
+
+def _save_fred(series_id: str, data: dict) -> None:
+    """Merge the observations in a FRED API response into the series' CSV."""
     if 'observations' not in data:
         msg = next(iter(data.values()), "Unknown FRED error") if data else "Empty response"
         raise ValueError(f"FRED API error for {series_id}: {msg}")
 
-    obs = data['observations']
-    new_df = _pd.DataFrame(obs)[['date', 'value']] if obs else _pd.DataFrame(columns=['date', 'value'])
+    changes = FredStore(INPUT_DIR, series_id).merge(data['observations'])
+    if changes['written']:
+        SERIES_STORE.upsert_frame(fred_series(series_id), _pd.DataFrame(data['observations']),
+                                  "date", "value", source=INPUT_DIR / f"{series_id}.csv",
+                                  fetched_at=time.time())
+        # Every security's results read the FRED series
+        RESULTS.invalidate()
 
-    if existing_df is not None and not existing_df.empty:
-        existing_df['date'] = existing_df['date'].dt.strftime('%Y-%m-%d')
-        combined = _pd.concat([existing_df[['date', 'value']], new_df], ignore_index=True)
-        combined = combined.drop_duplicates(subset='date').sort_values('date').reset_index(drop=True)
-        csv_path.write_text(combined.to_csv(index=False), encoding='utf-8')
-    else:
-        csv_path.write_text(new_df.to_csv(index=False), encoding='utf-8')
+
+def _fetch_and_save_fred(series_id: str) -> None:
+    """Append new (and correct revised) FRED observations in the series' CSV."""
+    url, params = _fred_request(series_id)
+    resp = _requests.get(url, params=params, timeout=30)
+    resp.raise_for_status()
+    _save_fred(series_id, resp.json())
 
 
 def _update_fred_if_stale(av_ticker: str) -> None:
@@ -272,12 +415,24 @@ def _update_fred_if_stale(av_ticker: str) -> None:
     if not av_path.exists():
         return
     av_mtime = av_path.stat().st_mtime
-    for series_id in _FRED_SERIES:
+    for series_id in (_indicators(av_ticker) or DEFAULT_INDICATORS).values():
         fred_path = INPUT_DIR / f"{series_id}.csv"
         if not fred_path.exists() or fred_path.stat().st_mtime < av_mtime:
             _fetch_and_save_fred(series_id)
 
 
+def _etag_json(request: Request, payload) -> Response:
+    """
+    JSON response with an ETag of its content; 304 Not Modified when the client
+    already holds it (If-None-Match), so browsers revalidate instead of refetching.
+    """
+    etag = '"' + hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
 def _security_to_appconfig(sec: dict) -> AppConfig:
     """Convert a securities_config.json security block to an AppConfig model."""
     p = sec["parameters"]
@@ -292,6 +447,35 @@ def _security_to_appconfig(sec: dict) -> AppConfig:
     )
 
 
+def _data_version(ticker: str, input_type: str, start_date: str = None, end_date: str = None) -> str:
+    """
+    Version of the inputs a WeeklyDataLoader reads for the range: the loader's
+    content-hash token. CSV input takes it from series store metadata without
+    loading; API input hashes the (API-cached) provider responses.
+    """
+    loader = WeeklyDataLoader(input_type, INPUT_DIR, ticker, store=SERIES_STORE,
+                              indicators=_indicators(ticker))
+    return loader.data_version(start_date, end_date)
+
+
+def _request_key(endpoint: str, req) -> tuple:
+    """Coalescing key: endpoint, normalized request and the data version it reads."""
+    body = req.model_dump()
+    body["ticker"] = body["ticker"].upper()
+    if "disabled_factors" in body:
+        body["disabled_factors"] = sorted(set(body["disabled_factors"]))
+    version = _data_version(body["ticker"], req.input_type, body.get("start_date"), body.get("end_date"))
+    return (endpoint, json.dumps(body, sort_keys=True), version)
+
+
+def _cached_result(key: tuple, ticker: str, compute):
+    """Cached result for key, else compute it once (coalesced) and cache it under the ticker."""
+    result = RESULTS.get(key)
+    if result is None:
+        result = FLIGHTS.do(key, lambda: RESULTS.put(key, compute(), tag=ticker.upper()))
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -299,7 +483,7 @@ def _security_to_appconfig(sec: dict) -> AppConfig:
 @app.get("/api/securities")
 def get_securities():
     try:
-        cfg = _load_config()
+        cfg = CONFIG.load()
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Cannot read securities_config.json: {exc}")
     secs = cfg.get("securities", {})
@@ -317,11 +501,13 @@ def add_security(req: AddSecurityRequest):
     if not re.match(r'^[A-Z]{1,10}$', ticker):
         raise HTTPException(status_code=400, detail=f"Invalid ticker '{ticker}': use 1–10 uppercase letters only.")
 
-    full = _load_config()
-    if ticker in full["securities"]:
-        raise HTTPException(status_code=409, detail=f"{ticker} already exists.")
-    if template not in full["securities"]:
-        raise HTTPException(status_code=400, detail=f"Template ticker '{template}' not found.")
+    def check(full: dict) -> None:
+        if ticker in full["securities"]:
+            raise HTTPException(status_code=409, detail=f"{ticker} already exists.")
+        if template not in full["securities"]:
+            raise HTTPException(status_code=400, detail=f"Template ticker '{template}' not found.")
+
+    check(CONFIG.load())
 
     csv_path = INPUT_DIR / f"{ticker.lower()}-weekly-adjusted.csv"
     if not csv_path.exists():
@@ -333,20 +519,20 @@ def add_security(req: AddSecurityRequest):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to fetch data for {ticker}: {e}")
 
-    new_sec = copy.deepcopy(full["securities"][template])
-    new_sec["name"] = req.name.strip()
-    new_sec["data_sources"]["price"]["symbol"] = ticker
-    full["securities"][ticker] = new_sec
-
-    CONFIG_PATH.write_text(json.dumps(full, indent=2))
+    # Checked again under the edit lock: the config may have changed during the fetch
+    with CONFIG.edit() as full:
+        check(full)
+        new_sec = copy.deepcopy(full["securities"][template])
+        new_sec["name"] = req.name.strip()
+        new_sec["data_sources"]["price"]["symbol"] = ticker
+        full["securities"][ticker] = new_sec
     return {"ok": True}
 
 
 @app.post("/api/securities/{ticker}/fetch-data")
 def fetch_security_data(ticker: str):
     ticker = ticker.upper()
-    full   = _load_config()
-    if ticker not in full["securities"]:
+    if ticker not in CONFIG.load()["securities"]:
         raise HTTPException(status_code=404, detail=f"{ticker} not found.")
     try:
         already_current = _fetch_and_save_csv(ticker)
@@ -359,20 +545,18 @@ def fetch_security_data(ticker: str):
 
 
 @app.get("/api/economic-data/dates")
-def get_economic_dates():
+def get_economic_dates(request: Request):
+    """Last valid observation date of each configured FRED series, by its label (see _fred_labels)."""
     result = {}
-    labels = {'BAMLH0A0HYM2': 'spread', 'DGS2': 'dgs2', 'DGS10': 'dgs10'}
-    for series_id, key in labels.items():
+    for series_id, key in _fred_labels().items():
         path = INPUT_DIR / f"{series_id}.csv"
         if not path.exists():
             result[key] = None
             continue
-        df = _pd.read_csv(path)
-        df['date'] = _pd.to_datetime(df['date'], errors='coerce')
-        df = df.dropna(subset=['date', 'value'])
-        df = df[_pd.to_numeric(df['value'], errors='coerce').notna()]
-        result[key] = df['date'].max().strftime('%Y-%m-%d') if not df.empty else None
-    return result
+        SERIES_STORE.sync_csv(fred_series(series_id), path, "date", "value")
+        meta = SERIES_STORE.meta(fred_series(series_id))
+        result[key] = meta["last_valid_date"] if meta else None
+    return _etag_json(request, result)
 
 
 @app.post("/api/economic-data/fetch")
@@ -382,7 +566,7 @@ def fetch_economic_data():
     if _fred_last_fetched and (now - _fred_last_fetched).total_seconds() < _FRED_CACHE_SECONDS:
         return {"ok": True, "already_current": True}
     try:
-        for series_id in _FRED_SERIES:
+        for series_id in _fred_series_ids():
             _fetch_and_save_fred(series_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -392,35 +576,107 @@ def fetch_economic_data():
     return {"ok": True, "already_current": False}
 
 
+@app.post("/api/securities/fetch-all")
+async def fetch_all_data():
+    """
+    Refresh every configured security's prices and each FRED series once.
+
+    Requests run concurrently over one pooled client, paced by the provider
+    quotas. Failures are reported per ticker / series without stopping the rest.
+    """
+    global _fred_last_fetched
+    tickers = list(CONFIG.load()["securities"])
+    series_ids = _fred_series_ids()
+    now = _datetime.now()
+    fred_current = bool(_fred_last_fetched and
+                        (now - _fred_last_fetched).total_seconds() < _FRED_CACHE_SECONDS)
+    try:
+        urls = {t: _av_url(t) for t in tickers}
+        fred_requests = {} if fred_current else {s: _fred_request(s) for s in series_ids}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    current = {t: await asyncio.to_thread(_price_csv_current, t, urls[t]) for t in tickers}
+    fetch_urls = {t: _price_update_url(t, urls[t]) for t in tickers if not current[t]}
+    prices, fred = await fetch_all(
+        fetch_urls, fred_requests,
+        AV_BUCKET, FRED_BUCKET, max_connections=REFRESH_CONNECTIONS,
+    )
+
+    async def save(saver, key, *args) -> dict:
+        response = args[-1]
+        if isinstance(response, BaseException):
+            return {"error": str(response) or type(response).__name__}
+        try:
+            saved = await asyncio.to_thread(saver, key, *args)
+        except Exception as e:
+            return {"error": str(e)}
+        return {"already_current": False} if saved is not False else None
+
+    securities = {t: {"already_current": True} for t in tickers if current[t]}
+    for t, fetch_url in fetch_urls.items():
+        securities[t] = await save(_save_price_update, t, urls[t], fetch_url, prices[t])
+
+    # Compact responses that could not be merged: fetch those tickers in full
+    retry = {t: urls[t] for t, r in securities.items() if r is None}
+    if retry:
+        full, _ = await fetch_all(retry, {}, AV_BUCKET, FRED_BUCKET,
+                                  max_connections=REFRESH_CONNECTIONS)
+        for t in retry:
+            securities[t] = await save(_save_price_update, t, urls[t], urls[t], full[t])
+    securities = {t: securities[t] for t in tickers}
+
+    economic = {}
+    for series_id in series_ids:
+        economic[series_id] = ({"already_current": True} if fred_current
+                               else await save(_save_fred, series_id, fred[series_id]))
+
+    ok = not any("error" in r for r in [*securities.values(), *economic.values()])
+    if fred_requests and not any("error" in r for r in economic.values()):
+        _fred_last_fetched = now
+    return {"ok": ok, "securities": securities, "economic": economic}
+
+
 @app.post("/api/securities/reorder")
 def reorder_securities(body: ReorderSecuritiesRequest):
-    full = _load_config()
-    existing = full["securities"]
-    # Rebuild dict in requested order, ignoring unknown tickers
-    full["securities"] = {t: existing[t] for t in body.tickers if t in existing}
-    CONFIG_PATH.write_text(json.dumps(full, indent=2))
+    with CONFIG.edit() as full:
+        existing = full["securities"]
+        # Rebuild dict in requested order, ignoring unknown tickers
+        full["securities"] = {t: existing[t] for t in body.tickers if t in existing}
     return {"ok": True}
 
 
 @app.delete("/api/securities/{ticker}")
 def remove_security(ticker: str):
     ticker = ticker.upper()
-    full   = _load_config()
-    if ticker not in full["securities"]:
-        raise HTTPException(status_code=404, detail=f"{ticker} not found.")
-    if len(full["securities"]) <= 1:
-        raise HTTPException(status_code=400, detail="Cannot remove the last security.")
-    del full["securities"][ticker]
-    CONFIG_PATH.write_text(json.dumps(full, indent=2))
+    with CONFIG.edit() as full:
+        if ticker not in full["securities"]:
+            raise HTTPException(status_code=404, detail=f"{ticker} not found.")
+        if len(full["securities"]) <= 1:
+            raise HTTPException(status_code=400, detail="Cannot remove the last security.")
+        del full["securities"][ticker]
+    RESULTS.invalidate(ticker)
     return {"ok": True}
 
 
 @app.get("/api/date-range")
-def get_date_range(ticker: str = Query(), input_type: str = Query(default="csv")):
-    loader    = WeeklyDataLoader(input_type, INPUT_DIR, ticker)
+def get_date_range(request: Request, ticker: str = Query(), input_type: str = Query(default="csv")):
+    key = ("date-range", ticker.upper(), input_type, _data_version(ticker, input_type))
+    return _etag_json(request, FLIGHTS.do(key, lambda: _compute_date_range(ticker, input_type)))
+
+
+def _compute_date_range(ticker: str, input_type: str) -> dict:
+    if input_type == "csv":
+        # Coverage of the mirrored price series, without loading it
+        WeeklyDataLoader(input_type, INPUT_DIR, ticker, store=SERIES_STORE,
+                         indicators=_indicators(ticker)).sync_store()
+        meta = SERIES_STORE.meta(price_series(ticker))
+        if meta and meta["rows"]:
+            return {"min": meta["first_date"], "max": meta["last_date"]}
+    loader    = WeeklyDataLoader(input_type, INPUT_DIR, ticker, indicators=_indicators(ticker))
     price_df  = loader.load_price_dividend()
-    spread_df = loader.load_spread()
-    weekly    = loader.merge_price_spread(price_df, spread_df)
+    ind_df    = loader.load_indicators().reset_index()
+    weekly    = loader.merge_price_spread(price_df, ind_df)
     return {
         "min": weekly.index.min().strftime("%Y-%m-%d"),
         "max": weekly.index.max().strftime("%Y-%m-%d"),
@@ -429,7 +685,12 @@ def get_date_range(ticker: str = Query(), input_type: str = Query(default="csv")
 
 @app.post("/api/run/buyhold", response_model=BacktestResult)
 def run_buyhold(req: BuyHoldRequest):
-    loader = WeeklyDataLoader(req.input_type, INPUT_DIR, req.ticker)
+    return _cached_result(_request_key("buyhold", req), req.ticker, lambda: _compute_buyhold(req))
+
+
+def _compute_buyhold(req: BuyHoldRequest) -> BacktestResult:
+    loader = WeeklyDataLoader(req.input_type, INPUT_DIR, req.ticker, store=SERIES_STORE,
+                              indicators=_indicators(req.ticker))
     try:
         df = loader.load(start_date=req.start_date, end_date=req.end_date)
     except ValueError as e:
@@ -441,14 +702,21 @@ def run_buyhold(req: BuyHoldRequest):
     bt = Backtester(req.cash_rate)
     bt_result = bt.run(df, positions, buys, sells)
 
-    return _build_backtest_result(bt_result)
+    result = _build_backtest_result(bt_result)
+    result.data_version = loader.version
+    return result
 
 
 @app.post("/api/run/signal", response_model=SignalResponse)
 def run_signal(req: SignalRequest):
+    return _cached_result(_request_key("signal", req), req.ticker, lambda: _compute_signal(req))
+
+
+def _compute_signal(req: SignalRequest) -> SignalResponse:
     p = req.params
 
-    loader = WeeklyDataLoader(req.input_type, INPUT_DIR, req.ticker)
+    loader = WeeklyDataLoader(req.input_type, INPUT_DIR, req.ticker, store=SERIES_STORE,
+                              indicators=_indicators(req.ticker))
     try:
         df = loader.load(start_date=req.start_date, end_date=req.end_date)
     except ValueError as e:
@@ -534,126 +802,99 @@ def run_signal(req: SignalRequest):
         final_value=bt_result["final_value"],
         data_start=df_ind.index[0].strftime("%Y-%m-%d"),
         data_end=df_ind.index[-1].strftime("%Y-%m-%d"),
+        data_version=loader.version,
     )
 
 
 @app.post("/api/run/optimizer")
-async def run_optimizer(req: OptimizerRequest):
-    async def event_stream() -> AsyncGenerator[str, None]:
-        loop  = asyncio.get_running_loop()
-        queue: asyncio.Queue = asyncio.Queue()
-
-        def progress_callback(current: int, total: int):
-            loop.call_soon_threadsafe(queue.put_nowait, ("progress", current, total))
-
-        def run_sync():
-            try:
-                param_grids = {
-                    'MA': req.MA, 'DROP': req.DROP, 'CHG4': req.CHG4,
-                    'RET3': req.RET3,
-                    'YIELD10_CHG4': req.YIELD10_CHG4, 'YIELD2_CHG4': req.YIELD2_CHG4,
-                    'CURVE_CHG4': req.CURVE_CHG4, 'SPREAD_DELTA': req.SPREAD_DELTA,
-                    'YIELD10_DELTA': req.YIELD10_DELTA,
-                }
-                opt = GenericOptimizer(
-                    input_type=req.input_type,
-                    input_dir=INPUT_DIR,
-                    cash_rate=req.cash_rate,
-                    param_grids=param_grids,
-                    start_date=req.start_date,
-                    end_date=req.end_date,
-                    disabled_factors=set(req.disabled_factors),
-                )
-                best_params, results_df, best_result = opt.run(
-                    ticker=req.ticker,
-                    start_invested=req.start_invested,
-                    progress_callback=progress_callback,
-                )
-                loop.call_soon_threadsafe(queue.put_nowait, ("result", best_params, results_df, best_result))
-            except Exception as exc:
-                loop.call_soon_threadsafe(queue.put_nowait, ("error", str(exc)))
-
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        loop.run_in_executor(executor, run_sync)
-
-        try:
-            while True:
-                try:
-                    item = await asyncio.wait_for(queue.get(), timeout=300.0)
-                except asyncio.TimeoutError:
-                    yield "event: error\ndata: {\"message\": \"Optimizer timed out\"}\n\n"
-                    break
-
-                kind = item[0]
-
-                if kind == "progress":
-                    _, current, total = item
-                    yield f"event: progress\ndata: {json.dumps({'current': current, 'total': total})}\n\n"
-
-                elif kind == "result":
-                    _, best_params, results_df, best_result = item
-
-                    best_bt = _build_backtest_result(
-                        best_result,
-                        int(best_params["SPREAD_DELTA"]),
-                        int(best_params["YIELD10_DELTA"]),
-                    )
-
-                    best_params_model = StrategyParams(
-                        MA=int(best_params["MA"]),
-                        DROP=float(best_params["DROP"]),
-                        CHG4=float(best_params["CHG4"]),
-                        RET3=float(best_params["RET3"]),
-                        YIELD10_CHG4=float(best_params["YIELD10_CHG4"]),
-                        YIELD2_CHG4=float(best_params["YIELD2_CHG4"]),
-                        CURVE_CHG4=float(best_params["CURVE_CHG4"]),
-                        SPREAD_DELTA=int(best_params["SPREAD_DELTA"]),
-                        YIELD10_DELTA=int(best_params["YIELD10_DELTA"]),
-                    )
-
-                    all_results = [
-                        OptimizerResultRow(
-                            MA=int(row["MA"]),
-                            DROP=float(row["DROP"]),
-                            CHG4=float(row["CHG4"]),
-                            RET3=float(row["RET3"]),
-                            YIELD10_CHG4=float(row["YIELD10_CHG4"]),
-                            YIELD2_CHG4=float(row["YIELD2_CHG4"]),
-                            CURVE_CHG4=float(row["CURVE_CHG4"]),
-                            SPREAD_DELTA=int(row["SPREAD_DELTA"]),
-                            YIELD10_DELTA=int(row["YIELD10_DELTA"]),
-                            APY=float(row["APY"]),
-                            final_value=float(row["final_value"]),
-                            trade_count=int(row["trade_count"]),
-                        )
-                        for _, row in results_df.iterrows()
-                    ]
-
-                    response = OptimizerResponse(
-                        best_params=best_params_model,
-                        best_result=best_bt,
-                        all_results=all_results,
-                    )
-                    yield f"event: result\ndata: {response.model_dump_json()}\n\n"
-                    break
-
-                elif kind == "error":
-                    _, msg = item
-                    yield f"event: error\ndata: {json.dumps({'message': msg})}\n\n"
-                    break
-        finally:
-            executor.shutdown(wait=False)
+async def run_optimizer(req: OptimizerRequest, request: Request):
+    param_grids = {
+        'MA': req.MA, 'DROP': req.DROP, 'CHG4': req.CHG4,
+        'RET3': req.RET3,
+        'YIELD10_CHG4': req.YIELD10_CHG4, 'YIELD2_CHG4': req.YIELD2_CHG4,
+        'CURVE_CHG4': req.CURVE_CHG4, 'SPREAD_DELTA': req.SPREAD_DELTA,
+        'YIELD10_DELTA': req.YIELD10_DELTA,
+    }
 
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    def work(progress_callback, emit, cancel_event):
+        def progress(current: int, total: int):
+            if cancel_event.is_set():
+                raise JobCancelled()
+            progress_callback(current, total)
+
+        opt = GenericOptimizer(
+            input_type=req.input_type,
+            input_dir=INPUT_DIR,
+            cash_rate=req.cash_rate,
+            param_grids=param_grids,
+            start_date=req.start_date,
+            end_date=req.end_date,
+            disabled_factors=set(req.disabled_factors),
+            state_dir=CACHE_DIR / "optimizer",
+            indicators=_indicators(req.ticker),
+        )
+        best_params, results_df, best_result = opt.run(
+            ticker=req.ticker,
+            start_invested=req.start_invested,
+            progress_callback=progress,
+        )
+
+        best_bt = _build_backtest_result(
+            best_result,
+            int(best_params["SPREAD_DELTA"]),
+            int(best_params["YIELD10_DELTA"]),
+        )
+
+        best_params_model = StrategyParams(
+            MA=int(best_params["MA"]),
+            DROP=float(best_params["DROP"]),
+            CHG4=float(best_params["CHG4"]),
+            RET3=float(best_params["RET3"]),
+            YIELD10_CHG4=float(best_params["YIELD10_CHG4"]),
+            YIELD2_CHG4=float(best_params["YIELD2_CHG4"]),
+            CURVE_CHG4=float(best_params["CURVE_CHG4"]),
+            SPREAD_DELTA=int(best_params["SPREAD_DELTA"]),
+            YIELD10_DELTA=int(best_params["YIELD10_DELTA"]),
+        )
+
+        all_results = [
+            OptimizerResultRow(
+                MA=int(row["MA"]),
+                DROP=float(row["DROP"]),
+                CHG4=float(row["CHG4"]),
+                RET3=float(row["RET3"]),
+                YIELD10_CHG4=float(row["YIELD10_CHG4"]),
+                YIELD2_CHG4=float(row["YIELD2_CHG4"]),
+                CURVE_CHG4=float(row["CURVE_CHG4"]),
+                SPREAD_DELTA=int(row["SPREAD_DELTA"]),
+                YIELD10_DELTA=int(row["YIELD10_DELTA"]),
+                APY=float(row["APY"]),
+                final_value=float(row["final_value"]),
+                trade_count=int(row["trade_count"]),
+            )
+            for _, row in results_df.iterrows()
+        ]
+
+        return OptimizerResponse(
+            best_params=best_params_model,
+            best_result=best_bt,
+            all_results=all_results,
+            data_version=opt.data_version,
+        )
+
+    n_combos = math.prod(1 if k in req.disabled_factors else max(1, len(v))
+                         for k, v in param_grids.items())
+    job = JOBS.submit(
+        "optimizer", work, user=_job_user(request),
+        priority=PRIORITY_SHORT if n_combos <= SHORT_JOB_COMBOS else PRIORITY_LONG,
+        timeout=300.0, timeout_message="Optimizer timed out",
     )
+    return _attach_job(request, job)
 
 
 @app.get("/api/config")
 def get_config(ticker: str = Query()):
-    full   = _load_config()
+    full   = CONFIG.load()
     ticker = ticker.upper()
     if ticker not in full["securities"]:
         raise HTTPException(status_code=404, detail=f"No config found for ticker {ticker}")
@@ -663,150 +904,115 @@ def get_config(ticker: str = Query()):
 @app.post("/api/config")
 def save_config(config: AppConfig, ticker: str = Query()):
     ticker = ticker.upper()
-    full   = _load_config()
-    if ticker not in full["securities"]:
-        raise HTTPException(status_code=404, detail=f"No config found for ticker {ticker}")
+    with CONFIG.edit() as full:
+        if ticker not in full["securities"]:
+            raise HTTPException(status_code=404, detail=f"No config found for ticker {ticker}")
+
+        sec = full["securities"][ticker]
+        sec["cash_rate"]      = config.cash_rate
+        sec["start_invested"] = config.start_invested
+        sec["is_invested"]    = config.is_invested
+
+        for k, v in config.sell_triggers.items():
+            if k in sec["parameters"]["sell_triggers"]:
+                sec["parameters"]["sell_triggers"][k].update(v.model_dump())
+
+        for k, v in config.buy_conditions.items():
+            if k in sec["parameters"]["buy_conditions"]:
+                sec["parameters"]["buy_conditions"][k].update(v.model_dump())
+    return {"ok": True}
+
+
+# ---------------------------------------------------------------------------
+# Walk-forward endpoints
+# ---------------------------------------------------------------------------
 
-    sec = full["securities"][ticker]
-    sec["cash_rate"]      = config.cash_rate
-    sec["start_invested"] = config.start_invested
-    sec["is_invested"]    = config.is_invested
+def _walk_forward_engine(ticker: str, input_type: str) -> tuple[WalkForwardEngine, dict, set]:
+    """Engine for a configured ticker plus its saved seed params and ignored factors."""
+    full    = CONFIG.load()
+    ticker  = ticker.upper()
+    if ticker not in full["securities"]:
+        raise ValueError(f"Unknown ticker: {ticker}")
+    sec_cfg = _security_to_appconfig(full["securities"][ticker])
 
-    for k, v in config.sell_triggers.items():
-        if k in sec["parameters"]["sell_triggers"]:
-            sec["parameters"]["sell_triggers"][k].update(v.model_dump())
+    # Build seed params from saved config defaults
+    seed_params = {
+        **{k: v.default for k, v in sec_cfg.sell_triggers.items()},
+        **{k: v.default for k, v in sec_cfg.buy_conditions.items()},
+    }
+    seed_ignore = set(
+        [k for k, v in sec_cfg.sell_triggers.items() if v.ignore] +
+        [k for k, v in sec_cfg.buy_conditions.items() if v.ignore]
+    )
 
-    for k, v in config.buy_conditions.items():
-        if k in sec["parameters"]["buy_conditions"]:
-            sec["parameters"]["buy_conditions"][k].update(v.model_dump())
+    engine = WalkForwardEngine(
+        input_type=input_type,
+        input_dir=INPUT_DIR,
+        ticker=ticker,
+        cash_rate=sec_cfg.cash_rate,
+        start_invested=sec_cfg.start_invested,
+        config=sec_cfg,
+        max_workers=WALK_FORWARD_WORKERS,
+        cache_dir=CACHE_DIR / "walk_forward",
+        indicators=_indicators(ticker),
+    )
+    return engine, seed_params, seed_ignore
 
-    CONFIG_PATH.write_text(json.dumps(full, indent=2))
-    return {"ok": True}
 
+def _job_user(request: Request) -> str:
+    """
+    Caller identity for per-user job limits: the X-User header, else the first
+    X-Forwarded-For address. Without either the caller is anonymous ("") and
+    not capped: behind a local proxy (ngrok) the socket address is the same
+    127.0.0.1 for everyone.
+    """
+    user = request.headers.get("X-User")
+    if not user:
+        user = request.headers.get("X-Forwarded-For", "").split(",")[0]
+    return user.strip()
 
-# ---------------------------------------------------------------------------
-# Walk-forward endpoint
-# ---------------------------------------------------------------------------
 
-@app.post("/api/run/walk-forward")
-async def run_walk_forward(req: WalkForwardRequest, request: Request):
+def _attach_job(request: Request, job) -> StreamingResponse:
+    """
+    Stream a job as SSE: a "job" event with its ID, progress events, any events
+    the job emits, then a result or error event. Progress and emitted events
+    sent before attaching are replayed, so any number of clients can attach
+    at any time (see /api/jobs/{job_id}/events). A client that disconnects
+    only detaches; the job keeps running (its timeout is enforced by JOBS).
+    """
     async def event_stream():
         loop  = asyncio.get_running_loop()
-        queue: asyncio.Queue = asyncio.Queue()
-        cancel_event = threading.Event()
-
-        def progress_callback(current: int, total: int, status: str = ""):
-            loop.call_soon_threadsafe(queue.put_nowait, ("progress", current, total, status))
-
-        def run_sync():
-            try:
-                full    = _load_config()
-                ticker  = req.ticker.upper()
-                if ticker not in full["securities"]:
-                    raise ValueError(f"Unknown ticker: {ticker}")
-                sec_cfg = _security_to_appconfig(full["securities"][ticker])
-
-                # Build seed params from saved config defaults
-                seed_params = {
-                    **{k: v.default for k, v in sec_cfg.sell_triggers.items()},
-                    **{k: v.default for k, v in sec_cfg.buy_conditions.items()},
-                }
-                seed_ignore = set(
-                    [k for k, v in sec_cfg.sell_triggers.items() if v.ignore] +
-                    [k for k, v in sec_cfg.buy_conditions.items() if v.ignore]
-                )
-
-                engine = WalkForwardEngine(
-                    input_type=req.input_type,
-                    input_dir=INPUT_DIR,
-                    ticker=ticker,
-                    cash_rate=sec_cfg.cash_rate,
-                    start_invested=sec_cfg.start_invested,
-                    config=sec_cfg,
-                )
-
-                if req.mode == "validate":
-                    rows = engine.run_validate(
-                        window_size_months=req.window_size_months,
-                        window_type=req.window_type,
-                        initial_training_months=req.initial_training_months,
-                        training_window_months=req.training_window_months,
-                        seed_params=seed_params,
-                        seed_ignore=seed_ignore,
-                        progress_callback=progress_callback,
-                        cancel_event=cancel_event,
-                    )
-                    response = WalkForwardResponse(
-                        mode="validate",
-                        validate_results=[ValidateWindowResult(**r) for r in rows],
-                    )
-                else:  # discover
-                    rows, stability = engine.run_discover(
-                        window_size_months=req.window_size_months,
-                        window_type=req.window_type,
-                        initial_training_months=req.initial_training_months,
-                        training_window_months=req.training_window_months,
-                        seed_params=seed_params,
-                        apy_tolerance_bps=req.apy_tolerance_bps,
-                        max_combinations=req.max_combinations,
-                        seed_source=req.seed_source,
-                        progress_callback=progress_callback,
-                        cancel_event=cancel_event,
-                    )
-                    response = WalkForwardResponse(
-                        mode="discover",
-                        discover_results=[DiscoverWindowResult(**r) for r in rows],
-                        factor_stability={k: FactorStability(**v) for k, v in stability.items()},
-                    )
-
-                if not cancel_event.is_set():
-                    loop.call_soon_threadsafe(queue.put_nowait, ("result", response))
-            except Exception as exc:
-                if not cancel_event.is_set():
-                    loop.call_soon_threadsafe(queue.put_nowait, ("error", str(exc)))
-
-        # Separate task watches for client disconnect and sets cancel_event
-        async def watch_disconnect():
-            while not cancel_event.is_set():
-                if await request.is_disconnected():
-                    cancel_event.set()
-                    queue.put_nowait(("cancelled",))
-                    return
-                await asyncio.sleep(0.25)
-
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        loop.run_in_executor(executor, run_sync)
-        watcher = asyncio.create_task(watch_disconnect())
-
-        deadline = loop.time() + 600.0
+        queue = job.subscribe(loop)
+        yield f"event: job\ndata: {JobRef(job_id=job.id).model_dump_json()}\n\n"
         try:
             while True:
                 try:
                     item = await asyncio.wait_for(queue.get(), timeout=1.0)
                 except asyncio.TimeoutError:
-                    if loop.time() > deadline:
-                        yield "event: error\ndata: {\"message\": \"Walk-forward timed out\"}\n\n"
+                    if await request.is_disconnected():
                         break
                     continue
 
                 kind = item[0]
-                if kind == "cancelled":
-                    break
-                elif kind == "progress":
+                if kind == "progress":
                     _, current, total, status = item
+                    if job.status == "queued":
+                        position = JOBS.position(job)
+                        status = f"Queued (position {position})" if position else status
                     yield f"event: progress\ndata: {json.dumps({'current': current, 'total': total, 'status': status})}\n\n"
+                elif kind == "event":
+                    _, name, model = item
+                    yield f"event: {name}\ndata: {model.model_dump_json()}\n\n"
                 elif kind == "result":
                     _, response = item
                     yield f"event: result\ndata: {response.model_dump_json()}\n\n"
                     break
-                elif kind == "error":
+                else:  # error / cancelled
                     _, msg = item
-                    yield f"event: error\ndata: {json.dumps({'message': msg})}\n\n"
+                    yield f"event: error\ndata: {json.dumps({'message': msg or 'Cancelled'})}\n\n"
                     break
         finally:
-            cancel_event.set()
-            watcher.cancel()
-            executor.shutdown(wait=False)
+            job.unsubscribe(queue)
 
     return StreamingResponse(
         event_stream(),
@@ -815,6 +1021,157 @@ async def run_walk_forward(req: WalkForwardRequest, request: Request):
     )
 
 
+@app.post("/api/run/walk-forward")
+async def run_walk_forward(req: WalkForwardRequest, request: Request):
+    # Discover runs are checkpointed per window under the job ID; posting the
+    # same request with that job_id again resumes from the last completed window.
+    if req.job_id is not None and not re.fullmatch(r"[0-9a-f]{32}", req.job_id):
+        raise HTTPException(status_code=400, detail=f"Invalid job_id: {req.job_id}")
+    job_id = req.job_id or uuid.uuid4().hex
+
+    def work(progress_callback, emit, cancel_event):
+        engine, seed_params, seed_ignore = _walk_forward_engine(req.ticker, req.input_type)
+        step_months = req.step_months if req.step_months is not None else req.window_size_months
+
+        if req.mode == "validate":
+            rows = engine.run_validate(
+                window_size_months=req.window_size_months,
+                window_type=req.window_type,
+                initial_training_months=req.initial_training_months,
+                training_window_months=req.training_window_months,
+                step_months=req.step_months,
+                seed_params=seed_params,
+                seed_ignore=seed_ignore,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
+            )
+            return WalkForwardResponse(
+                mode="validate",
+                step_months=step_months,
+                validate_results=[ValidateWindowResult(**r) for r in rows],
+                data_version=engine.data_version,
+            )
+
+        # discover
+        checkpoint = CHECKPOINT_DIR / f"{job_id}.json"
+        rows, stability = engine.run_discover(
+            window_size_months=req.window_size_months,
+            window_type=req.window_type,
+            initial_training_months=req.initial_training_months,
+            training_window_months=req.training_window_months,
+            step_months=req.step_months,
+            seed_params=seed_params,
+            apy_tolerance_bps=req.apy_tolerance_bps,
+            max_combinations=req.max_combinations,
+            seed_source=req.seed_source,
+            elimination_strategy=req.elimination_strategy,
+            beam_width=req.beam_width,
+            max_elimination_evals=req.max_elimination_evals,
+            progress_callback=progress_callback,
+            cancel_event=cancel_event,
+            checkpoint_path=checkpoint,
+        )
+        if not cancel_event.is_set():
+            # Finished: nothing left to resume
+            checkpoint.unlink(missing_ok=True)
+        return WalkForwardResponse(
+            mode="discover",
+            step_months=step_months,
+            job_id=job_id,
+            discover_results=[DiscoverWindowResult(**r) for r in rows],
+            factor_stability={k: FactorStability(**v) for k, v in stability.items()},
+            data_version=engine.data_version,
+        )
+
+    job = JOBS.submit(
+        "walk-forward", work, user=_job_user(request), job_id=job_id,
+        priority=PRIORITY_SHORT if req.mode == "validate" else PRIORITY_LONG,
+        timeout=600.0, timeout_message="Walk-forward timed out — rerun with the job ID to resume",
+    )
+    return _attach_job(request, job)
+
+
+@app.post("/api/run/walk-forward/study")
+async def run_walk_forward_study(req: WalkForwardStudyRequest, request: Request):
+    """
+    Run one walk-forward mode over several window configurations. Streams a
+    "row" event per finished configuration, then the full comparison table.
+    """
+    def work(progress_callback, emit, cancel_event):
+        engine, seed_params, seed_ignore = _walk_forward_engine(req.ticker, req.input_type)
+        rows = engine.run_study(
+            configs=[c.model_dump() for c in req.configs],
+            mode=req.mode,
+            seed_params=seed_params,
+            seed_ignore=seed_ignore,
+            apy_tolerance_bps=req.apy_tolerance_bps,
+            max_combinations=req.max_combinations,
+            seed_source=req.seed_source,
+            elimination_strategy=req.elimination_strategy,
+            beam_width=req.beam_width,
+            max_elimination_evals=req.max_elimination_evals,
+            progress_callback=progress_callback,
+            row_callback=lambda row: emit("row", WalkForwardStudyRow(**row)),
+            cancel_event=cancel_event,
+        )
+        return WalkForwardStudyResponse(mode=req.mode, rows=[WalkForwardStudyRow(**r) for r in rows],
+                                        data_version=engine.data_version)
+
+    job = JOBS.submit("walk-forward-study", work, user=_job_user(request), priority=PRIORITY_LONG,
+                      timeout=1800.0, timeout_message="Walk-forward study timed out")
+    return _attach_job(request, job)
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+def _job_or_404(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+def _job_status(job) -> JobStatus:
+    return JobStatus(**job.info(), queue_position=JOBS.position(job))
+
+
+@app.get("/api/jobs", response_model=list[JobStatus])
+def list_jobs(request: Request, mine: bool = Query(default=False)):
+    user = _job_user(request)
+    return [_job_status(j) for j in JOBS.jobs() if not mine or j.user == user]
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str):
+    return _job_status(_job_or_404(job_id))
+
+
+@app.get("/api/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    job = _job_or_404(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=job.error or f"Job is {job.status}")
+    return job.result.model_dump()
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def get_job_events(job_id: str, request: Request):
+    return _attach_job(request, _job_or_404(job_id))
+
+
+@app.post("/api/jobs/{job_id}/cancel", response_model=JobStatus)
+def cancel_job(job_id: str):
+    _job_or_404(job_id)
+    return _job_status(JOBS.cancel(job_id))
+
+
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    return {"results": RESULTS.stats(), "coalesced": dict(FLIGHTS.stats), "api": api_cache.stats()}
+
+
 # ---------------------------------------------------------------------------
 # Static file serving (production build)
 # ---------------------------------------------------------------------------
@@ -92,6 +92,7 @@ class BacktestResult(BaseModel):
     trade_history: list[TradeEvent]
     final_value: float
     apy: float
+    data_version: Optional[str] = None     # content hash of the input data (see WeeklyDataLoader)
 
 
 class OptimizerResultRow(BaseModel):
@@ -113,6 +114,7 @@ class OptimizerResponse(BaseModel):
     best_params: StrategyParams
     best_result: BacktestResult
     all_results: list[OptimizerResultRow]
+    data_version: Optional[str] = None
 
 
 class SignalMetrics(BaseModel):
@@ -144,6 +146,7 @@ class SignalResponse(BaseModel):
     final_value: float
     data_start: str
     data_end: str
+    data_version: Optional[str] = None
 
 
 # ---------------------------------------------------------------------------
@@ -195,11 +198,16 @@ class WalkForwardRequest(BaseModel):
     window_type: str = "anchored"          # "anchored" | "rolling"
     initial_training_months: int = 36      # anchored only
     training_window_months: int = 36       # rolling only
+    step_months: Optional[int] = None      # months between window starts; default window_size_months (< window size overlaps)
     mode: str = "validate"                 # "validate" | "discover"
     # Discover-specific
     apy_tolerance_bps: float = 10.0
     max_combinations: int = 3000
     seed_source: str = "saved"             # "saved" | "previous"
+    elimination_strategy: str = "exhaustive"  # "exhaustive" | "greedy" | "beam"
+    beam_width: int = 3                    # beam only
+    max_elimination_evals: int = 512       # hard cap on ignore subsets evaluated per window
+    job_id: Optional[str] = None           # discover: resume this job from its last completed window
 
 
 class ValidateWindowResult(BaseModel):
@@ -227,6 +235,7 @@ class DiscoverWindowResult(BaseModel):
     edge: Optional[float] = None
     trades: int
     is_partial: bool
+    subsets_evaluated: int = 0
 
 
 class FactorStability(BaseModel):
@@ -236,6 +245,83 @@ class FactorStability(BaseModel):
 
 class WalkForwardResponse(BaseModel):
     mode: str
+    step_months: Optional[int] = None      # effective step; < window_size_months means test windows overlap
+    job_id: Optional[str] = None           # discover only
     validate_results: Optional[list[ValidateWindowResult]] = None
     discover_results: Optional[list[DiscoverWindowResult]] = None
     factor_stability: Optional[dict[str, FactorStability]] = None
+    data_version: Optional[str] = None
+
+
+class WalkForwardStudyConfig(BaseModel):
+    window_size_months: int = 12
+    window_type: str = "anchored"          # "anchored" | "rolling"
+    initial_training_months: int = 36      # anchored only
+    training_window_months: int = 36       # rolling only
+    step_months: Optional[int] = None      # default window_size_months
+
+
+class WalkForwardStudyRequest(BaseModel):
+    ticker: str
+    input_type: str = "csv"
+    mode: str = "validate"                 # "validate" | "discover"
+    configs: list[WalkForwardStudyConfig]
+    # Discover-specific (shared by every configuration)
+    apy_tolerance_bps: float = 10.0
+    max_combinations: int = 3000
+    seed_source: str = "saved"             # "saved" | "previous"
+    elimination_strategy: str = "exhaustive"
+    beam_width: int = 3
+    max_elimination_evals: int = 512
+
+
+class WalkForwardStudyRow(BaseModel):
+    window_size_months: int
+    window_type: str
+    initial_training_months: int
+    training_window_months: int
+    step_months: int
+    windows: int
+    partial_windows: int
+    avg_apy: Optional[float] = None        # strategy (validate) or out-of-sample (discover), full windows
+    avg_insample_apy: Optional[float] = None  # discover only
+    avg_buyhold_apy: Optional[float] = None
+    avg_edge: Optional[float] = None
+    win_rate: Optional[float] = None       # share of full windows with positive edge
+    trades: int
+    cells_evaluated: int                   # (params, ignore, start, end) evaluations this config added
+    cells_reused: int                      # evaluations answered from the shared cache
+
+
+class WalkForwardStudyResponse(BaseModel):
+    mode: str
+    rows: list[WalkForwardStudyRow]
+    data_version: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+class JobRef(BaseModel):
+    job_id: str                            # first SSE event of a job stream; discover: pass back as job_id to resume
+
+
+class JobProgress(BaseModel):
+    current: int
+    total: int
+    status: str = ""
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str                              # "optimizer" | "walk-forward" | "walk-forward-study"
+    user: str
+    priority: int                          # lower runs first
+    status: str                            # "queued" | "running" | "done" | "error" | "cancelled"
+    progress: JobProgress
+    queue_position: Optional[int] = None   # queued jobs only
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
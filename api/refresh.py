@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import httpx
+
+
+class TokenBucket:
+    """
+    Async token bucket: up to `rate` acquisitions per `per` seconds, with bursts
+    of up to `capacity` (default: rate). Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: float = None,
+                 clock=time.monotonic, sleep=asyncio.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.per_second = rate / per
+        self.capacity   = float(capacity if capacity is not None else rate)
+        self.tokens     = self.capacity
+        self.clock      = clock
+        self.sleep      = sleep
+        self._updated   = clock()
+        self._lock      = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.per_second)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await self.sleep((1 - self.tokens) / self.per_second)
+
+
+async def _get(client: httpx.AsyncClient, bucket: TokenBucket, url: str, params: dict = None):
+    await bucket.acquire()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response
+
+
+async def fetch_all(price_urls: dict, fred_requests: dict, av_bucket: TokenBucket,
+                    fred_bucket: TokenBucket, max_connections: int = 8,
+                    timeout: float = 30.0) -> tuple[dict, dict]:
+    """
+    Fetch every price CSV and FRED series concurrently over one pooled client.
+
+    Parameters
+    ----------
+    price_urls : dict
+        ticker -> Alpha Vantage CSV URL.
+    fred_requests : dict
+        series_id -> (url, params) for the FRED observations API.
+    av_bucket, fred_bucket : TokenBucket
+        Per-provider request quotas.
+
+    Returns
+    -------
+    (prices, fred) : (dict, dict)
+        ticker -> CSV body text, and series_id -> decoded JSON. A request that
+        failed maps to its exception instead, so one bad ticker does not sink
+        the rest.
+    """
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        async def price(url):
+            return (await _get(client, av_bucket, url)).text
+
+        async def series(url, params):
+            return (await _get(client, fred_bucket, url, params)).json()
+
+        tickers = list(price_urls)
+        series_ids = list(fred_requests)
+        results = await asyncio.gather(
+            *(price(price_urls[t]) for t in tickers),
+            *(series(*fred_requests[s]) for s in series_ids),
+            return_exceptions=True,
+        )
+    return (dict(zip(tickers, results[:len(tickers)])),
+            dict(zip(series_ids, results[len(tickers):])))
@@ -0,0 +1,89 @@
+import sys
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of finished endpoint results, bounded both by entry
+    count and by total size in bytes (serialized JSON size for pydantic models).
+
+    Each entry carries a tag (the ticker) so that everything computed from one
+    security's data can be dropped when that data is rewritten.
+
+    Parameters
+    ----------
+    max_entries : int
+        Entries kept before the least recently used is evicted.
+    max_bytes : int
+        Total size kept before least recently used entries are evicted. A
+        single result larger than this is returned but not cached.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes   = max(1, int(max_bytes))
+        self._lock    = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()   # key -> (value, size, tag)
+        self._bytes   = 0
+        self._hits    = 0
+        self._misses  = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Cached value for key (marking it most recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, value, tag: str = None):
+        """Store value under key and return it."""
+        size = self._size(value)
+        with self._lock:
+            self._drop(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size, tag)
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+                    self._evictions += 1
+        return value
+
+    def invalidate(self, tag: str = None) -> int:
+        """Drop entries with the given tag, or every entry when tag is None. Returns the count."""
+        with self._lock:
+            keys = [k for k, (_, _, t) in self._entries.items() if tag is None or t == tag]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries':     len(self._entries),
+                'bytes':       self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes':   self.max_bytes,
+                'hits':        self._hits,
+                'misses':      self._misses,
+                'hit_rate':    self._hits / lookups if lookups else 0.0,
+                'evictions':   self._evictions,
+            }
+
+    def _drop(self, key) -> None:
+        """Remove key if present (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    @staticmethod
+    def _size(value) -> int:
+        if hasattr(value, 'model_dump_json'):
+            return len(value.model_dump_json())
+        return sys.getsizeof(value)
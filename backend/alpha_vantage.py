@@ -4,9 +4,19 @@
 # The price and dividend data come from the Alpha Vantage API.
 ###################################################################################
 import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from data_source import ApiSource, ApiData, CsvSource
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from data_source import ApiSource, ApiData, CsvSource, data_version
+
+
+# Relative tolerance when comparing stored and refetched prices. Adjusted closes
+# are published to 4 decimals, so genuine re-adjustments are far larger.
+ADJUST_TOLERANCE = 1e-4
+
+# Overlapping weeks checked before accepting a compact response
+OVERLAP_CHECK_ROWS = 4
 
 
 class AlphaVantage:
@@ -23,6 +33,7 @@ class AlphaVantage:
         self.ticker = ticker.upper()
         self.input_type = input_type
         self.input_dir = input_dir
+        self.version = None   # data version of the last get_data()
         if input_type == "api":
             apikey = os.environ.get("ALPHA_VANTAGE_API_KEY")
             url_template = os.environ.get("ALPHA_VANTAGE_URL")
@@ -42,6 +53,7 @@ class AlphaVantage:
             data_source = ApiSource(self.url, ApiData.CSV)
         else:
             data_source = CsvSource(f"{self.input_dir}/{self.ticker.lower()}-weekly-adjusted.csv")
+        self.version = data_version('alpha_vantage', self.ticker, data_source.version)
         df = data_source.data
         if "timestamp" not in df.columns:
             cols = list(df.columns)
@@ -57,3 +69,54 @@ class AlphaVantage:
         df["close"] = pd.to_numeric(df["adjusted close"], errors="coerce")
         df = df.drop(columns=["open", "high", "low", "volume", "timestamp", "adjusted close", "dividend amount"])
         return df
+
+
+def compact_url(url: str) -> str | None:
+    '''
+    The same request with outputsize=compact (latest 100 bars), or None when
+    the URL does not ask for full output.
+    '''
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if ('outputsize', 'full') not in query:
+        return None
+    query = [(k, 'compact' if k == 'outputsize' else v) for k, v in query]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def merge_compact(history: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame | None:
+    '''
+    Merges a compact weekly adjusted response into stored full history (both in
+    Alpha Vantage CSV layout, newest first).
+
+    Compact rows replace stored rows from the oldest compact week on. A dividend
+    or split inside the compact window rescales every earlier adjusted close by
+    one common factor; that factor is read from the oldest overlapping weeks and
+    applied to the older stored history, leaving raw prices untouched.
+
+    :return: Merged history, or None when the two cannot be reconciled (no
+        overlap, raw closes changed, or no single adjustment factor) and a full
+        refetch is needed.
+    '''
+    h = history.set_index('timestamp')
+    c = compact.set_index('timestamp')
+    overlap = h.index.intersection(c.index).sort_values()
+    if len(overlap) < 2:
+        return None
+
+    check = overlap[:OVERLAP_CHECK_ROWS]
+    if not np.allclose(h.loc[check, 'close'].to_numpy(float), c.loc[check, 'close'].to_numpy(float),
+                       rtol=ADJUST_TOLERANCE, atol=0.0):
+        return None
+    ratio = c.loc[check, 'adjusted close'].to_numpy(float) / h.loc[check, 'adjusted close'].to_numpy(float)
+    factor = float(ratio.mean())
+    if np.ptp(ratio) > ADJUST_TOLERANCE * factor:
+        return None
+
+    older = h[h.index < overlap[0]].copy()
+    if abs(factor - 1) > ADJUST_TOLERANCE:
+        older['adjusted close'] = (older['adjusted close'] * factor).round(4)
+
+    merged = pd.concat([c, older])
+    merged = merged[~merged.index.duplicated()].sort_index(ascending=False)
+    return merged.reset_index()[history.columns]
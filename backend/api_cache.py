@@ -0,0 +1,210 @@
+###################################################################################
+#  API Response Cache
+#
+# Raw provider responses (Alpha Vantage CSV, FRED JSON) cached in memory and on
+# disk so that repeated loads and server restarts do not spend API quota.
+###################################################################################
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import urlparse
+
+# Seconds a response stays fresh, by provider host suffix. Alpha Vantage weekly
+# bars change at most once a day; FRED series are refreshed hourly at most.
+DEFAULT_TTLS = {
+    'alphavantage.co': 12 * 3600,
+    'stlouisfed.org':  3600,
+}
+DEFAULT_TTL = 3600
+
+
+class ApiCache:
+    '''
+    Thread-safe TTL cache of API response bodies.
+
+    A size-bounded LRU in memory sits in front of a directory of JSON files, one
+    per request, named by a hash of the URL and parameters (so API keys never
+    appear on disk). Memory misses fall back to disk; disk entries survive
+    restarts and are pruned oldest-first beyond max_disk_bytes.
+
+    :param cache_dir: Directory for on-disk entries, or None for memory only.
+    :param ttls: Freshness in seconds by provider host suffix.
+    :param max_entries: Responses kept in memory.
+    :param max_bytes: Total response size kept in memory.
+    :param max_disk_bytes: Total response size kept on disk.
+    :param clock: Time source (seconds), for tests.
+    '''
+    def __init__(self, cache_dir=None, ttls: dict = None, max_entries: int = 64,
+                 max_bytes: int = 64 * 1024 * 1024, max_disk_bytes: int = 256 * 1024 * 1024,
+                 clock=time.time) -> None:
+        self.cache_dir      = Path(cache_dir) if cache_dir is not None else None
+        self.ttls           = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries    = max(1, int(max_entries))
+        self.max_bytes      = max(1, int(max_bytes))
+        self.max_disk_bytes = max(1, int(max_disk_bytes))
+        self.clock          = clock
+        self._lock    = threading.Lock()
+        self._memory: OrderedDict = OrderedDict()   # key -> (body, fetched_at, ttl)
+        self._bytes   = 0
+        self._stats   = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                         'expired': 0, 'stores': 0, 'evictions': 0}
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    @staticmethod
+    def key(url: str, params: dict = None) -> str:
+        '''Stable key for a request: hash of the URL and sorted parameters.'''
+        spec = json.dumps([url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        host = urlparse(url).hostname or ''
+        for suffix, ttl in self.ttls.items():
+            if host == suffix or host.endswith('.' + suffix):
+                return ttl
+        return DEFAULT_TTL
+
+    def get(self, url: str, params: dict = None) -> str | None:
+        '''Fresh cached response body for the request, or None.'''
+        entry = self.entry(url, params)
+        return None if entry is None else entry[0]
+
+    def entry(self, url: str, params: dict = None) -> tuple[str, float] | None:
+        '''Fresh cached (body, fetched_at) for the request, or None.'''
+        key, now = self.key(url, params), self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                body, fetched_at, ttl = entry
+                if now - fetched_at < ttl:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return body, fetched_at
+                # The disk copy was written at the same time, so it is stale too
+                self._drop(key)
+                self._remove_disk(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            entry = self._read_disk(key)
+            if entry is not None:
+                body, fetched_at = entry
+                ttl = self.ttl_for(url)
+                if now - fetched_at < ttl:
+                    self._remember(key, body, fetched_at, ttl)
+                    self._stats['disk_hits'] += 1
+                    return body, fetched_at
+                self._remove_disk(key)
+                self._stats['expired'] += 1
+
+            self._stats['misses'] += 1
+            return None
+
+    def put(self, url: str, body: str, params: dict = None, fetched_at: float = None) -> None:
+        '''Store a response body fetched at fetched_at (default now).'''
+        key = self.key(url, params)
+        fetched_at = self.clock() if fetched_at is None else fetched_at
+        with self._lock:
+            self._remember(key, body, fetched_at, self.ttl_for(url))
+            self._write_disk(key, url, body, fetched_at)
+            self._stats['stores'] += 1
+
+    def clear(self) -> None:
+        '''Drop every entry, in memory and on disk.'''
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+            for path in self._disk_files():
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._memory), 'bytes': self._bytes}
+
+    # ------------------------------------------------------------
+    # Memory LRU (lock held)
+    # ------------------------------------------------------------
+    def _remember(self, key: str, body: str, fetched_at: float, ttl: float) -> None:
+        self._drop(key)
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        self._memory[key] = (body, fetched_at, ttl)
+        self._bytes += size
+        while len(self._memory) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._memory)))
+            self._stats['evictions'] += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    # ------------------------------------------------------------
+    # Disk store (lock held)
+    # ------------------------------------------------------------
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _disk_files(self) -> list[Path]:
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob('*.json'))
+
+    def _read_disk(self, key: str) -> tuple[str, float] | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text(encoding='utf-8'))
+            return entry['body'], float(entry['fetched_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, url: str, body: str, fetched_at: float) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            entry = {'host': urlparse(url).hostname, 'fetched_at': fetched_at, 'body': body}
+            # A temp file of this write's own: other caches on the same directory
+            # (other processes, pool workers) may be writing the same key
+            with tempfile.NamedTemporaryFile('w', dir=self.cache_dir, prefix=path.name, suffix='.tmp',
+                                             encoding='utf-8', delete=False) as tmp:
+                tmp.write(json.dumps(entry))
+            try:
+                os.replace(tmp.name, path)
+            except OSError:
+                os.unlink(tmp.name)
+                raise
+            self._prune_disk()
+        except OSError:
+            pass   # the disk store is best effort; the memory entry still serves
+
+    def _remove_disk(self, key: str) -> None:
+        if self.cache_dir is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def _prune_disk(self) -> None:
+        '''Delete the oldest entries until the store fits in max_disk_bytes.'''
+        files = []
+        for p in self._disk_files():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue   # removed by another writer since the listing
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort(key=lambda f: f[0])
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
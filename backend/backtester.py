@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -78,3 +79,47 @@ class Backtester:
             "final_value": final_value,
             "apy": apy,
         }
+
+    # ------------------------------------------------------------
+    # Many position sets over the same df
+    # ------------------------------------------------------------
+    def run_batch(self, df: pd.DataFrame, positions: np.ndarray, carry: dict = None):
+        """
+        Final value and APY for many position sets at once, matching run().
+
+        Parameters
+        ----------
+        df : DataFrame
+            Weekly dataset with Ret
+        positions : ndarray
+            (n_sets, n_rows) array of 1/0 values aligned with df.index
+        carry : dict, optional
+            Continue earlier runs that ended on the row before df starts:
+            {"positions": last position per set, "final_values": equity per set,
+             "start": first date of the earlier runs}. The result is identical
+            to one run over the combined rows.
+
+        Returns
+        -------
+        final_values : list[float]
+        apys : list[float]
+        """
+        pos = positions.astype(float)
+        pos_shifted = np.empty_like(pos)
+        pos_shifted[:, 0]  = pos[:, 0] if carry is None else np.asarray(carry["positions"], dtype=float)
+        pos_shifted[:, 1:] = pos[:, :-1]
+
+        ret = df["Ret"].to_numpy(dtype=float)
+        strat_ret = ret * pos_shifted + self.cash_weekly * (1 - pos_shifted)
+        # NaN returns (first row) are skipped, as in Series.cumprod
+        growth = np.where(np.isnan(strat_ret), 1.0, 1 + strat_ret)
+        start = df.index[0]
+        if carry is not None:
+            # Seed the running product so it multiplies in the same order as one long run
+            growth = np.column_stack([np.asarray(carry["final_values"], dtype=float), growth])
+            start = carry["start"]
+        final_values = np.cumprod(growth, axis=1)[:, -1].tolist()
+
+        years = (df.index[-1] - start).days / 365.25
+        apys = [fv ** (1 / years) - 1 if years > 0 else 0.0 for fv in final_values]
+        return final_values, apys
@@ -3,11 +3,36 @@ from pathlib import Path
 from typing import Optional
 from alpha_vantage import AlphaVantage
 from fred import Fred
+from data_source import data_version
+from series_store import SeriesStore, price_series, fred_series
+from weekly_series import WeeklySeriesCache, to_weekly
+
+# Indicator columns and the FRED series they come from, when not configured
+DEFAULT_INDICATORS = {'Spread': 'BAMLH0A0HYM2', 'DGS10': 'DGS10', 'DGS2': 'DGS2'}
+
+# Column names of the indicator roles in securities_config.json; other roles
+# are named by their series ID.
+ROLE_COLUMNS = {'credit_spread': 'Spread', 'yield_10y': 'DGS10', 'yield_2y': 'DGS2'}
+
+# Weekly FRED series shared by every loader in the process
+weekly_cache = WeeklySeriesCache()
+
+
+def indicator_columns(indicators: dict) -> dict:
+    """{column: FRED series ID} for a security's data_sources.indicators config."""
+    columns = {}
+    for role, source in indicators.items():
+        if source.get("provider", "fred") != "fred":
+            raise ValueError(f"Unsupported provider for indicator {role}: {source.get('provider')}")
+        columns[ROLE_COLUMNS.get(role, source["series_id"])] = source["series_id"]
+    return columns
+
 
 class WeeklyDataLoader:
     """
-    Loads weekly price/dividend data + daily FRED spread data,
-    converts spreads to weekly, merges all, and computes TR & weekly returns.
+    Loads weekly price/dividend data + the configured daily FRED indicator
+    series, converts the indicators to weekly, merges all, and computes TR &
+    weekly returns.
 
     Parameters
     ----------
@@ -17,19 +42,41 @@ class WeeklyDataLoader:
         Path to directory where CSV input files are stored.
     ticker : str
         Ticker symbol
+    store : SeriesStore, optional
+        With CSV input, read through this store: the CSVs are mirrored into it
+        and load() reads only the price rows its date range needs.
+    indicators : dict, optional
+        {column: FRED series ID} of the indicator columns to load (see
+        indicator_columns); default DEFAULT_INDICATORS. Each series is
+        resampled once per process and version and shared via weekly_cache.
+
+    After load(), version is the data version of the result: a hash of the
+    contents of every series read plus the ticker and date range. The same
+    token is available up front from data_version().
     """
 
-    def __init__(self, input_type: str, input_dir: Path, ticker: str):
+    def __init__(self, input_type: str, input_dir: Path, ticker: str, store: SeriesStore = None,
+                 indicators: dict = None):
         self.input_type = input_type
         self.input_dir = input_dir
         self.ticker = ticker.upper()
+        self.store = store if input_type == "csv" else None
+        self.indicators = dict(indicators or DEFAULT_INDICATORS)
+        self.version = None
+        self._series_versions = {}   # series name -> content version of the rows read
 
     # ------------------------------------------------------------
     # Load price + dividend data (already weekly)
     # ------------------------------------------------------------
-    def load_price_dividend(self) -> pd.DataFrame:
-        av = AlphaVantage(self.ticker, self.input_type, self.input_dir)
-        df = av.get_data().copy()
+    def load_price_dividend(self, start: str = None, end: str = None) -> pd.DataFrame:
+        series = price_series(self.ticker)
+        if self.store is not None:
+            df = self.store.read(series, start, end).rename(columns={"value": "close"})
+            self._series_versions[series] = self._stored_version(series)
+        else:
+            av = AlphaVantage(self.ticker, self.input_type, self.input_dir)
+            df = av.get_data().copy()
+            self._series_versions[series] = av.version
 
         df = df.sort_values("date").reset_index(drop=True)
 
@@ -41,52 +88,129 @@ class WeeklyDataLoader:
         return df
 
     # ------------------------------------------------------------
-    # Load FRED spread (daily → weekly)
+    # Load FRED indicators (daily → weekly)
     # ------------------------------------------------------------
-    def load_spread(self) -> pd.DataFrame:
-        fr = Fred(self.input_type, self.input_dir)
-        df = fr.get_data().copy()
+    def load_indicators(self) -> pd.DataFrame:
+        """Weekly indicator columns (plus YieldCurve with both yields), indexed by week-ending date."""
+        return self._join(self._weekly_indicators())
 
-        df["date"] = pd.to_datetime(df["date"])
-        df = df.set_index("date").resample("W-FRI").last().sort_index().reset_index()
+    def _weekly_indicators(self) -> dict:
+        """{column: weekly series} of the configured indicators, recording their versions."""
+        columns = {}
+        for col, series_id in self.indicators.items():
+            version, columns[col] = self._weekly(series_id)
+            self._series_versions[fred_series(series_id)] = version
+        return columns
+
+    def _weekly(self, series_id: str) -> tuple:
+        """(version, weekly series) of one FRED series, resampled at most once per version."""
+        if self.store is not None:
+            series = fred_series(series_id)
+            stamp = self._stored_version(series)
+            return weekly_cache.get(("store", series), stamp,
+                                    lambda: (stamp, to_weekly(self.store.read(series))))
+        if self.input_type == "csv":
+            path = Path(self.input_dir) / f"{series_id}.csv"
+            st = path.stat()
+            return weekly_cache.get(("csv", str(path.resolve())), (st.st_mtime_ns, st.st_size),
+                                    lambda: self._read_weekly(series_id))
+        # API responses have no cheap stamp: fetch (from the API cache), reuse the resample
+        fred = Fred(self.input_type, self.input_dir, series_id=series_id, col_name="value")
+        df = fred.get_data()
+        return weekly_cache.get(("api", series_id), fred.version, lambda: (fred.version, to_weekly(df)))
+
+    def _read_weekly(self, series_id: str) -> tuple:
+        fred = Fred(self.input_type, self.input_dir, series_id=series_id, col_name="value")
+        df = fred.get_data()
+        return fred.version, to_weekly(df)
+
+    @staticmethod
+    def _join(columns: dict) -> pd.DataFrame:
+        """Weekly series joined on their common W-FRI index."""
+        df = pd.concat(columns, axis=1).sort_index()
+        df.index.name = "date"
+        if "DGS10" in df.columns and "DGS2" in df.columns:
+            df["YieldCurve"] = df["DGS10"] - df["DGS2"]
         return df
 
     # ------------------------------------------------------------
-    # Load FRED treasury yields (daily → weekly)
+    # Data version
     # ------------------------------------------------------------
-    def load_treasury(self) -> pd.DataFrame:
-        dgs10 = Fred(self.input_type, self.input_dir, series_id='DGS10', col_name='DGS10').get_data().copy()
-        dgs2 = Fred(self.input_type, self.input_dir, series_id='DGS2', col_name='DGS2').get_data().copy()
+    def data_version(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+        """
+        The version load(start_date, end_date) returns data for. With a store
+        this comes from series metadata without reading any rows; otherwise
+        from the content hashes of the source files or API responses (the
+        latter through the API cache), without merging them.
+        """
+        if self.store is None:
+            av = AlphaVantage(self.ticker, self.input_type, self.input_dir)
+            av.get_data()
+            versions = {price_series(self.ticker): av.version}
+            for series_id in self.indicators.values():
+                versions[fred_series(series_id)] = self._weekly(series_id)[0]
+            return self._version(start_date, end_date, versions)
+        self.sync_store()
+        series = [price_series(self.ticker)] + [fred_series(s) for s in self.indicators.values()]
+        return self._version(start_date, end_date, {s: self._stored_version(s) for s in series})
 
-        dgs10["date"] = pd.to_datetime(dgs10["date"])
-        dgs2["date"] = pd.to_datetime(dgs2["date"])
+    def _version(self, start_date, end_date, series_versions: dict) -> str:
+        return data_version('weekly', self.ticker, start_date, end_date, self.indicators, series_versions)
 
-        dgs10 = dgs10.set_index("date").resample("W-FRI").last().reset_index()
-        dgs2  = dgs2.set_index("date").resample("W-FRI").last().reset_index()
+    def _stored_version(self, series: str) -> Optional[str]:
+        meta = self.store.meta(series)
+        return meta['content_hash'] if meta else None
 
-        treasury = pd.merge_asof(
-            dgs10.sort_values("date"),
-            dgs2.sort_values("date"),
-            on="date",
-            direction="backward"
-        )
-        treasury["YieldCurve"] = treasury["DGS10"] - treasury["DGS2"]
-        return treasury
+    # ------------------------------------------------------------
+    # Series store
+    # ------------------------------------------------------------
+    def sync_store(self) -> None:
+        """Bring the store's copies of this ticker's and the FRED CSVs up to date."""
+        self.store.sync_csv(price_series(self.ticker),
+                            Path(self.input_dir) / f"{self.ticker.lower()}-weekly-adjusted.csv",
+                            "timestamp", "adjusted close")
+        for series_id in self.indicators.values():
+            self.store.sync_csv(fred_series(series_id), Path(self.input_dir) / f"{series_id}.csv",
+                                "date", "value")
+
+    def _store_bounds(self, start_date: Optional[str], end_date: Optional[str]):
+        """
+        From store metadata alone: the FRED cap (week label of the earliest
+        last observation, as load() computes from full data), the available
+        data range, and the price read range for [start_date, end_date].
+        """
+        price = self.store.meta(price_series(self.ticker))
+        fred = [self.store.meta(fred_series(s)) for s in self.indicators.values()]
+        if not all(meta and meta['rows'] for meta in [price, *fred]):
+            raise ValueError(f"No stored data for {self.ticker}")
+
+        fred_max = min(_week_label(meta['last_date']) for meta in fred)
+        data_min = pd.Timestamp(price['first_date']).date()
+        data_max = pd.Timestamp(
+            self.store.last_date_until(price_series(self.ticker), fred_max.strftime("%Y-%m-%d"))
+            or price['first_date']).date()
+
+        hi = fred_max
+        if end_date:
+            hi = min(hi, pd.Timestamp(end_date))
+        lo = pd.Timestamp(start_date) if start_date else None
+        fmt = lambda t: t.strftime("%Y-%m-%d") if t is not None else None
+        return fred_max, data_min, data_max, (fmt(lo), fmt(hi))
 
     # ------------------------------------------------------------
-    # Merge price weekly + FRED weekly spreads
+    # Merge price weekly + FRED weekly indicators
     # ------------------------------------------------------------
-    def merge_price_spread(self, price_df: pd.DataFrame, spread_df: pd.DataFrame) -> pd.DataFrame:
+    def merge_price_spread(self, price_df: pd.DataFrame, indicator_df: pd.DataFrame) -> pd.DataFrame:
         w_price = price_df.copy()
         w_price["date"] = pd.to_datetime(w_price["date"])
 
-        w_spread = spread_df.copy()
-        w_spread["date"] = pd.to_datetime(w_spread["date"])
+        w_ind = indicator_df.copy()
+        w_ind["date"] = pd.to_datetime(w_ind["date"])
 
         # merge_asof is safest for forward/backward alignment in weekly domains
         merged = pd.merge_asof(
             w_price.sort_values("date"),
-            w_spread.sort_values("date"),
+            w_ind.sort_values("date"),
             on="date",
             direction="backward"
         )
@@ -99,34 +223,38 @@ class WeeklyDataLoader:
     # ------------------------------------------------------------
     def load(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """
-        Returns weekly DataFrame with: close, dividend, TR, Spread, DGS10, DGS2, YieldCurve.
+        Returns weekly DataFrame with: close, TR, the indicator columns (Spread,
+        DGS10, DGS2 by default) and YieldCurve.
         Optionally sliced to [start_date, end_date] (inclusive, YYYY-MM-DD).
         """
-        price_df = self.load_price_dividend()
-        spread_df = self.load_spread()
-        treasury_df = self.load_treasury()
+        self._series_versions = {}
+        if self.store is not None:
+            self.sync_store()
+            fred_max, data_min, data_max, price_range = self._store_bounds(start_date, end_date)
+            price_df = self.load_price_dividend(*price_range)
+            if price_df.empty:
+                raise ValueError(
+                    f"Date range {start_date or 'start'} – {end_date or 'end'} "
+                    f"is outside available data for this security ({data_min} to {data_max})"
+                )
+        else:
+            price_df = self.load_price_dividend()
+        indicators = self._weekly_indicators()
 
-        weekly = self.merge_price_spread(price_df, spread_df)
+        weekly = self.merge_price_spread(price_df, self._join(indicators).reset_index())
 
-        # Merge treasury columns
-        treasury_df["date"] = pd.to_datetime(treasury_df["date"])
-        weekly = pd.merge_asof(
-            weekly.reset_index().sort_values("date"),
-            treasury_df.sort_values("date"),
-            on="date",
-            direction="backward"
-        ).set_index("date")
-
-        # Cap at the latest date where FRED data is available.
+        # Cap at the latest date where every FRED series has data.
         # merge_asof carries the last FRED value forward into newer price rows,
         # which would produce misleading signals using stale spread/yield data.
-        fred_max = min(spread_df["date"].max(), treasury_df["date"].max())
+        if self.store is None:
+            fred_max = min(s.index.max() for s in indicators.values())
         weekly = weekly[weekly.index <= fred_max]
 
-        print("Data range:", weekly.index.min().date(), "to", weekly.index.max().date())
+        if self.store is None:
+            data_min = weekly.index.min().date()
+            data_max = weekly.index.max().date()
+        print("Data range:", data_min, "to", data_max)
 
-        data_min = weekly.index.min().date()
-        data_max = weekly.index.max().date()
         if start_date:
             weekly = weekly.loc[pd.Timestamp(start_date):]
         if end_date:
@@ -140,4 +268,11 @@ class WeeklyDataLoader:
         # Weekly return from TR
         weekly["Ret"] = weekly["TR"].pct_change()
 
+        self.version = self._version(start_date, end_date, self._series_versions)
         return weekly
+
+
+def _week_label(day: str) -> pd.Timestamp:
+    """The W-FRI resample label (week-ending Friday) of the week containing day."""
+    t = pd.Timestamp(day)
+    return t + pd.Timedelta(days=(4 - t.weekday()) % 7)
@@ -1,12 +1,25 @@
+import os
 import pandas as pd
 import requests
 import io
-from datetime import date
+import json
+import hashlib
 from enum import Enum
+from pathlib import Path
+from api_cache import ApiCache
 
-# Keyed by (url, frozen params, fetch date). Cleared automatically on day change
-# (new date → new key) or process restart.
-_api_cache: dict = {}
+# Raw API responses shared by every ApiSource: in memory and under API_CACHE_DIR,
+# fresh for a per-provider TTL, so restarts do not refetch.
+api_cache = ApiCache(os.environ.get(
+    "API_CACHE_DIR", Path(__file__).resolve().parent.parent / "cache" / "api"))
+
+def data_version(*parts) -> str:
+    '''
+    Stable version token for data: a short hash of the given parts (content
+    hashes, tickers, loader parameters), which must be JSON serializable.
+    '''
+    spec = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
 
 class ApiData(Enum):
     CSV = 1
@@ -15,10 +28,14 @@ class ApiData(Enum):
 class DataSource:
     '''
     Base class for data sources.
+
+    version is a hash of the raw content the data was parsed from, so two
+    sources with the same version hold the same data.
     '''
     def __init__(self, params):
         self.data = None
         self.params = params
+        self.version = None
 
 class CsvSource(DataSource):
     '''
@@ -30,7 +47,9 @@ class CsvSource(DataSource):
     def __init__(self, path: str, params=None):
         super().__init__(params)
         self.path = path
-        self.data = pd.read_csv(path)
+        raw = Path(path).read_bytes()
+        self.version = hashlib.sha256(raw).hexdigest()
+        self.data = pd.read_csv(io.BytesIO(raw))
 
 class ApiSource(DataSource):
     '''
@@ -45,29 +64,28 @@ class ApiSource(DataSource):
         super().__init__(params)
         self.url = url
 
-        params_key = frozenset(params.items()) if params else frozenset()
-        cache_key = (url, params_key, date.today())
-        if cache_key in _api_cache:
-            self.data = _api_cache[cache_key].copy()
-            self.from_cache = True
-            return
+        body = api_cache.get(url, params)
+        self.from_cache = body is not None
+        if body is None:
+            response = requests.get(self.url, params=params)
+            response.raise_for_status()
+            body = response.text
+        self.data = self._parse(body, api_data, data_node)
+        self.version = hashlib.sha256(body.encode()).hexdigest()
+        if not self.from_cache:
+            api_cache.put(url, body, params)
 
-        self.from_cache = False
-        response = requests.get(self.url, params=params)
-        response.raise_for_status()
+    @staticmethod
+    def _parse(body: str, api_data: ApiData, data_node=None) -> pd.DataFrame:
+        '''Parses a response body, raising ValueError for provider error payloads.'''
         if api_data == ApiData.JSON:
             if data_node is None:
                 raise ValueError("data_node must be provided for JSON data.")
-            self.data = pd.DataFrame(response.json()[data_node])
-        elif api_data == ApiData.CSV:
-            if response.text.lstrip().startswith('{'):
-                import json
-                try:
-                    msg = next(iter(json.loads(response.text).values()))
-                except Exception:
-                    msg = response.text[:200]
-                raise ValueError(f"API returned an error instead of CSV data: {msg}")
-            self.data = pd.read_csv(io.StringIO(response.text))
-
-        _api_cache[cache_key] = self.data.copy()
-
+            return pd.DataFrame(json.loads(body)[data_node])
+        if body.lstrip().startswith('{'):
+            try:
+                msg = next(iter(json.loads(body).values()))
+            except Exception:
+                msg = body[:200]
+            raise ValueError(f"API returned an error instead of CSV data: {msg}")
+        return pd.read_csv(io.StringIO(body))
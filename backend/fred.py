@@ -7,7 +7,7 @@ import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from data_source import ApiSource, ApiData, CsvSource
+from data_source import ApiSource, ApiData, CsvSource, data_version
 
 class Fred:
     '''
@@ -23,6 +23,7 @@ class Fred:
         self.input_dir = input_dir
         self.series_id = series_id
         self.col_name = col_name
+        self.version = None   # data version of the last get_data()
         if input_type == "api":
             apikey = os.environ.get("FRED_API_KEY")
             url = os.environ.get("FRED_URL")
@@ -47,12 +48,12 @@ class Fred:
         :return: DataFrame with 'date' and col_name columns.
         '''
         if self.input_type == "api":
+            # This fetch is weekly ('wef'), so it never feeds the daily FredStore CSV:
+            # that is kept current only by the CSV fetch and bulk refresh in the API
             data_source = ApiSource(self.url, ApiData.JSON, "observations", self.params)
-            if not data_source.from_cache:
-                csv_path = Path(self.input_dir) / f"{self.series_id}.csv"
-                data_source.data[['date', 'value']].to_csv(csv_path, index=False)
         else:
             data_source = CsvSource(f"{self.input_dir}/{self.series_id}.csv")
+        self.version = data_version('fred', self.series_id, self.col_name, data_source.version)
         df = data_source.data
         df = df[['date', 'value']].copy()
         df['date'] = pd.to_datetime(df['date'], errors='coerce')
@@ -0,0 +1,192 @@
+###################################################################################
+#  FRED Series Store
+#
+# Keeps a FRED series CSV (date,value — ascending) up to date incrementally:
+# new observations are appended, and revised trailing values are corrected by
+# truncating the file at the first changed row and rewriting only from there.
+###################################################################################
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+HEADER = b"date,value\n"
+
+# FRED occasionally revises recent observations; each refresh re-requests this
+# many trailing days so revisions are picked up.
+REVISION_DAYS = 30
+
+# Full history start, as used by the FRED fetches
+HISTORY_START = '2000-01-01'
+
+# Bytes read per step when scanning the file backwards for its trailing rows
+_CHUNK = 8192
+
+
+class FredStore:
+    '''
+    Append-only store for one FRED series in {input_dir}/{series_id}.csv.
+
+    A sidecar {series_id}.meta.json records the last date and row count along
+    with the file size/mtime they describe, so the last date is known without
+    reading the CSV. If the CSV was changed by anything else, the marker is
+    rebuilt from the file.
+
+    :param input_dir: Directory holding the series CSV.
+    :param series_id: FRED series ID.
+    '''
+    def __init__(self, input_dir: Path, series_id: str) -> None:
+        self.series_id = series_id
+        self.path      = Path(input_dir) / f"{series_id}.csv"
+        self.meta_path = Path(input_dir) / f"{series_id}.meta.json"
+
+    # ------------------------------------------------------------
+    # Marker
+    # ------------------------------------------------------------
+    def meta(self) -> dict:
+        '''{'last_date', 'rows'} of the stored series (last_date None when empty).'''
+        stat = self._stat()
+        if stat is None:
+            return {'last_date': None, 'rows': 0}
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            if [meta['size'], meta['mtime_ns']] == list(stat):
+                return {'last_date': meta['last_date'], 'rows': meta['rows']}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        rows = [d for d, _, _ in self._rows_from(0)]
+        return self._save_meta(rows[-1] if rows else None, len(rows))
+
+    def last_date(self) -> str | None:
+        return self.meta()['last_date']
+
+    def fetch_start(self) -> str:
+        '''observation_start for a refresh: the revision window before the last stored date.'''
+        last = self.last_date()
+        if last is None:
+            return HISTORY_START
+        return (date.fromisoformat(last) - timedelta(days=REVISION_DAYS)).isoformat()
+
+    # ------------------------------------------------------------
+    # Merge
+    # ------------------------------------------------------------
+    def merge(self, observations: list[dict]) -> dict:
+        '''
+        Merge FRED observations ({'date', 'value'} dicts) into the store.
+
+        Stored rows from the first observation's date on are combined with the
+        observations (which win on equal dates). The file is truncated at the
+        first row that differs and only the rest is written, so unchanged
+        history is never rewritten.
+
+        :return: {'appended': new dates, 'revised': changed values, 'written': bytes written}
+        '''
+        incoming = {o['date']: _clean(o['value']) for o in observations if o.get('date')}
+        result = {'appended': 0, 'revised': 0, 'written': 0}
+        if not incoming:
+            return result
+
+        if self._stat() is None or self._stat()[0] == 0:
+            self.path.write_bytes(HEADER)
+        total  = self.meta()['rows']
+        stored = self._tail(min(incoming))
+        old    = {d: v for d, v, _ in stored}
+        merged = sorted({**old, **incoming}.items())
+
+        # First row where the merged tail departs from what is on disk
+        same = 0
+        while (same < len(stored) and same < len(merged)
+               and stored[same][0] == merged[same][0]
+               and _equal(stored[same][1], merged[same][1])):
+            same += 1
+        if same == len(stored) == len(merged):
+            return result
+
+        if same < len(stored):
+            cut, prefix = stored[same][2], b''
+        else:
+            cut = self._stat()[0]
+            prefix = b'' if self._ends_with_newline() else b'\n'
+        data = prefix + b''.join(f"{d},{v}\n".encode() for d, v in merged[same:])
+        with open(self.path, 'r+b') as f:
+            f.seek(cut)
+            f.truncate()
+            f.write(data)
+
+        self._save_meta(merged[-1][0], total - (len(stored) - same) + (len(merged) - same))
+        result['appended'] = len(incoming.keys() - old.keys())
+        result['revised']  = sum(1 for d, v in incoming.items() if d in old and not _equal(old[d], v))
+        result['written']  = len(data)
+        return result
+
+    # ------------------------------------------------------------
+    # File access
+    # ------------------------------------------------------------
+    def _stat(self) -> tuple | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _save_meta(self, last_date: str | None, rows: int) -> dict:
+        size, mtime_ns = self._stat()
+        meta = {'last_date': last_date, 'rows': rows, 'size': size, 'mtime_ns': mtime_ns}
+        tmp = self.meta_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.meta_path)
+        return {'last_date': last_date, 'rows': rows}
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _tail(self, since: str) -> list[tuple[str, str, int]]:
+        '''(date, value, byte offset) of stored rows dated on or after since, reading backwards.'''
+        size = self._stat()[0]
+        pos = size
+        while pos > 0:
+            pos = max(0, pos - _CHUNK)
+            rows = self._rows_from(pos)
+            # Rows found start on a full line; once one precedes since, all later rows are in hand
+            if pos == 0 or (rows and rows[0][0] < since):
+                return [r for r in rows if r[0] >= since]
+        return []
+
+    def _rows_from(self, pos: int) -> list[tuple[str, str, int]]:
+        '''Parse rows from byte pos to EOF, skipping a partial first line when pos > 0.'''
+        with open(self.path, 'rb') as f:
+            f.seek(pos)
+            buf = f.read()
+        start = 0
+        if pos > 0:
+            start = buf.find(b'\n') + 1
+            if start == 0:
+                return []
+        rows = []
+        while start < len(buf):
+            end = buf.find(b'\n', start)
+            end = len(buf) if end < 0 else end + 1
+            line = buf[start:end].rstrip(b'\r\n').decode('utf-8')
+            d, _, v = line.partition(',')
+            if d and d != 'date':
+                rows.append((d, _clean(v), pos + start))
+            start = end
+        return rows
+
+
+def _clean(value) -> str:
+    '''FRED values as stored: stripped text, with the '.' missing marker as blank.'''
+    text = '' if value is None else str(value).strip()
+    return '' if text == '.' else text
+
+
+def _equal(a: str, b: str) -> bool:
+    '''Stored and fetched values match (numerically, so 6.380 equals 6.38).'''
+    if a == b:
+        return True
+    try:
+        return float(a) == float(b)
+    except ValueError:
+        return False
@@ -1,3 +1,8 @@
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
 import pandas as pd
 import itertools
 from pathlib import Path
@@ -7,22 +12,42 @@ from indicators import IndicatorEngine
 from backtester import Backtester
 from strategy_generic import GenericStrategy, PARAM_NAMES, INT_PARAMS
 
+# Trailing rows of the raw inputs saved with the optimizer state. On resume they
+# must still match the reloaded data, otherwise history was revised (e.g. a FRED
+# correction) and the saved per-combo state is no longer valid.
+STATE_TAIL_ROWS = 8
+STATE_TAIL_COLS = ['Ret', 'Spread', 'DGS10', 'DGS2']
+
+# Saved states kept per ticker, one per grid/parameter config (most recently
+# written first); older configs are deleted.
+STATES_PER_TICKER = 8
+
 
 class GenericOptimizer:
     """
     Single generic grid-search optimizer for all securities.
     Grids are passed in as a dict; disabled factors collapse to [0].
+
+    When state_dir is given, each combo's terminal state (position, was_sold,
+    equity, trade count) is saved after a run, in a file per ticker and config
+    hash. A later run with the same grid on data that only gained new rows
+    brings every combo forward over just the appended weeks instead of
+    re-running the full history.
     """
 
     def __init__(self, input_type: str, input_dir: Path, cash_rate: float,
                  param_grids: dict = None, start_date: str = None,
-                 end_date: str = None, disabled_factors=()) :
+                 end_date: str = None, disabled_factors=(),
+                 state_dir: Path = None, indicators: dict = None) :
         self.input_type = input_type
         self.input_dir  = input_dir
         self.cash_rate  = cash_rate
         self.start_date = start_date
         self.end_date   = end_date
         self.ignore     = set(disabled_factors)
+        self.state_dir  = state_dir
+        self.indicators = indicators
+        self.data_version = None   # version of the data the last run() used
 
         # Default single-value grids (overridden by param_grids)
         self.grids = {
@@ -48,15 +73,49 @@ class GenericOptimizer:
         if empty:
             raise ValueError(f"Empty parameter grid(s): {', '.join(empty)} — check min/max/step values.")
 
-        loader = WeeklyDataLoader(self.input_type, self.input_dir, ticker)
+        loader = WeeklyDataLoader(self.input_type, self.input_dir, ticker, indicators=self.indicators)
         df = loader.load(start_date=self.start_date, end_date=self.end_date)
+        self.data_version = loader.version
 
         grid_lists = [active[k] for k in PARAM_NAMES]
+
+        state_key = self._state_key(ticker, active, start_invested)
+        saved     = self._load_state(ticker, state_key)
+        n_new     = self._rows_to_resume(saved, df) if saved else None
+        if n_new is None:
+            rows = self._run_full(df, grid_lists, start_invested, progress_callback)
+        else:
+            rows = self._run_incremental(df, saved['combos'], n_new, progress_callback)
+        self._save_state(ticker, state_key, df, rows)
+
+        results_df = pd.DataFrame(rows).drop(columns=['invested', 'was_sold'])
+        for k in INT_PARAMS:
+            results_df[k] = results_df[k].apply(int)
+
+        best_row    = results_df.loc[results_df['APY'].idxmax()]
+        best_params = {
+            k: (int(best_row[k]) if k in INT_PARAMS else float(best_row[k]))
+            for k in PARAM_NAMES
+        }
+
+        df_best    = IndicatorEngine.apply_all(df.copy(), best_params['MA'])
+        best_strat = GenericStrategy(best_params, ignore=self.ignore)
+        positions, buys, sells = best_strat.run(df_best, start_invested=start_invested)
+        bt = Backtester(self.cash_rate)
+        best_result = bt.run(df_best, positions, buys, sells)
+
+        return best_params, results_df, best_result
+
+    # ------------------------------------------------------------
+    # Full and incremental grid evaluation
+    # ------------------------------------------------------------
+    def _run_full(self, df: pd.DataFrame, grid_lists: list, start_invested: int,
+                  progress_callback=None) -> list[dict]:
         total = 1
         for g in grid_lists:
             total *= len(g)
 
-        results = []
+        rows = []
         current = 0
 
         for combo in itertools.product(*grid_lists):
@@ -68,25 +127,146 @@ class GenericOptimizer:
             bt = Backtester(self.cash_rate)
             bt_result = bt.run(df_ind, positions, buys, sells)
 
-            results.append({**params, 'APY': bt_result['apy'], 'final_value': bt_result['final_value'], 'trade_count': len(sells)})
+            rows.append({**params, 'APY': bt_result['apy'], 'final_value': bt_result['final_value'],
+                         'trade_count': len(sells), **strat.state})
             current += 1
             if progress_callback:
                 progress_callback(current, total)
 
-        results_df = pd.DataFrame(results)
-        for k in INT_PARAMS:
-            results_df[k] = results_df[k].apply(int)
+        return rows
 
-        best_row    = results_df.loc[results_df['APY'].idxmax()]
-        best_params = {
-            k: (int(best_row[k]) if k in INT_PARAMS else float(best_row[k]))
-            for k in PARAM_NAMES
+    def _run_incremental(self, df: pd.DataFrame, saved_rows: list[dict], n_new: int,
+                         progress_callback=None) -> list[dict]:
+        """Bring each saved combo forward over the last n_new rows of df."""
+        total = len(saved_rows)
+        if n_new == 0:
+            if progress_callback:
+                progress_callback(total, total)
+            return saved_rows
+
+        cash_weekly = Backtester(self.cash_rate).cash_weekly
+        years = (df.index[-1] - df.index[0]).days / 365.25
+        rets  = df['Ret'].to_numpy()[-n_new:]
+        ind_by_ma: dict[int, pd.DataFrame] = {}
+
+        rows = []
+        for current, saved in enumerate(saved_rows, start=1):
+            params = {k: saved[k] for k in PARAM_NAMES}
+            ma = int(params['MA'])
+            if ma not in ind_by_ma:
+                ind_by_ma[ma] = IndicatorEngine.apply_all(df.copy(), ma)
+            strat = GenericStrategy(params, ignore=self.ignore)
+            frame = ind_by_ma[ma].iloc[-(n_new + strat.warmup_rows):]
+            positions, buys, sells = strat.resume(frame, saved, n_new)
+
+            # Same convention as Backtester: the position held at week t-1 earns week t's return.
+            pos_shifted = np.array([saved['invested']] + positions[:-1], dtype=float)
+            strat_ret   = rets * pos_shifted + cash_weekly * (1 - pos_shifted)
+            final_value = float(saved['final_value'] * np.nanprod(1 + strat_ret))
+            apy = final_value ** (1 / years) - 1 if years > 0 else 0.0
+
+            rows.append({**params, 'APY': apy, 'final_value': final_value,
+                         'trade_count': saved['trade_count'] + len(sells), **strat.state})
+            if progress_callback:
+                progress_callback(current, total)
+
+        return rows
+
+    # ------------------------------------------------------------
+    # Persisted per-combo state
+    # ------------------------------------------------------------
+    def _state_key(self, ticker: str, active: dict, start_invested: int) -> str:
+        """Hash of everything that must match for saved combo state to be reusable."""
+        spec = {
+            'ticker':         ticker.upper(),
+            'input_type':     self.input_type,
+            'grids':          {k: [float(v) for v in active[k]] for k in PARAM_NAMES},
+            'ignore':         sorted(self.ignore),
+            'start_date':     self.start_date,
+            'end_date':       self.end_date,
+            'start_invested': int(start_invested),
+            'cash_rate':      float(self.cash_rate),
+            'indicators':     self.indicators,
         }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
 
-        df_best    = IndicatorEngine.apply_all(df.copy(), best_params['MA'])
-        best_strat = GenericStrategy(best_params, ignore=self.ignore)
-        positions, buys, sells = best_strat.run(df_best, start_invested=start_invested)
-        bt = Backtester(self.cash_rate)
-        best_result = bt.run(df_best, positions, buys, sells)
+    def _state_path(self, ticker: str, state_key: str) -> Path:
+        return Path(self.state_dir) / f"{ticker.lower()}-optimizer-state-{state_key[:16]}.json"
 
-        return best_params, results_df, best_result
+    def _load_state(self, ticker: str, state_key: str) -> dict | None:
+        if self.state_dir is None:
+            return None
+        path = self._state_path(ticker, state_key)
+        if not path.exists():
+            return None
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        return state if state.get('key') == state_key else None
+
+    def _save_state(self, ticker: str, state_key: str, df: pd.DataFrame, rows: list[dict]) -> None:
+        if self.state_dir is None:
+            return
+        tail = df[STATE_TAIL_COLS].iloc[-STATE_TAIL_ROWS:]
+        state = {
+            'key':        state_key,
+            'first_date': df.index[0].strftime('%Y-%m-%d'),
+            'last_date':  df.index[-1].strftime('%Y-%m-%d'),
+            'tail': {
+                'dates':  [d.strftime('%Y-%m-%d') for d in tail.index],
+                'values': [[None if pd.isna(v) else float(v) for v in r] for r in tail.to_numpy()],
+            },
+            'combos': [
+                {**{k: (int(r[k]) if k in INT_PARAMS else float(r[k])) for k in PARAM_NAMES},
+                 'APY': float(r['APY']), 'final_value': float(r['final_value']),
+                 'trade_count': int(r['trade_count']),
+                 'invested': int(r['invested']), 'was_sold': bool(r['was_sold'])}
+                for r in rows
+            ],
+        }
+        path = self._state_path(ticker, state_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of this write's own: runs for the same key can save at once
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=path.name,
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp.write(json.dumps(state))
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+        self._prune_states(ticker)
+
+    def _prune_states(self, ticker: str) -> None:
+        """Keep the STATES_PER_TICKER most recently written states for ticker."""
+        stamped = []
+        for path in Path(self.state_dir).glob(f"{ticker.lower()}-optimizer-state-*.json"):
+            try:
+                stamped.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:   # pruned by a concurrent run
+                pass
+        stamped.sort(reverse=True)
+        for _, old in stamped[STATES_PER_TICKER:]:
+            old.unlink(missing_ok=True)
+
+    def _rows_to_resume(self, saved: dict, df: pd.DataFrame) -> int | None:
+        """
+        Number of rows appended to df since the saved state, or None when the
+        saved state cannot be resumed (history changed or moved).
+        """
+        if df.index[0] != pd.Timestamp(saved['first_date']):
+            return None
+        last = pd.Timestamp(saved['last_date'])
+        if last not in df.index:
+            return None
+
+        tail_dates = pd.DatetimeIndex(pd.to_datetime(saved['tail']['dates']))
+        if not tail_dates.isin(df.index).all():
+            return None
+        saved_tail = np.array(saved['tail']['values'], dtype=float)
+        current    = df.loc[tail_dates, STATE_TAIL_COLS].to_numpy(dtype=float)
+        if not np.allclose(saved_tail, current, rtol=1e-9, atol=0.0, equal_nan=True):
+            return None
+
+        return len(df) - (df.index.get_loc(last) + 1)
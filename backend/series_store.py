@@ -0,0 +1,228 @@
+###################################################################################
+#  Local Time-Series Store
+#
+# An embedded SQLite mirror of the input CSVs (price series and FRED series),
+# keyed by (series, date), so loaders read only the date range they need and
+# coverage questions (first/last date) are answered from a metadata row.
+###################################################################################
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    series TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    value  REAL,
+    PRIMARY KEY (series, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS series_meta (
+    series           TEXT PRIMARY KEY,
+    first_date       TEXT,
+    last_date        TEXT,
+    last_valid_date  TEXT,
+    rows             INTEGER NOT NULL,
+    source_size      INTEGER,
+    source_mtime_ns  INTEGER,
+    updated_at       REAL NOT NULL
+);
+"""
+
+# Columns added to series_meta after its first release: (name, type)
+_META_COLUMNS = [
+    ('first_valid_date', 'TEXT'),
+    ('content_hash',     'TEXT'),
+    ('fetched_at',       'REAL'),
+]
+
+
+def price_series(ticker: str) -> str:
+    '''Series name for a ticker's adjusted close.'''
+    return f"price:{ticker.upper()}"
+
+
+def fred_series(series_id: str) -> str:
+    '''Series name for a FRED series.'''
+    return f"fred:{series_id}"
+
+
+class SeriesStore:
+    '''
+    SQLite store of (series, date, value) observations plus per-series coverage.
+
+    Each series mirrors one source CSV. sync_csv re-imports a series whenever
+    its CSV's size or mtime differs from what was last imported, so the CSVs
+    stay the source of truth and edits made outside the app are picked up.
+    Fetch paths call upsert with just the rows they wrote.
+
+    series_meta is the metadata index: first/last (valid) date, row count, a
+    hash of the series contents and the last fetch time, rewritten on every
+    write. Index rows are also held in memory, so meta() is a dict lookup.
+
+    :param db_path: SQLite database file (created on first use).
+    '''
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._meta: dict[str, dict] = {}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            have = {row[1] for row in conn.execute("PRAGMA table_info(series_meta)")}
+            for name, kind in _META_COLUMNS:
+                if name not in have:
+                    conn.execute(f"ALTER TABLE series_meta ADD COLUMN {name} {kind}")
+            conn.row_factory = sqlite3.Row
+            self._meta = {r['series']: dict(r) for r in conn.execute("SELECT * FROM series_meta")}
+            conn.row_factory = None
+            # Index rows written before content hashes existed
+            for series, meta in list(self._meta.items()):
+                if meta['content_hash'] is None:
+                    self._meta[series] = self._refresh_meta(
+                        conn, series, (meta['source_size'], meta['source_mtime_ns']))
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call: safe across request threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+    def upsert(self, series: str, rows, source: Path = None, replace: bool = False,
+               fetched_at: float = None) -> None:
+        '''
+        Insert or update (date 'YYYY-MM-DD', value or None) rows of a series.
+
+        :param source: CSV the series mirrors; its current size/mtime are recorded
+            so the next sync_csv knows these rows are already imported.
+        :param replace: Drop the series' existing rows first.
+        :param fetched_at: When the rows were fetched from the provider; omitted
+            for imports, which keep the previous fetch time.
+        '''
+        rows = [(series, d, None if v is None or pd.isna(v) else float(v)) for d, v in rows]
+        with self._lock, self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM observations WHERE series = ?", (series,))
+            conn.executemany("INSERT OR REPLACE INTO observations VALUES (?, ?, ?)", rows)
+            meta = self._refresh_meta(conn, series, _stat(source), fetched_at)
+        self._meta[series] = meta
+
+    def sync_csv(self, series: str, path: Path, date_col: str, value_col: str) -> bool:
+        '''Re-import series from its CSV if the file changed since the last import. Returns True if it did.'''
+        path = Path(path)
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        meta = self.meta(series)
+        if meta and (meta['source_size'], meta['source_mtime_ns']) == (st.st_size, st.st_mtime_ns):
+            return False
+
+        df = pd.read_csv(path, usecols=[date_col, value_col])
+        self.upsert_frame(series, df, date_col, value_col, source=path, replace=True)
+        return True
+
+    def upsert_frame(self, series: str, df: pd.DataFrame, date_col: str, value_col: str,
+                     source: Path = None, replace: bool = False, fetched_at: float = None) -> None:
+        '''upsert from a frame of raw date / value columns (unparseable dates skipped, values coerced).'''
+        dates  = pd.to_datetime(df[date_col], errors='coerce')
+        values = pd.to_numeric(df[value_col].astype(str).str.strip(), errors='coerce')
+        keep   = dates.notna()
+        self.upsert(series, zip(dates[keep].dt.strftime('%Y-%m-%d'), values[keep]),
+                    source=source, replace=replace, fetched_at=fetched_at)
+
+    # ------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------
+    def read(self, series: str, start: str = None, end: str = None) -> pd.DataFrame:
+        '''Observations with start <= date <= end (either bound optional), oldest first: date, value.'''
+        sql, args = "SELECT date, value FROM observations WHERE series = ?", [series]
+        if start:
+            sql += " AND date >= ?"
+            args.append(start)
+        if end:
+            sql += " AND date <= ?"
+            args.append(end)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY date", args).fetchall()
+        df = pd.DataFrame(rows, columns=['date', 'value'])
+        df['date']  = pd.to_datetime(df['date'])
+        df['value'] = df['value'].astype(float)
+        return df
+
+    def meta(self, series: str) -> dict | None:
+        '''
+        Index entry of a series: first/last and first/last valid date, rows,
+        content_hash, fetched_at, source stat and updated_at.
+        '''
+        meta = self._meta.get(series)
+        return dict(meta) if meta else None
+
+    def last_date_until(self, series: str, end: str) -> str | None:
+        '''Latest observation date on or before end.'''
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM observations WHERE series = ? AND date <= ?",
+                               (series, end)).fetchone()
+        return row[0]
+
+    # ------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------
+    def _refresh_meta(self, conn: sqlite3.Connection, series: str, source_stat: tuple = (None, None),
+                      fetched_at: float = None) -> dict:
+        first, last, rows = conn.execute(
+            "SELECT MIN(date), MAX(date), COUNT(*) FROM observations WHERE series = ?", (series,)
+        ).fetchone()
+        first_valid, last_valid = conn.execute(
+            "SELECT MIN(date), MAX(date) FROM observations WHERE series = ? AND value IS NOT NULL",
+            (series,),
+        ).fetchone()
+        digest = hashlib.sha256()
+        for d, v in conn.execute("SELECT date, value FROM observations WHERE series = ? ORDER BY date",
+                                 (series,)):
+            digest.update(f"{d},{'' if v is None else repr(v)}\n".encode())
+
+        size, mtime_ns = source_stat
+        if fetched_at is None:
+            fetched_at = (self._meta.get(series) or {}).get('fetched_at')
+
+        meta = {
+            'series':           series,
+            'first_date':       first,
+            'last_date':        last,
+            'last_valid_date':  last_valid,
+            'rows':             rows,
+            'source_size':      size,
+            'source_mtime_ns':  mtime_ns,
+            'updated_at':       time.time(),
+            'first_valid_date': first_valid,
+            'content_hash':     digest.hexdigest(),
+            'fetched_at':       fetched_at,
+        }
+        conn.execute(
+            f"INSERT OR REPLACE INTO series_meta ({', '.join(meta)}) "
+            f"VALUES ({', '.join('?' * len(meta))})",
+            list(meta.values()),
+        )
+        return meta
+
+
+def _stat(path: Path = None) -> tuple:
+    '''(size, mtime_ns) of a source file, or (None, None) without one.'''
+    if path is None:
+        return None, None
+    st = Path(path).stat()
+    return st.st_size, st.st_mtime_ns
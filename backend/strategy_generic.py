@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from strategy_base import BaseStrategy
 
@@ -35,6 +36,11 @@ class GenericStrategy(BaseStrategy):
         self.YIELD10_DELTA  = int(params.get('YIELD10_DELTA', 2))
         self.ignore = set(ignore)
 
+    @property
+    def warmup_rows(self) -> int:
+        """Rows of history _compute_signals' rolling windows look back over (see resume())."""
+        return max(4, self.SPREAD_DELTA, self.YIELD10_DELTA)
+
     def evaluate_sell(self, row: pd.Series, df: pd.DataFrame, idx) -> bool:
         c2 = False if 'CHG4'        in self.ignore else ((not pd.isna(row['chg4']))          and (row['chg4']          > self.CHG4_THR))
         c3 = False if 'RET3'        in self.ignore else ((not pd.isna(row['ret3']))          and (row['ret3']          < self.RET3_THR))
@@ -62,35 +68,122 @@ class GenericStrategy(BaseStrategy):
         cond4 = True if 'YIELD10_DELTA'  in self.ignore else (past['yield10_delta'].tail(self.YIELD10_DELTA) < 0).all()
         return bool(cond1 and cond2 and cond3 and cond4)
 
-    def _compute_signals(self, df: pd.DataFrame):
+    def factor_masks(self, df: pd.DataFrame) -> tuple[dict, dict]:
+        """
+        Per-factor sell and buy conditions as boolean arrays, keyed by factor.
+        Factors in self.ignore are left out.
+        """
         ma_col = f'MA{self.MA_LENGTH}'
-
-        sell_chg4        = pd.Series(False, index=df.index) if 'CHG4'       in self.ignore else (df['chg4']          > self.CHG4_THR)
-        sell_ret3        = pd.Series(False, index=df.index) if 'RET3'       in self.ignore else (df['ret3']          < self.RET3_THR)
-        sell_yld10_chg4  = pd.Series(False, index=df.index) if 'YIELD10_CHG4' in self.ignore else (df['yield10_chg4']  > self.YIELD10_CHG4)
-        sell_yld2_chg4   = pd.Series(False, index=df.index) if 'YIELD2_CHG4'  in self.ignore else (df['yield2_chg4']   > self.YIELD2_CHG4)
-        sell_curve_chg4  = pd.Series(False, index=df.index) if 'CURVE_CHG4' in self.ignore else (df['curve_chg4']    < -self.CURVE_CHG4)
-        sell_mask = (sell_chg4 | sell_ret3 | sell_yld10_chg4 | sell_yld2_chg4 | sell_curve_chg4).fillna(False).to_numpy()
-
-        buy_ma    = pd.Series(True, index=df.index) if 'MA'           in self.ignore else (df['close'] > df[ma_col])
-        buy_delta = pd.Series(True, index=df.index) if 'SPREAD_DELTA' in self.ignore else (df['spread_delta'].rolling(self.SPREAD_DELTA).max() < 0)
-        buy_drop  = pd.Series(True, index=df.index) if 'DROP'         in self.ignore else (df['Spread'] <= df['Spread'].rolling(4).max() * (1 - self.DROP))
-        buy_yld10 = pd.Series(True, index=df.index) if 'YIELD10_DELTA'  in self.ignore else (df['yield10_delta'].rolling(self.YIELD10_DELTA).max() < 0)
-        buy_mask = (buy_ma & buy_delta & buy_drop & buy_yld10).fillna(False).to_numpy()
-
+        sell = {
+            'CHG4':         lambda: df['chg4']          > self.CHG4_THR,
+            'RET3':         lambda: df['ret3']          < self.RET3_THR,
+            'YIELD10_CHG4': lambda: df['yield10_chg4']  > self.YIELD10_CHG4,
+            'YIELD2_CHG4':  lambda: df['yield2_chg4']   > self.YIELD2_CHG4,
+            'CURVE_CHG4':   lambda: df['curve_chg4']    < -self.CURVE_CHG4,
+        }
+        buy = {
+            'MA':            lambda: df['close'] > df[ma_col],
+            'SPREAD_DELTA':  lambda: df['spread_delta'].rolling(self.SPREAD_DELTA).max() < 0,
+            'DROP':          lambda: df['Spread'] <= df['Spread'].rolling(4).max() * (1 - self.DROP),
+            'YIELD10_DELTA': lambda: df['yield10_delta'].rolling(self.YIELD10_DELTA).max() < 0,
+        }
+        sell_masks = {k: f().fillna(False).to_numpy(dtype=bool) for k, f in sell.items() if k not in self.ignore}
+        buy_masks  = {k: f().fillna(False).to_numpy(dtype=bool) for k, f in buy.items() if k not in self.ignore}
+        return sell_masks, buy_masks
+
+    @staticmethod
+    def combine_masks(sell_masks: dict, buy_masks: dict, n: int, ignore=()):
+        """SELL is the OR of the sell factors, BUY the AND of the buy factors, skipping ignore."""
+        sell_mask = np.zeros(n, dtype=bool)
+        for k, m in sell_masks.items():
+            if k not in ignore:
+                sell_mask |= m
+        buy_mask = np.ones(n, dtype=bool)
+        for k, m in buy_masks.items():
+            if k not in ignore:
+                buy_mask &= m
         return sell_mask, buy_mask
 
-    def run(self, df: pd.DataFrame, start_invested: int = 1):
+    def _compute_signals(self, df: pd.DataFrame):
+        sell_masks, buy_masks = self.factor_masks(df)
+        return self.combine_masks(sell_masks, buy_masks, len(df))
+
+    @staticmethod
+    def run_batch(sell_masks: np.ndarray, buy_masks: np.ndarray, start_invested, was_sold=None):
+        """
+        The run() state machine for many mask sets at once.
+
+        sell_masks / buy_masks are (n_rows, n_sets) boolean arrays, one column per
+        set. start_invested and was_sold are scalars or per-set arrays; was_sold
+        defaults to (start_invested == 0) as in run(). Returns positions as an
+        (n_sets, n_rows) 0/1 array, the number of sells per set, and the end
+        state as {'invested': array, 'was_sold': array}.
+        """
+        n_rows, n_sets = sell_masks.shape
+        invested  = np.array(np.broadcast_to(np.asarray(start_invested, dtype=bool), (n_sets,)))
+        if was_sold is None:
+            was_sold = ~invested
+        else:
+            was_sold = np.array(np.broadcast_to(np.asarray(was_sold, dtype=bool), (n_sets,)))
+        positions = np.empty((n_rows, n_sets), dtype=np.int8)
+        sells     = np.zeros(n_sets, dtype=int)
+
+        for i in range(n_rows):
+            sell_now = invested & sell_masks[i]
+            buy_now  = ~invested & was_sold & buy_masks[i] & ~sell_masks[i]
+            invested = (invested & ~sell_now) | buy_now
+            was_sold |= sell_now
+            sells    += sell_now
+            positions[i] = invested
+
+        return positions.T, sells, {'invested': invested.astype(int), 'was_sold': was_sold}
+
+    def run(self, df: pd.DataFrame, start_invested: int = 1, was_sold: bool = None):
+        """
+        Run the strategy over every row of df.
+
+        was_sold defaults to (start_invested == 0): starting in cash counts as
+        already sold. The end state is left on self.state for resume().
+        """
         sell_mask, buy_mask = self._compute_signals(df)
-        index = df.index
-
-        invested = int(start_invested)
+        if was_sold is None:
+            was_sold = (start_invested == 0)
+        return self._walk(sell_mask, buy_mask, df.index, int(start_invested), bool(was_sold))
+
+    def row_states(self, df: pd.DataFrame, start_invested: int = 1) -> list[dict]:
+        """
+        Run over df and return the end-of-row state after every row
+        ({'invested': 0/1, 'was_sold': bool}). Any entry can be passed to resume()
+        or used as run(start_invested=..., was_sold=...) to continue from that row.
+        """
+        positions, _, sell_dates = self.run(df, start_invested=start_invested)
+        sells = set(sell_dates)
         was_sold = (start_invested == 0)
+        states = []
+        for idx, pos in zip(df.index, positions):
+            was_sold = was_sold or idx in sells
+            states.append({'invested': pos, 'was_sold': was_sold})
+        return states
+
+    def resume(self, df: pd.DataFrame, state: dict, n_new: int):
+        """
+        Continue a previous run from its end state over the last n_new rows of df.
+
+        The earlier rows of df are warm-up only: they feed the rolling windows
+        in _compute_signals but are not traded. state is a previous self.state
+        ({'invested': 0/1, 'was_sold': bool}).
+        """
+        sell_mask, buy_mask = self._compute_signals(df)
+        start = len(df) - n_new
+        return self._walk(sell_mask[start:], buy_mask[start:], df.index[start:],
+                          int(state['invested']), bool(state['was_sold']))
+
+    def _walk(self, sell_mask, buy_mask, index, invested: int, was_sold: bool):
         positions = []
         buy_dates = []
         sell_dates = []
 
-        for i in range(len(df)):
+        for i in range(len(index)):
             if invested:
                 if sell_mask[i]:
                     invested = 0
@@ -102,4 +195,5 @@ class GenericStrategy(BaseStrategy):
                     buy_dates.append(index[i])
             positions.append(invested)
 
+        self.state = {'invested': invested, 'was_sold': was_sold}
         return positions, buy_dates, sell_dates
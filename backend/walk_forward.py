@@ -1,4 +1,15 @@
+import concurrent.futures
+import hashlib
 import itertools
+import json
+import logging
+import os
+import multiprocessing
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
@@ -7,8 +18,60 @@ from pathlib import Path
 from data_loader import WeeklyDataLoader
 from indicators import IndicatorEngine
 from strategy_generic import GenericStrategy, PARAM_NAMES, INT_PARAMS
-from strategy_buyhold import BuyAndHoldStrategy
 from backtester import Backtester
+from window_stats import WindowStatsIndex
+
+
+# Ignore-subset search strategies for discover-mode combination elimination
+ELIMINATION_STRATEGIES = ('exhaustive', 'greedy', 'beam')
+
+# Discover-mode grid search: combos evaluated per batch, and seconds between
+# progress updates
+GRID_CHUNK = 256
+GRID_PROGRESS_SECONDS = 0.5
+
+# Entries kept in the shared evaluation-cell and anchored-carry caches. Both
+# are LRU-bounded so memory stays flat however large max_combinations is.
+CELL_CACHE_SIZE = 16384
+CARRY_CACHE_SIZE = 16384
+
+# Estimated work (windows x strategy evaluations per window) below which
+# windows run serially. Spawning a pool and shipping it the engine costs about
+# 1.5s against roughly 85us per evaluation, so only large discover runs gain;
+# validate (one evaluation per window) stays serial in practice.
+POOL_MIN_WORK = 50_000
+
+# Serializes the read-merge-write of saved window files between runs (jobs
+# run on threads of one process)
+_CACHE_FILE_LOCK = threading.Lock()
+
+log = logging.getLogger(__name__)
+
+
+class _LRUDict(OrderedDict):
+    """Dict holding at most maxsize entries; reads and writes refresh an entry, the oldest is evicted."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = max(1, int(maxsize))
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def __reduce__(self):
+        # Engines are pickled into pool workers
+        return type(self), (self.maxsize,), None, None, iter(list(super().items()))
 
 
 class WalkForwardEngine:
@@ -29,16 +92,37 @@ class WalkForwardEngine:
         1 = start invested, 0 = start in cash.
     config : AppConfig (Pydantic model)
         Per-security config with sell_triggers and buy_conditions.
+    max_workers : int
+        Worker processes for independent windows (1 = run serially in-process).
+    cache_dir : Path, optional
+        Directory for per-window results persisted between runs (see
+        _open_cache). None disables the cache.
+    indicators : dict, optional
+        {column: FRED series ID} passed to WeeklyDataLoader.
     """
 
     def __init__(self, input_type: str, input_dir: Path, ticker: str,
-                 cash_rate: float, start_invested: int, config):
+                 cash_rate: float, start_invested: int, config,
+                 max_workers: int = 1, cache_dir: Path = None, indicators: dict = None):
         self.input_type = input_type
         self.input_dir = input_dir
         self.ticker = ticker
         self.cash_rate = cash_rate
         self.start_invested = start_invested
         self.config = config
+        self.max_workers = max(1, int(max_workers))
+        self.cache_dir = cache_dir
+        self.indicators = indicators
+        self._cache: dict | None = None
+        self._checkpoint: dict | None = None
+        self._data_hashes: dict = {}
+        self._raw: np.ndarray | None = None
+        self._carry = _LRUDict(CARRY_CACHE_SIZE)
+        self._cells = _LRUDict(CELL_CACHE_SIZE)
+        self._cell_hits = 0
+        self._cells_evaluated = 0
+        self._stats: WindowStatsIndex | None = None
+        self.data_version: str | None = None   # version of the data the last run loaded
 
     # ------------------------------------------------------------------
     # Data loading
@@ -46,8 +130,11 @@ class WalkForwardEngine:
 
     def _prepare_base(self) -> pd.DataFrame:
         """Load full data and apply all non-MA indicators."""
-        loader = WeeklyDataLoader(self.input_type, self.input_dir, self.ticker)
+        loader = WeeklyDataLoader(self.input_type, self.input_dir, self.ticker, indicators=self.indicators)
         df = loader.load()  # full history, no date filter
+        self.data_version = loader.version
+        # Loaded rows as raw bytes (dates + values), for the window cache's data check
+        self._raw = np.column_stack([df.index.asi8.view(np.float64), df.to_numpy(dtype=float)])
         # Apply all non-MA indicators (MA depends on params, added lazily)
         df = IndicatorEngine.add_chg4(df)
         df = IndicatorEngine.add_ret3(df)
@@ -64,11 +151,15 @@ class WalkForwardEngine:
         if col not in base_df.columns:
             base_df[col] = base_df['close'].rolling(n).mean()
 
-    def _get_window(self, base_df: pd.DataFrame, ma: int,
-                    start: str, end: str) -> pd.DataFrame:
-        """Ensure MA is computed, then return a copy of the date-sliced window."""
+    def _get_window(self, base_df: pd.DataFrame, ma: int, bounds: tuple[int, int]) -> pd.DataFrame:
+        """Ensure MA is computed, then return the positional window (no copy)."""
         self._ensure_ma(base_df, ma)
-        return base_df.loc[pd.Timestamp(start):pd.Timestamp(end)].copy()
+        return base_df.iloc[bounds[0]:bounds[1]]
+
+    def _bounds(self, df: pd.DataFrame, start, end) -> tuple[int, int]:
+        """Integer (start, stop) offsets of the inclusive date range [start, end]."""
+        return (int(df.index.searchsorted(pd.Timestamp(start), side='left')),
+                int(df.index.searchsorted(pd.Timestamp(end), side='right')))
 
     # ------------------------------------------------------------------
     # Window generation
@@ -76,19 +167,26 @@ class WalkForwardEngine:
 
     def _snap_fwd(self, df: pd.DataFrame, dt) -> pd.Timestamp:
         """First index date >= dt."""
-        dt = pd.Timestamp(dt)
-        idx = df.index[df.index >= dt]
-        return idx[0] if len(idx) > 0 else df.index[-1]
+        pos = df.index.searchsorted(pd.Timestamp(dt), side='left')
+        return df.index[pos] if pos < len(df.index) else df.index[-1]
 
     def _snap_back(self, df: pd.DataFrame, dt) -> pd.Timestamp:
         """Last index date <= dt."""
-        dt = pd.Timestamp(dt)
-        idx = df.index[df.index <= dt]
-        return idx[-1] if len(idx) > 0 else df.index[0]
+        pos = df.index.searchsorted(pd.Timestamp(dt), side='right') - 1
+        return df.index[pos] if pos >= 0 else df.index[0]
 
     def _generate_windows(self, df: pd.DataFrame, window_size_months: int,
                            window_type: str, initial_training_months: int = 36,
-                           training_window_months: int = 36) -> list[dict]:
+                           training_window_months: int = 36,
+                           step_months: int | None = None) -> list[dict]:
+        """
+        Test windows of window_size_months, one every step_months (default:
+        window_size_months, i.e. back-to-back). A step shorter than the window
+        gives overlapping test windows.
+        """
+        step_months = window_size_months if step_months is None else step_months
+        if step_months < 1:
+            raise ValueError("step_months must be at least 1.")
         min_date = df.index.min()
         max_date = df.index.max()
         windows = []
@@ -112,7 +210,7 @@ class WalkForwardEngine:
                     'test_end':    test_end.strftime('%Y-%m-%d'),
                     'is_partial':  is_partial,
                 })
-                cursor += pd.DateOffset(months=window_size_months)
+                cursor += pd.DateOffset(months=step_months)
         else:  # rolling
             cursor = min_date + pd.DateOffset(months=training_window_months)
             while True:
@@ -133,8 +231,12 @@ class WalkForwardEngine:
                     'test_end':    test_end.strftime('%Y-%m-%d'),
                     'is_partial':  is_partial,
                 })
-                cursor += pd.DateOffset(months=window_size_months)
+                cursor += pd.DateOffset(months=step_months)
 
+        # Positional offsets into df, computed once and shared by every evaluation
+        for w in windows:
+            w['train_pos'] = self._bounds(df, w['train_start'], w['train_end'])
+            w['test_pos']  = self._bounds(df, w['test_start'], w['test_end'])
         return windows
 
     # ------------------------------------------------------------------
@@ -146,40 +248,397 @@ class WalkForwardEngine:
         """Run strategy on a window df (all indicators present). Returns (apy, trades)."""
         strat = GenericStrategy(params, ignore=ignore)
         positions, buys, sells = strat.run(df_window, start_invested=self.start_invested)
-        bt = Backtester(self.cash_rate)
-        result = bt.run(df_window, positions, buys, sells)
-        return result['apy'], len(sells)
+        _, (apy,) = Backtester(self.cash_rate).run_batch(df_window, np.array([positions]))
+        return apy, len(sells)
+
+    def _run_ignore_sets(self, base_df: pd.DataFrame, bounds: tuple[int, int], params: dict,
+                         ignore_sets: list[set]) -> list[tuple[float, int]]:
+        """Same as _run_params on the bounds window for each ignore set (see _run_sets)."""
+        return self._run_sets(base_df, bounds, [(params, ignore) for ignore in ignore_sets])
+
+    def _run_sets(self, base_df: pd.DataFrame, bounds: tuple[int, int],
+                  items: list[tuple[dict, set]]) -> list[tuple[float, int]]:
+        """
+        (apy, trades) on the bounds window for each (params, ignore) item. Items
+        already in the cell cache are answered from it; the rest are evaluated
+        together. Windows under 4 rows score (0.0, 0), as in _run_on_window.
+        """
+        if bounds[1] - bounds[0] < 4:
+            return [(0.0, 0)] * len(items)
+        keys = [self._cell_key(params, ignore, bounds) for params, ignore in items]
+        results = [self._cells.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        self._cell_hits += len(keys) - len(misses)
+        self._cells_evaluated += len(misses)
+        if misses:
+            computed = self._evaluate_sets(base_df, bounds, [items[i] for i in misses])
+            for i, result in zip(misses, computed):
+                self._cells[keys[i]] = results[i] = result
+        return results
+
+    def _evaluate_sets(self, base_df: pd.DataFrame, bounds: tuple[int, int],
+                       items: list[tuple[dict, set]]) -> list[tuple[float, int]]:
+        """
+        Evaluate each (params, ignore) item on the bounds window in batched calls.
+
+        Per-factor sell/buy masks are computed once per distinct factor value;
+        each item is then an OR/AND over its factors' masks, and all items go through
+        the strategy state machine and backtest together. Items with carried
+        state from an earlier anchored window (see _carried) only evaluate the
+        rows appended since; items are grouped by the row they resume from.
+        """
+        if not items:
+            return []
+        start, stop = bounds
+        groups: dict[int, list[int]] = {}
+        carried = []
+        for i, (params, ignore) in enumerate(items):
+            self._ensure_ma(base_df, int(params.get('MA', 50)))
+            carried.append(self._carried(bounds, params, ignore))
+            groups.setdefault(carried[-1]['stop'] if carried[-1] else start, []).append(i)
+
+        results = [None] * len(items)
+        for resume_at, idxs in groups.items():
+            group = [items[i] for i in idxs]
+            entries = [carried[i] for i in idxs]
+            if resume_at == stop:
+                for i, entry in zip(idxs, entries):
+                    results[i] = (entry['apy'], entry['trades'])
+                continue
+
+            # A factor's mask depends only on that factor's value (and the
+            # frame), so masks are built once per (factor, value, warm-up start)
+            # and shared by every item in the group.
+            masks: dict[tuple, tuple[str, np.ndarray]] = {}
+            sell_cols, buy_cols = [], []
+            for params, ignore in group:
+                warm = start if resume_at == start else max(start, resume_at - GenericStrategy(params).warmup_rows)
+                needed = [k for k in PARAM_NAMES if k not in ignore]
+                missing = [k for k in needed if (k, params[k], warm) not in masks]
+                if missing:
+                    strat = GenericStrategy(params, ignore=set(PARAM_NAMES) - set(missing))
+                    sell_masks, buy_masks = strat.factor_masks(base_df.iloc[warm:stop])
+                    for side, side_masks in (('sell', sell_masks), ('buy', buy_masks)):
+                        for k, m in side_masks.items():
+                            masks[(k, params[k], warm)] = (side, m)
+                sell_masks, buy_masks = {}, {}
+                for k in needed:
+                    side, m = masks[(k, params[k], warm)]
+                    (sell_masks if side == 'sell' else buy_masks)[k] = m
+                sell, buy = GenericStrategy.combine_masks(sell_masks, buy_masks, stop - warm)
+                sell_cols.append(sell[resume_at - warm:])
+                buy_cols.append(buy[resume_at - warm:])
+            sell = np.column_stack(sell_cols)
+            buy  = np.column_stack(buy_cols)
+
+            bt = Backtester(self.cash_rate)
+            if resume_at == start:
+                positions, sells, state = GenericStrategy.run_batch(sell, buy, self.start_invested)
+                final_values, apys = bt.run_batch(base_df.iloc[start:stop], positions)
+                trades = sells
+            else:
+                positions, sells, state = GenericStrategy.run_batch(
+                    sell, buy,
+                    [e['state']['invested'] for e in entries],
+                    [e['state']['was_sold'] for e in entries],
+                )
+                final_values, apys = bt.run_batch(base_df.iloc[resume_at:stop], positions, carry={
+                    'positions':    [e['state']['invested'] for e in entries],
+                    'final_values': [e['final_value'] for e in entries],
+                    'start':        base_df.index[start],
+                })
+                trades = sells + np.array([e['trades'] for e in entries])
+            for j, (i, (params, ignore)) in enumerate(zip(idxs, group)):
+                results[i] = (apys[j], int(trades[j]))
+                self._carry_store(bounds, params, ignore, {
+                    'state': {'invested': int(state['invested'][j]), 'was_sold': bool(state['was_sold'][j])},
+                    'final_value': final_values[j], 'apy': apys[j], 'trades': int(trades[j]),
+                })
+        return results
+
+    # ------------------------------------------------------------------
+    # Shared evaluation cells
+    # ------------------------------------------------------------------
+    # Every training or out-of-sample evaluation starts from start_invested,
+    # so its (apy, trades) depends only on (params, ignore, start, stop).
+    # Validate test windows start from the training entry state instead, which
+    # is appended to their key. The cells are kept across the windows of a run
+    # and across the configurations of a study, up to CELL_CACHE_SIZE (least
+    # recently used first out); they are reset whenever data is reloaded.
+
+    def _cell_key(self, params: dict, ignore, bounds: tuple[int, int]) -> tuple:
+        return (tuple(params[k] for k in PARAM_NAMES), frozenset(ignore), bounds[0], bounds[1])
+
+    def _reset_shared(self, base_df: pd.DataFrame) -> None:
+        """Drop every cache tied to a previously loaded base_df."""
+        self._stats = WindowStatsIndex(base_df, self.cash_rate)
+        self._carry = _LRUDict(CARRY_CACHE_SIZE)
+        self._cells = _LRUDict(CELL_CACHE_SIZE)
+        self._cell_hits = 0
+        self._cells_evaluated = 0
+        self._cache = None
+        self._checkpoint = None
+        self._data_hashes = {}
+
+    # ------------------------------------------------------------------
+    # Persistent window cache
+    # ------------------------------------------------------------------
+    # With cache_dir set, a run's per-window outputs are saved under a key of
+    # the run spec (run arguments, seed, security config). A saved window is
+    # reused when its dates, its seed and every data row it can read (all rows
+    # up to its test end) are unchanged: rerunning on the same data only costs
+    # the data load, and after new weeks are appended only the windows that
+    # reach them are recomputed.
+
+    def _spec_key(self, spec: dict) -> str:
+        """Hash of a run spec plus everything about this engine a window result depends on."""
+        config = getattr(self.config, 'model_dump', None)
+        full_spec = {
+            **spec,
+            'ticker':         self.ticker.upper(),
+            'input_type':     self.input_type,
+            'cash_rate':      float(self.cash_rate),
+            'start_invested': int(self.start_invested),
+            'config':         config() if config else None,
+            'indicators':     self.indicators,
+        }
+        return hashlib.sha256(json.dumps(full_spec, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def _read_json(path: Path, key: str) -> dict:
+        """Contents of a saved JSON file when it was written for key, else {}."""
+        if not path.exists():
+            return {}
+        try:
+            saved = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return saved if saved.get('key') == key else {}
+
+    @staticmethod
+    def _write_json(path: Path, data: dict) -> None:
+        """Atomically replace path, through a temp file of this write's own."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=path.name,
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp.write(json.dumps(data))
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def _open_cache(self, spec: dict) -> None:
+        """Load the saved windows for spec (call after _reset_shared)."""
+        if self.cache_dir is None:
+            return
+        key  = self._spec_key(spec)
+        path = Path(self.cache_dir) / f"{self.ticker.lower()}-walk-forward-{key[:16]}.json"
+        self._cache = {
+            'path':    path,
+            'key':     key,
+            'saved':   self._read_json(path, key).get('windows', {}),
+            'windows': {},
+        }
+
+    def _window_key(self, w: dict, seed: dict | None) -> str:
+        dates = f"{w['train_start']}|{w['train_end']}|{w['test_start']}|{w['test_end']}"
+        return dates if seed is None else f"{dates}|{json.dumps(seed, sort_keys=True)}"
+
+    def _data_hash(self, stop: int) -> str:
+        """Hash of loaded rows [0, stop), memoized per run."""
+        if stop not in self._data_hashes:
+            self._data_hashes[stop] = hashlib.sha256(self._raw[:stop].tobytes()).hexdigest()
+        return self._data_hashes[stop]
+
+    def _cache_lookup(self, w: dict, seed: dict | None = None) -> tuple[bool, object]:
+        """(True, output) for a reusable saved or checkpointed window, else (False, None)."""
+        key = self._window_key(w, seed)
+        for store, saved in ((self._cache, 'saved'), (self._checkpoint, 'windows')):
+            entry = store[saved].get(key) if store is not None else None
+            if entry is not None and entry['data'] == self._data_hash(w['test_pos'][1]):
+                if self._cache is not None:
+                    self._cache['windows'][key] = entry
+                return True, entry['output']
+        return False, None
+
+    def _cache_store(self, w: dict, output, seed: dict | None = None) -> None:
+        if self._cache is not None:
+            self._cache['windows'][self._window_key(w, seed)] = {
+                'data': self._data_hash(w['test_pos'][1]), 'output': output,
+            }
+
+    def _cache_save(self) -> None:
+        """
+        Merge this run's windows into the saved file. Windows saved by earlier
+        (or concurrent) runs are kept unless this run produced the same window,
+        so a cancelled or shorter run does not discard them. Called from
+        finally blocks, so a failed write is logged rather than raised: it
+        must not fail a finished run or mask the run's own error.
+        """
+        if self._cache is None:
+            return
+        path, key = self._cache['path'], self._cache['key']
+        try:
+            with _CACHE_FILE_LOCK:
+                saved = self._read_json(path, key).get('windows', {})
+                self._write_json(path, {'key': key, 'windows': {**saved, **self._cache['windows']}})
+        except OSError as exc:
+            log.warning("Could not save walk-forward windows to %s: %s", path, exc)
+
+    # ------------------------------------------------------------------
+    # Discover job checkpoints
+    # ------------------------------------------------------------------
+    # A discover run given a checkpoint_path rewrites that file after every
+    # completed window with the window outputs (under the same data check as
+    # the window cache). Rerunning the same spec with the same checkpoint_path
+    # skips the completed windows. Their outputs are replayed in order, which
+    # rebuilds factor_counts and, with seed_source='previous', prev_params for
+    # the first window still to run, so neither is stored.
+
+    def _open_checkpoint(self, path: Path | None, spec: dict) -> None:
+        if path is None:
+            return
+        key = self._spec_key(spec)
+        saved = self._read_json(Path(path), key)
+        self._checkpoint = {
+            'path':    Path(path),
+            'key':     key,
+            'windows': saved.get('windows', {}),
+        }
+
+    def _window_done(self, w: dict, output, seed: dict | None = None) -> None:
+        """Record a completed window in the window cache and the job checkpoint."""
+        self._cache_store(w, output, seed)
+        if self._checkpoint is None:
+            return
+        self._checkpoint['windows'][self._window_key(w, seed)] = {
+            'data': self._data_hash(w['test_pos'][1]), 'output': output,
+        }
+        self._write_json(self._checkpoint['path'], {
+            'key':     self._checkpoint['key'],
+            'windows': self._checkpoint['windows'],
+        })
+
+    # ------------------------------------------------------------------
+    # Anchored-window carry
+    # ------------------------------------------------------------------
+    # Anchored training windows all start at row 0 and only grow, so a
+    # (params, ignore) combo evaluated on one window can be carried into the
+    # next: its end state, equity and trade count are kept per combo and only
+    # the appended rows are run. At most CARRY_CACHE_SIZE combos are kept; the
+    # carry is reset whenever data is reloaded.
+
+    def _carried(self, bounds: tuple[int, int], params: dict, ignore) -> dict | None:
+        """Carried entry a window starting at row 0 can resume from, if any."""
+        if bounds[0] != 0:
+            return None
+        entry = self._carry.get((tuple(params[k] for k in PARAM_NAMES), frozenset(ignore)))
+        return entry if entry and entry['stop'] <= bounds[1] else None
+
+    def _carry_store(self, bounds: tuple[int, int], params: dict, ignore, entry: dict) -> None:
+        if bounds[0] == 0:
+            self._carry[(tuple(params[k] for k in PARAM_NAMES), frozenset(ignore))] = {
+                **entry, 'stop': bounds[1],
+            }
+
+    def _eliminate_combinations(self, base_df: pd.DataFrame, bounds: tuple[int, int],
+                                seed: dict, candidates: list,
+                                baseline_apy: float, tolerance: float,
+                                elimination: dict) -> tuple[set, int]:
+        """
+        Search ignore subsets of candidates for the best one whose APY stays within
+        tolerance of baseline (ties → fewer trades).
+
+        'exhaustive' tries every subset, smallest first. 'greedy' and 'beam'
+        grow subsets one factor at a time, keeping the best beam_width
+        admissible subsets per round ('greedy' is a beam of width 1).
+        All strategies stop after elimination['max_evals'] evaluations.
+        Returns (best_ignore, subsets_evaluated).
+        """
+        budget = elimination['max_evals']
+        best_ignore: set = set()
+        best_apy = -float('inf')
+        best_trades = float('inf')
+        evaluated = 0
+
+        def admit(ignore_sets):
+            nonlocal best_ignore, best_apy, best_trades, evaluated
+            results = self._run_ignore_sets(base_df, bounds, seed, [set(c) for c in ignore_sets])
+            evaluated += len(ignore_sets)
+            admissible = []
+            for ignore, (apy, trades) in zip(ignore_sets, results):
+                if baseline_apy - apy <= tolerance:
+                    admissible.append((ignore, apy, trades))
+                    if apy > best_apy or (apy == best_apy and trades < best_trades):
+                        best_apy, best_trades, best_ignore = apy, trades, set(ignore)
+            return admissible
+
+        if elimination['strategy'] == 'exhaustive':
+            all_combos = itertools.chain.from_iterable(
+                itertools.combinations(candidates, r) for r in range(1, len(candidates) + 1)
+            )
+            admit(list(itertools.islice(all_combos, budget)))
+            return best_ignore, evaluated
+
+        width = 1 if elimination['strategy'] == 'greedy' else elimination['beam_width']
+        frontier = [frozenset()]
+        seen = set()
+        while frontier and evaluated < budget:
+            children = []
+            for parent in frontier:
+                for factor in candidates:
+                    child = parent | {factor}
+                    if factor not in parent and child not in seen:
+                        seen.add(child)
+                        children.append(child)
+            children = children[:budget - evaluated]
+            if not children:
+                break
+            admissible = admit(children)
+            admissible.sort(key=lambda a: (-a[1], a[2]))
+            frontier = [ignore for ignore, _, _ in admissible[:width]]
+
+        return best_ignore, evaluated
 
     def _run_on_window(self, base_df: pd.DataFrame, params: dict,
-                       ignore: set, start: str, end: str) -> tuple[float, int]:
+                       ignore: set, bounds: tuple[int, int]) -> tuple[float, int]:
         """Ensure MA, slice, and run strategy. Returns (apy, trades)."""
         ma = int(params.get('MA', 50))
-        df_w = self._get_window(base_df, ma, start, end)
+        df_w = self._get_window(base_df, ma, bounds)
         if len(df_w) < 4:
             return 0.0, 0
-        return self._run_params(df_w, params, ignore)
+        key = self._cell_key(params, ignore, bounds)
+        cell = self._cells.get(key)
+        if cell is not None:
+            self._cell_hits += 1
+            return cell
+        entry = self._carried(bounds, params, ignore)
+        if entry and entry['stop'] == bounds[1]:
+            return entry['apy'], entry['trades']
 
-    def _buyhold_apy(self, df_window: pd.DataFrame) -> float:
-        """Buy-and-hold APY on a window df."""
-        strat = BuyAndHoldStrategy()
-        positions, buys, sells = strat.run(df_window, start_invested=1)
+        strat = GenericStrategy(params, ignore=ignore)
         bt = Backtester(self.cash_rate)
-        result = bt.run(df_window, positions, buys, sells)
-        return result['apy']
-
-    def _stdev_strategy(self, bt_df: pd.DataFrame) -> float | None:
-        """Annualized weekly std dev of strategy returns from backtester output df."""
-        rets = bt_df['StratRet'].dropna()
-        if len(rets) < 2:
-            return None
-        return float(rets.std() * np.sqrt(52))
-
-    def _stdev_bh(self, df_window: pd.DataFrame) -> float | None:
-        """Annualized weekly std dev of asset returns (= B&H std dev)."""
-        rets = df_window['Ret'].dropna()
-        if len(rets) < 2:
-            return None
-        return float(rets.std() * np.sqrt(52))
+        if entry:
+            resume_at = entry['stop']
+            frame = base_df.iloc[max(0, resume_at - strat.warmup_rows):bounds[1]]
+            positions, _, sells = strat.resume(frame, entry['state'], bounds[1] - resume_at)
+            (final_value,), (apy,) = bt.run_batch(base_df.iloc[resume_at:bounds[1]], np.array([positions]), carry={
+                'positions':    [entry['state']['invested']],
+                'final_values': [entry['final_value']],
+                'start':        base_df.index[0],
+            })
+            trades = entry['trades'] + len(sells)
+        else:
+            positions, _, sells = strat.run(df_w, start_invested=self.start_invested)
+            (final_value,), (apy,) = bt.run_batch(df_w, np.array([positions]))
+            trades = len(sells)
+        self._carry_store(bounds, params, ignore, {
+            'state': strat.state, 'final_value': final_value, 'apy': apy, 'trades': trades,
+        })
+        self._cells[key] = (apy, trades)
+        self._cells_evaluated += 1
+        return apy, trades
 
     # ------------------------------------------------------------------
     # Discover mode helpers
@@ -243,36 +702,278 @@ class WalkForwardEngine:
         return build_at_k(k)
 
     def _grid_search(self, base_df: pd.DataFrame, param_grids: dict,
-                     ignore: set, start: str, end: str,
+                     ignore: set, bounds: tuple[int, int],
                      progress_callback=None, bar_current: int = 0,
                      bar_total: int = 0, label: str = "",
                      cancel_event=None) -> dict:
-        """Grid search over param_grids on the given window. Returns best_params."""
+        """
+        Grid search over param_grids on the given window. Returns best_params.
+
+        Combos are generated lazily and evaluated GRID_CHUNK at a time through
+        _run_sets, so memory stays flat however large the grid is. Progress
+        (with throughput and ETA) is reported every GRID_PROGRESS_SECONDS.
+        """
         best_apy = -float('inf')
         best_trades = float('inf')
         best_params = None
 
         grid_lists = [param_grids[k] for k in PARAM_NAMES]
-        all_combos = list(itertools.product(*grid_lists))
-        n_combos = len(all_combos)
-        for done, combo in enumerate(all_combos):
+        n_combos = 1
+        for g in grid_lists:
+            n_combos *= len(g)
+        combos = itertools.product(*grid_lists)
+
+        done = 0
+        started = last_report = time.monotonic()
+        while True:
             if cancel_event and cancel_event.is_set():
                 break
-            params = dict(zip(PARAM_NAMES, combo))
-            apy, trades = self._run_on_window(base_df, params, ignore, start, end)
-            if apy > best_apy or (apy == best_apy and trades < best_trades):
-                best_apy = apy
-                best_trades = trades
-                best_params = params
-            if progress_callback and done % 10 == 0 and done > 0:
+            chunk = [dict(zip(PARAM_NAMES, combo)) for combo in itertools.islice(combos, GRID_CHUNK)]
+            if not chunk:
+                break
+            results = self._run_sets(base_df, bounds, [(params, ignore) for params in chunk])
+            for params, (apy, trades) in zip(chunk, results):
+                if apy > best_apy or (apy == best_apy and trades < best_trades):
+                    best_apy = apy
+                    best_trades = trades
+                    best_params = params
+            done += len(chunk)
+
+            now = time.monotonic()
+            if progress_callback and done < n_combos and now - last_report >= GRID_PROGRESS_SECONDS:
+                last_report = now
+                rate = done / (now - started)
                 progress_callback(bar_current, bar_total,
-                                  f"{label}: grid search {done}/{n_combos} combos")
+                                  f"{label}: grid search {done}/{n_combos} combos "
+                                  f"({rate:,.0f}/s, ~{(n_combos - done) / rate:,.0f}s left)")
 
         if best_params is None:
             return {}
         return {k: (int(best_params[k]) if k in INT_PARAMS else float(best_params[k]))
                 for k in PARAM_NAMES}
 
+    # ------------------------------------------------------------------
+    # Per-window work (shared by the serial loops and the process pool)
+    # ------------------------------------------------------------------
+
+    def _validate_window(self, base_df: pd.DataFrame, w: dict, seed_params: dict,
+                         seed_ignore: set, report, cancel_event=None) -> dict | None:
+        """Run fixed params over one test window. Returns a result row, or None if skipped."""
+        df_w = base_df.iloc[w['test_pos'][0]:w['test_pos'][1]]
+        if len(df_w) < 4:
+            report(1, f"{w['label']}: skipped (too few rows)")
+            return None
+
+        # Determine starting position for test window by running strategy
+        # through the training window — avoids resetting to start_invested
+        # each window when the strategy would actually be invested.
+        # Anchored windows carry the state precomputed by run_validate's
+        # single full-history pass.
+        entry_state = w.get('entry_state')
+        if entry_state is None:
+            df_train = base_df.iloc[w['train_pos'][0]:w['train_pos'][1]]
+            if len(df_train) > 0:
+                train_strat = GenericStrategy(seed_params, ignore=seed_ignore)
+                train_strat.run(df_train, start_invested=self.start_invested)
+                entry_state = train_strat.state
+            else:
+                entry_state = {'invested': self.start_invested, 'was_sold': self.start_invested == 0}
+
+        # Test cells also depend on the entry state, so it is part of the key
+        test_start, test_stop = w['test_pos']
+        key = self._cell_key(seed_params, seed_ignore, w['test_pos']) + (
+            int(entry_state['invested']), bool(entry_state['was_sold']))
+        cell = self._cells.get(key)
+        if cell is not None:
+            self._cell_hits += 1
+        else:
+            strat = GenericStrategy(seed_params, ignore=seed_ignore)
+            positions, buys, sells = strat.run(df_w, start_invested=entry_state['invested'],
+                                               was_sold=entry_state['was_sold'])
+            _, (s_apy,) = Backtester(self.cash_rate).run_batch(df_w, np.array([positions]))
+            cell = (s_apy, len(sells), self._stats.stdev_strategy(test_start, test_stop, positions))
+            self._cells[key] = cell
+            self._cells_evaluated += 1
+        s_apy, trades, stdev_s = cell
+
+        bh_apy = self._stats.buyhold_apy(test_start, test_stop)
+        stdev_bh = self._stats.stdev_buyhold(test_start, test_stop)
+
+        report(1, f"{w['label']}: done")
+        return {
+            'test_start':     w['test_start'],
+            'test_end':       w['test_end'],
+            'strategy_apy':   s_apy,
+            'buyhold_apy':    bh_apy,
+            'edge':           s_apy - bh_apy,
+            'trades':         trades,
+            'stdev_strategy': stdev_s,
+            'stdev_buyhold':  stdev_bh,
+            'is_partial':     w['is_partial'],
+        }
+
+    def _discover_window(self, base_df: pd.DataFrame, w: dict, current_seed: dict,
+                         tolerance: float, max_combinations: int, elimination: dict,
+                         report, cancel_event=None) -> tuple[dict | None, list | None, dict | None]:
+        """
+        Eliminate factors, refine and test one window.
+
+        report(step, status) is called with step 1-5 within the window.
+        Returns (result_row, active_factors, best_params). active_factors is None
+        when the training window was skipped; result_row is None when either
+        the training or the test window was too short.
+        """
+        label = w['label']
+
+        if w['train_pos'][1] - w['train_pos'][0] < 10:
+            report(5, f"{label}: skipped (too few rows)")
+            return None, None, None
+
+        current_ignore = set()  # all factors enabled for discovery
+
+        # Step 2: Baseline on training period
+        report(1, f"{label}: baseline ({w['train_start']} → {w['train_end']})")
+        (baseline_apy, baseline_trades), = self._run_ignore_sets(
+            base_df, w['train_pos'], current_seed, [current_ignore])
+
+        # Step 3: Single-factor elimination
+        report(2, f"{label}: single-factor elimination (9 factors)")
+        candidates = []
+        single = self._run_ignore_sets(
+            base_df, w['train_pos'], current_seed, [{factor} for factor in PARAM_NAMES])
+        for factor, (f_apy, f_trades) in zip(PARAM_NAMES, single):
+            diff = baseline_apy - f_apy
+            if diff < 0:
+                candidates.append(factor)
+            elif diff <= tolerance and f_trades <= baseline_trades:
+                candidates.append(factor)
+
+        # Step 4: Combination elimination
+        best_ignore: set = set()
+        subsets_evaluated = 0
+        if len(candidates) > 1 and not (cancel_event and cancel_event.is_set()):
+            report(3, f"{label}: combo elimination ({elimination['strategy']}, "
+                      f"{len(candidates)} candidates)")
+            best_ignore, subsets_evaluated = self._eliminate_combinations(
+                base_df, w['train_pos'], current_seed, candidates, baseline_apy, tolerance, elimination,
+            )
+        elif len(candidates) == 1:
+            best_ignore = {candidates[0]}
+
+        current_ignore = best_ignore
+        active_factors = [f for f in PARAM_NAMES if f not in current_ignore]
+
+        # Step 5: Range refinement grid search on training period
+        grids = self._build_refinement_grids(current_seed, active_factors, max_combinations)
+        n_combos = 1
+        for v in grids.values():
+            if v != [0]:
+                n_combos *= len(v)
+        report(4, f"{label}: grid search ({len(active_factors)} factors, {n_combos} combos)")
+        best_params = self._grid_search(
+            base_df, grids, current_ignore, w['train_pos'],
+            progress_callback=lambda current, _total, status: report(current, status),
+            bar_current=4, bar_total=5, label=label,
+            cancel_event=cancel_event,
+        )
+        if not best_params:
+            best_params = {k: (int(current_seed[k]) if k in INT_PARAMS else float(current_seed[k]))
+                           for k in PARAM_NAMES}
+
+        # Recompute in-sample APY with best_params
+        insample_apy, _ = self._run_on_window(base_df, best_params, current_ignore, w['train_pos'])
+
+        # Step 6 (counted as step 5): Out-of-sample test
+        report(5, f"{label}: OOS test ({w['test_start']} → {w['test_end']})")
+        if w['test_pos'][1] - w['test_pos'][0] < 4:
+            report(5, f"{label}: skipped OOS (too few rows)")
+            return None, active_factors, best_params
+
+        oos_apy, oos_trades = self._run_on_window(base_df, best_params, current_ignore, w['test_pos'])
+        bh_apy = self._stats.buyhold_apy(*w['test_pos'])
+        key_params = {k: v for k, v in best_params.items() if k in active_factors}
+
+        return {
+            'train_start':   w['train_start'],
+            'train_end':     w['train_end'],
+            'test_start':    w['test_start'],
+            'test_end':      w['test_end'],
+            'active_factors': active_factors,
+            'key_params':    key_params,
+            'insample_apy':  insample_apy,
+            'outsample_apy': oos_apy,
+            'buyhold_apy':   bh_apy,
+            'edge':          oos_apy - bh_apy,
+            'trades':        oos_trades,
+            'is_partial':    w['is_partial'],
+            'subsets_evaluated': subsets_evaluated,
+        }, active_factors, best_params
+
+    def _use_pool(self, n_windows: int, evals_per_window: int) -> bool:
+        """Whether n_windows windows of evals_per_window evaluations each are worth a process pool."""
+        return (self.max_workers > 1 and n_windows > 1
+                and n_windows * evals_per_window >= POOL_MIN_WORK)
+
+    def _run_windows_parallel(self, base_df: pd.DataFrame, windows: list[dict],
+                              method: str, args: tuple, steps_per_window: int,
+                              progress_callback=None, cancel_event=None,
+                              on_output=None) -> list:
+        """
+        Run self.<method>(base_df, w, *args) for every window across a process pool.
+
+        base_df is shipped to each worker once. Windows are handed out in
+        contiguous date-ordered chunks, one per worker, so a worker's anchored
+        windows resume from the carried state of the previous window (this is
+        what keeps small step_months cheap). Worker progress is funnelled back
+        through a queue and reported as the sum of per-window steps. Returns the
+        per-window outputs in window order (None for windows cancelled before
+        or while they ran). on_output(i, output) is called for each completed
+        window as its chunk comes back.
+        """
+        n = len(windows)
+        total = n * steps_per_window
+        ctx = multiprocessing.get_context('spawn')
+        worker_cancel = ctx.Event()
+        messages = ctx.Queue()
+        steps = [0] * n
+        outputs = [None] * n
+
+        def drain():
+            while True:
+                try:
+                    win_i, step, status = messages.get_nowait()
+                except queue.Empty:
+                    return
+                steps[win_i] = max(steps[win_i], step)
+                if progress_callback:
+                    progress_callback(sum(steps), total, status)
+
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.max_workers, n), mp_context=ctx,
+            initializer=_pool_init, initargs=(self, base_df, worker_cancel, messages),
+        )
+        try:
+            chunks = np.array_split(np.arange(n), min(self.max_workers, n))
+            futures = {pool.submit(_pool_windows, method,
+                                   [(int(i), windows[i]) for i in chunk], args): chunk
+                       for chunk in chunks}
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=0.25)
+                for f in done:
+                    for i, output in zip(futures[f], f.result()):
+                        outputs[i] = output
+                        if on_output and output is not None:
+                            on_output(int(i), output)
+                drain()
+                if cancel_event and cancel_event.is_set():
+                    worker_cancel.set()
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        drain()
+        return outputs
+
     # ------------------------------------------------------------------
     # Public: Validate mode
     # ------------------------------------------------------------------
@@ -280,66 +981,96 @@ class WalkForwardEngine:
     def run_validate(self, window_size_months: int, window_type: str,
                      initial_training_months: int, training_window_months: int,
                      seed_params: dict, seed_ignore: set,
-                     progress_callback=None, cancel_event=None) -> list[dict]:
+                     progress_callback=None, cancel_event=None,
+                     step_months: int | None = None) -> list[dict]:
         """
         Run fixed saved parameters across each test window.
+        Windows are independent; with max_workers > 1 and at least POOL_MIN_WORK
+        windows they run in a process pool, otherwise serially.
         Returns list of result dicts.
         """
         base_df = self._prepare_base()
+        self._reset_shared(base_df)
+        self._open_cache({
+            'mode': 'validate', 'window_size_months': window_size_months,
+            'window_type': window_type, 'initial_training_months': initial_training_months,
+            'training_window_months': training_window_months, 'step_months': step_months,
+            'seed_params': seed_params, 'seed_ignore': sorted(seed_ignore),
+        })
+        try:
+            return self._validate_config(
+                base_df, window_size_months, window_type, initial_training_months,
+                training_window_months, step_months, seed_params, seed_ignore,
+                progress_callback, cancel_event,
+            )
+        finally:
+            self._cache_save()
+
+    def _validate_config(self, base_df: pd.DataFrame, window_size_months: int, window_type: str,
+                         initial_training_months: int, training_window_months: int,
+                         step_months: int | None, seed_params: dict, seed_ignore: set,
+                         progress_callback=None, cancel_event=None,
+                         parallel: bool = True) -> list[dict]:
+        """run_validate for one window configuration on an already-loaded base_df."""
         ma = int(seed_params.get('MA', 50))
         self._ensure_ma(base_df, ma)
         windows = self._generate_windows(
             base_df, window_size_months, window_type,
-            initial_training_months, training_window_months,
+            initial_training_months, training_window_months, step_months,
         )
+        total = len(windows)
+        for i, w in enumerate(windows):
+            w['label'] = f"Window {i+1}/{total}"
+
+        # Anchored training windows all start at the first row, so one pass over
+        # the full history gives every window's entry state. Rolling windows
+        # restart at their own training start and are run per window.
+        if window_type == 'anchored' and windows:
+            states = GenericStrategy(seed_params, ignore=seed_ignore).row_states(
+                base_df, start_invested=self.start_invested)
+            for w in windows:
+                train_stop = w['train_pos'][1]
+                if w['train_pos'][0] == 0 and train_stop > 0:
+                    w['entry_state'] = states[train_stop - 1]
+
+        rows = {}
+        for i, w in enumerate(windows):
+            hit, row = self._cache_lookup(w)
+            if hit:
+                rows[i] = row
+        pending = [i for i in range(total) if i not in rows]
+
+        if parallel and self._use_pool(len(pending), 1):
+            computed = self._run_windows_parallel(
+                base_df, [windows[i] for i in pending], '_validate_window',
+                (seed_params, seed_ignore), 1,
+                progress_callback=progress_callback, cancel_event=cancel_event,
+            )
+            if not (cancel_event and cancel_event.is_set()):
+                for i, row in zip(pending, computed):
+                    rows[i] = row
+                    self._cache_store(windows[i], row)
+            return [rows[i] for i in sorted(rows) if rows[i] is not None]
 
         results = []
-        total = len(windows)
         for i, w in enumerate(windows):
             if cancel_event and cancel_event.is_set():
                 break
             if progress_callback:
-                progress_callback(i, total, f"Window {i+1}/{total}: {w['test_start']} → {w['test_end']}")
-            df_w = base_df.loc[pd.Timestamp(w['test_start']):pd.Timestamp(w['test_end'])].copy()
-            if len(df_w) < 4:
+                progress_callback(i, total, f"{w['label']}: {w['test_start']} → {w['test_end']}")
+
+            def report(step, status, i=i):
                 if progress_callback:
-                    progress_callback(i + 1, total, f"Window {i+1}/{total}: skipped (too few rows)")
-                continue
+                    progress_callback(i + step, total, status)
 
-            # Determine starting position for test window by running strategy
-            # through the training window — avoids resetting to start_invested
-            # each window when the strategy would actually be invested.
-            df_train = base_df.loc[pd.Timestamp(w['train_start']):pd.Timestamp(w['train_end'])].copy()
-            if len(df_train) > 0:
-                train_strat = GenericStrategy(seed_params, ignore=seed_ignore)
-                train_positions, _, _ = train_strat.run(df_train, start_invested=self.start_invested)
-                test_start_invested = int(train_positions[-1]) if len(train_positions) > 0 else self.start_invested
+            if i in rows:
+                row = rows[i]
+                report(1, f"{w['label']}: cached")
             else:
-                test_start_invested = self.start_invested
-
-            strat = GenericStrategy(seed_params, ignore=seed_ignore)
-            positions, buys, sells = strat.run(df_w, start_invested=test_start_invested)
-            bt = Backtester(self.cash_rate)
-            bt_result = bt.run(df_w, positions, buys, sells)
-
-            bh_apy = self._buyhold_apy(df_w)
-            stdev_s = self._stdev_strategy(bt_result['df'])
-            stdev_bh = self._stdev_bh(df_w)
-            s_apy = bt_result['apy']
-
-            results.append({
-                'test_start':     w['test_start'],
-                'test_end':       w['test_end'],
-                'strategy_apy':   s_apy,
-                'buyhold_apy':    bh_apy,
-                'edge':           s_apy - bh_apy,
-                'trades':         len(sells),
-                'stdev_strategy': stdev_s,
-                'stdev_buyhold':  stdev_bh,
-                'is_partial':     w['is_partial'],
-            })
-            if progress_callback:
-                progress_callback(i + 1, total, f"Window {i+1}/{total}: done")
+                row = self._validate_window(base_df, w, seed_params, seed_ignore, report)
+                self._cache_store(w, row)
+            if row is not None:
+                results.append(row)
 
         return results
 
@@ -351,166 +1082,285 @@ class WalkForwardEngine:
                      initial_training_months: int, training_window_months: int,
                      seed_params: dict, apy_tolerance_bps: float,
                      max_combinations: int, seed_source: str,
-                     progress_callback=None, cancel_event=None) -> tuple[list[dict], dict]:
+                     elimination_strategy: str = 'exhaustive', beam_width: int = 3,
+                     max_elimination_evals: int = 512,
+                     progress_callback=None, cancel_event=None,
+                     step_months: int | None = None,
+                     checkpoint_path: Path = None) -> tuple[list[dict], dict]:
         """
         For each window: eliminate unneeded factors on training data, optimize
         remaining factors, then test out-of-sample.
+        elimination_strategy picks how ignore subsets are searched
+        ('exhaustive', 'greedy' or 'beam'); at most max_elimination_evals
+        subsets are evaluated per window. A step_months shorter than
+        window_size_months gives overlapping windows; anchored windows keep
+        date order so each one carries combo state from the window before.
+        With seed_source='saved' the windows are independent and, with
+        max_workers > 1 and windows x max_combinations of at least
+        POOL_MIN_WORK, run in a process pool.
+        With checkpoint_path, progress is checkpointed after every window and
+        a rerun with the same arguments resumes after the last completed one.
         Returns (results_list, factor_stability_dict).
         """
-        tolerance = apy_tolerance_bps / 10000.0
+        elimination = self._elimination(elimination_strategy, beam_width, max_elimination_evals)
         base_df = self._prepare_base()
+        self._reset_shared(base_df)
+        spec = {
+            'mode': 'discover', 'window_size_months': window_size_months,
+            'window_type': window_type, 'initial_training_months': initial_training_months,
+            'training_window_months': training_window_months, 'step_months': step_months,
+            'seed_params': seed_params, 'apy_tolerance_bps': apy_tolerance_bps,
+            'max_combinations': max_combinations, 'seed_source': seed_source,
+            'elimination': elimination,
+        }
+        self._open_cache(spec)
+        self._open_checkpoint(checkpoint_path, spec)
+        try:
+            return self._discover_config(
+                base_df, window_size_months, window_type, initial_training_months,
+                training_window_months, step_months, seed_params, apy_tolerance_bps,
+                max_combinations, seed_source, elimination, progress_callback, cancel_event,
+            )
+        finally:
+            self._cache_save()
+
+    @staticmethod
+    def _elimination(strategy: str, beam_width: int, max_evals: int) -> dict:
+        if strategy not in ELIMINATION_STRATEGIES:
+            raise ValueError(f"Unknown elimination strategy '{strategy}' — "
+                             f"use one of {', '.join(ELIMINATION_STRATEGIES)}.")
+        return {
+            'strategy':   strategy,
+            'beam_width': max(1, int(beam_width)),
+            'max_evals':  max(1, int(max_evals)),
+        }
+
+    def _discover_config(self, base_df: pd.DataFrame, window_size_months: int, window_type: str,
+                         initial_training_months: int, training_window_months: int,
+                         step_months: int | None, seed_params: dict, apy_tolerance_bps: float,
+                         max_combinations: int, seed_source: str, elimination: dict,
+                         progress_callback=None, cancel_event=None,
+                         parallel: bool = True) -> tuple[list[dict], dict]:
+        """run_discover for one window configuration on an already-loaded base_df."""
+        tolerance = apy_tolerance_bps / 10000.0
         windows = self._generate_windows(
             base_df, window_size_months, window_type,
-            initial_training_months, training_window_months,
+            initial_training_months, training_window_months, step_months,
         )
 
-        results = []
         factor_counts = {f: 0 for f in PARAM_NAMES}
         total_windows_completed = 0
-        prev_params = None
         n_windows = len(windows)
         total = n_windows * 5  # 5 steps per window for finer progress bar
-
         for win_i, w in enumerate(windows):
-            if cancel_event and cancel_event.is_set():
-                break
-            base_step = win_i * 5  # bar position at start of this window's steps
-            label = f"Window {win_i+1}/{n_windows}"
+            w['label'] = f"Window {win_i+1}/{n_windows}"
 
-            # Ensure MA for seed is computed before slicing training window
-            seed_ma = int(seed_params.get('MA', 50))
-            self._ensure_ma(base_df, seed_ma)
-            train_df = base_df.loc[
-                pd.Timestamp(w['train_start']):pd.Timestamp(w['train_end'])
-            ].copy()
+        # Saved windows are keyed by their seed only when it varies per window
+        cached = {}
+        if seed_source == 'saved':
+            for win_i, w in enumerate(windows):
+                hit, output = self._cache_lookup(w)
+                if hit:
+                    cached[win_i] = output
+        pending = [i for i in range(n_windows) if i not in cached]
 
-            if len(train_df) < 10:
-                if progress_callback:
-                    progress_callback(base_step + 5, total, f"{label}: skipped (too few rows)")
-                continue
-
-            # Step 1: Seed
-            current_seed = (prev_params.copy()
-                            if seed_source == 'previous' and prev_params is not None
-                            else seed_params.copy())
-            current_ignore = set()  # all factors enabled for discovery
-
-            # Step 2: Baseline on training period
-            if progress_callback:
-                progress_callback(base_step + 1, total, f"{label}: baseline ({w['train_start']} → {w['train_end']})")
-            baseline_apy, baseline_trades = self._run_params(train_df, current_seed, current_ignore)
+        per_window = max_combinations + elimination['max_evals']
+        if parallel and seed_source == 'saved' and self._use_pool(len(pending), per_window):
+            def on_output(j, output):
+                cached[pending[j]] = output
+                self._window_done(windows[pending[j]], output)
 
-            # Step 3: Single-factor elimination
-            if progress_callback:
-                progress_callback(base_step + 2, total, f"{label}: single-factor elimination (9 factors)")
-            candidates = []
-            for factor in PARAM_NAMES:
-                test_ignore = {factor}
-                f_apy, f_trades = self._run_params(train_df, current_seed, test_ignore)
-                diff = baseline_apy - f_apy
-                if diff < 0:
-                    candidates.append(factor)
-                elif diff <= tolerance and f_trades <= baseline_trades:
-                    candidates.append(factor)
-
-            # Step 4: Combination elimination
-            best_ignore: set = set()
-            if len(candidates) > 1:
-                all_combos = [(set(combo), r)
-                              for r in range(1, len(candidates) + 1)
-                              for combo in itertools.combinations(candidates, r)]
-                n_combos = len(all_combos)
-                if progress_callback:
-                    progress_callback(base_step + 3, total,
-                                      f"{label}: combo elimination 0/{n_combos}")
-                best_combo_apy = -float('inf')
-                best_combo_trades = float('inf')
-                for done, (test_ignore_c, _) in enumerate(all_combos):
-                    if cancel_event and cancel_event.is_set():
-                        break
-                    c_apy, c_trades = self._run_params(train_df, current_seed, test_ignore_c)
-                    diff = baseline_apy - c_apy
-                    if diff <= tolerance:
-                        if (c_apy > best_combo_apy or
-                                (c_apy == best_combo_apy and c_trades < best_combo_trades)):
-                            best_combo_apy = c_apy
-                            best_combo_trades = c_trades
-                            best_ignore = test_ignore_c
-                    if progress_callback and (done + 1) % 10 == 0:
-                        progress_callback(base_step + 3, total,
-                                          f"{label}: combo elimination {done+1}/{n_combos}")
-            elif len(candidates) == 1:
-                best_ignore = {candidates[0]}
-
-            current_ignore = best_ignore
-            active_factors = [f for f in PARAM_NAMES if f not in current_ignore]
-            for f in active_factors:
-                factor_counts[f] += 1
-            total_windows_completed += 1
-
-            # Step 5: Range refinement grid search on training period
-            grids = self._build_refinement_grids(current_seed, active_factors, max_combinations)
-            n_combos = 1
-            for v in grids.values():
-                if v != [0]:
-                    n_combos *= len(v)
-            if progress_callback:
-                progress_callback(base_step + 4, total,
-                                  f"{label}: grid search ({len(active_factors)} factors, {n_combos} combos)")
-            best_params = self._grid_search(
-                base_df, grids, current_ignore, w['train_start'], w['train_end'],
-                progress_callback=progress_callback,
-                bar_current=base_step + 4, bar_total=total, label=label,
-                cancel_event=cancel_event,
+            self._run_windows_parallel(
+                base_df, [windows[i] for i in pending], '_discover_window',
+                (seed_params.copy(), tolerance, max_combinations, elimination), 5,
+                progress_callback=progress_callback, cancel_event=cancel_event,
+                on_output=on_output,
             )
-            if not best_params:
-                best_params = {k: (int(current_seed[k]) if k in INT_PARAMS else float(current_seed[k]))
-                               for k in PARAM_NAMES}
-
-            # Recompute in-sample APY with best_params
-            best_ma = int(best_params.get('MA', 50))
-            self._ensure_ma(base_df, best_ma)
-            train_final = base_df.loc[
-                pd.Timestamp(w['train_start']):pd.Timestamp(w['train_end'])
-            ].copy()
-            insample_apy, _ = self._run_params(train_final, best_params, current_ignore)
-
-            # Step 6 (counted as step 5): Out-of-sample test
-            if progress_callback:
-                progress_callback(base_step + 5, total,
-                                  f"{label}: OOS test ({w['test_start']} → {w['test_end']})")
-            test_df = base_df.loc[
-                pd.Timestamp(w['test_start']):pd.Timestamp(w['test_end'])
-            ].copy()
-            if len(test_df) < 4:
-                if progress_callback:
-                    progress_callback(base_step + 5, total, f"{label}: skipped OOS (too few rows)")
-                continue
+            outputs = [cached[i] for i in sorted(cached)]
+        else:
+            outputs = []
+            prev_params = None
+            for win_i, w in enumerate(windows):
+                if cancel_event and cancel_event.is_set():
+                    break
+                base_step = win_i * 5  # bar position at start of this window's steps
 
-            oos_apy, oos_trades = self._run_params(test_df, best_params, current_ignore)
-            bh_apy = self._buyhold_apy(test_df)
-            key_params = {k: v for k, v in best_params.items() if k in active_factors}
-
-            results.append({
-                'train_start':   w['train_start'],
-                'train_end':     w['train_end'],
-                'test_start':    w['test_start'],
-                'test_end':      w['test_end'],
-                'active_factors': active_factors,
-                'key_params':    key_params,
-                'insample_apy':  insample_apy,
-                'outsample_apy': oos_apy,
-                'buyhold_apy':   bh_apy,
-                'edge':          oos_apy - bh_apy,
-                'trades':        oos_trades,
-                'is_partial':    w['is_partial'],
-            })
+                def report(step, status, base_step=base_step):
+                    if progress_callback:
+                        progress_callback(base_step + step, total, status)
 
-            if seed_source == 'previous':
-                prev_params = best_params.copy()
+                # Step 1: Seed
+                current_seed = (prev_params.copy()
+                                if seed_source == 'previous' and prev_params is not None
+                                else seed_params.copy())
+                seed_key = current_seed if seed_source == 'previous' else None
+                hit, output = ((True, cached[win_i]) if win_i in cached
+                               else self._cache_lookup(w, seed_key))
+                if hit:
+                    report(5, f"{w['label']}: cached")
+                else:
+                    output = self._discover_window(base_df, w, current_seed, tolerance,
+                                                   max_combinations, elimination,
+                                                   report, cancel_event)
+                outputs.append(output)
+                row, _, best_params = output
+                if seed_source == 'previous' and row is not None:
+                    prev_params = best_params.copy()
+                if not hit and not (cancel_event and cancel_event.is_set()):
+                    self._window_done(w, output, seed_key)
+
+        results = []
+        for output in outputs:
+            if output is None:
+                continue
+            row, active_factors, _ = output
+            if active_factors is not None:
+                for f in active_factors:
+                    factor_counts[f] += 1
+                total_windows_completed += 1
+            if row is not None:
+                results.append(row)
 
         factor_stability = {
             k: {'survived': factor_counts[k], 'total': total_windows_completed}
             for k in PARAM_NAMES
         }
         return results, factor_stability
+
+    # ------------------------------------------------------------------
+    # Public: Window-configuration study
+    # ------------------------------------------------------------------
+
+    def run_study(self, configs: list[dict], mode: str, seed_params: dict,
+                  seed_ignore: set = frozenset(), apy_tolerance_bps: float = 10.0,
+                  max_combinations: int = 3000, seed_source: str = 'saved',
+                  elimination_strategy: str = 'exhaustive', beam_width: int = 3,
+                  max_elimination_evals: int = 512,
+                  progress_callback=None, row_callback=None,
+                  cancel_event=None) -> list[dict]:
+        """
+        Run validate or discover for each window configuration and summarize each.
+
+        configs are dicts with window_size_months, window_type and optionally
+        initial_training_months, training_window_months and step_months (same
+        meaning and defaults as the run_* arguments). Data is loaded once and
+        every configuration reads and fills the same evaluation cells, so a
+        (params, ignore, start, stop) cell that several configurations need is
+        evaluated once. Configurations run in-process, in order, so they can
+        share those cells. row_callback(summary) is called as each
+        configuration finishes. Returns the summary rows in config order.
+        """
+        if mode not in ('validate', 'discover'):
+            raise ValueError(f"Unknown walk-forward mode '{mode}' — use validate or discover.")
+        if not configs:
+            raise ValueError("At least one window configuration is required.")
+        elimination = self._elimination(elimination_strategy, beam_width, max_elimination_evals)
+        base_df = self._prepare_base()
+        self._reset_shared(base_df)
+
+        n_configs = len(configs)
+        summaries = []
+        for cfg_i, raw in enumerate(configs):
+            if cancel_event and cancel_event.is_set():
+                break
+            cfg = {
+                'window_size_months':      int(raw['window_size_months']),
+                'window_type':             raw.get('window_type', 'anchored'),
+                'initial_training_months': int(raw.get('initial_training_months', 36)),
+                'training_window_months':  int(raw.get('training_window_months', 36)),
+                'step_months':             raw.get('step_months'),
+            }
+            if cfg['step_months'] is None:
+                cfg['step_months'] = cfg['window_size_months']
+
+            def report(current, total, status, cfg_i=cfg_i):
+                if progress_callback:
+                    # Each configuration gets an equal share of the bar
+                    done = cfg_i + (current / total if total else 1.0)
+                    progress_callback(int(done * 1000), n_configs * 1000,
+                                      f"Config {cfg_i+1}/{n_configs}: {status}")
+
+            window_args = (base_df, cfg['window_size_months'], cfg['window_type'],
+                           cfg['initial_training_months'], cfg['training_window_months'],
+                           cfg['step_months'])
+            cells_before, hits_before = self._cells_evaluated, self._cell_hits
+            if mode == 'validate':
+                rows = self._validate_config(*window_args, seed_params, set(seed_ignore),
+                                             report, cancel_event, parallel=False)
+            else:
+                rows, _ = self._discover_config(*window_args, seed_params, apy_tolerance_bps,
+                                                max_combinations, seed_source, elimination,
+                                                report, cancel_event, parallel=False)
+            if cancel_event and cancel_event.is_set():
+                break
+
+            summary = {
+                **cfg,
+                **self._summarize(rows, 'strategy_apy' if mode == 'validate' else 'outsample_apy'),
+                'cells_evaluated': self._cells_evaluated - cells_before,
+                'cells_reused':    self._cell_hits - hits_before,
+            }
+            summaries.append(summary)
+            if row_callback:
+                row_callback(summary)
+
+        return summaries
+
+    @staticmethod
+    def _summarize(rows: list[dict], apy_key: str) -> dict:
+        """
+        Averages over a configuration's full windows (all windows if every one
+        is partial); a few weeks' annualized APY would otherwise dominate.
+        """
+        full = [r for r in rows if not r['is_partial']] or rows
+
+        def mean(key):
+            vals = [r[key] for r in full if r.get(key) is not None]
+            return float(np.mean(vals)) if vals else None
+
+        edges = [r['edge'] for r in full if r['edge'] is not None]
+        return {
+            'windows':          len(rows),
+            'partial_windows':  sum(1 for r in rows if r['is_partial']),
+            'avg_apy':          mean(apy_key),
+            'avg_insample_apy': mean('insample_apy'),
+            'avg_buyhold_apy':  mean('buyhold_apy'),
+            'avg_edge':         mean('edge'),
+            'win_rate':         sum(1 for e in edges if e > 0) / len(edges) if edges else None,
+            'trades':           sum(r['trades'] for r in rows),
+        }
+
+
+
+
+# ----------------------------------------------------------------------
+# Process-pool workers for independent windows
+# ----------------------------------------------------------------------
+
+_pool_state: dict = {}
+
+
+def _pool_init(engine: WalkForwardEngine, base_df: pd.DataFrame, cancel_event, messages) -> None:
+    """Worker initializer: keep one copy of the engine and prepared base_df per process."""
+    _pool_state.update(engine=engine, base_df=base_df, cancel_event=cancel_event, messages=messages)
+
+
+def _pool_windows(method: str, chunk: list[tuple[int, dict]], args: tuple) -> list:
+    """Run a contiguous chunk of windows in order; None for windows skipped after cancel."""
+    cancel_event = _pool_state['cancel_event']
+    messages = _pool_state['messages']
+    outputs = []
+    for win_i, w in chunk:
+        if cancel_event.is_set():
+            outputs.append(None)
+            continue
+
+        def report(step, status, win_i=win_i):
+            messages.put((win_i, step, status))
+
+        output = getattr(_pool_state['engine'], method)(
+            _pool_state['base_df'], w, *args, report=report, cancel_event=cancel_event,
+        )
+        # A window interrupted by cancel holds partial results
+        outputs.append(None if cancel_event.is_set() else output)
+    return outputs
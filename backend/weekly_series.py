@@ -0,0 +1,56 @@
+###################################################################################
+#  Weekly Indicator Series Cache
+#
+# FRED series resampled to weekly (W-FRI) once per process and shared by every
+# security's loader, so loading another ticker does not re-parse and
+# re-resample the same macro series.
+###################################################################################
+import threading
+
+import pandas as pd
+
+
+def to_weekly(df: pd.DataFrame, date_col: str = 'date', value_col: str = 'value') -> pd.Series:
+    '''Daily observations as a W-FRI series (last value of each week), indexed by week-ending date.'''
+    s = df.set_index(pd.to_datetime(df[date_col]))[value_col].astype(float)
+    weekly = s.sort_index().resample("W-FRI").last()
+    weekly.index.name = 'date'
+    return weekly.rename(None)
+
+
+class WeeklySeriesCache:
+    '''
+    Thread-safe cache of weekly series, one entry per source.
+
+    An entry is reused while its source's stamp (a file stat, a content hash)
+    is unchanged; a new stamp replaces it. Cached series are shared by every
+    caller and must not be modified.
+    '''
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict = {}   # source -> (stamp, version, series)
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def get(self, source, stamp, compute) -> tuple[str, pd.Series]:
+        '''
+        (version, weekly series) for source, from the cache when it was stored
+        under the same stamp, else from compute() -> (version, weekly series).
+        '''
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is not None and entry[0] == stamp:
+                self._stats['hits'] += 1
+                return entry[1], entry[2]
+            self._stats['misses'] += 1
+        version, series = compute()
+        with self._lock:
+            self._entries[source] = (stamp, version, series)
+        return version, series
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries)}
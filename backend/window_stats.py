@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from backtester import Backtester
+
+
+class WindowStatsIndex:
+    """
+    Prefix sums over a weekly dataset's asset returns, built once, so that
+    buy-and-hold APY and annualized standard deviations for any positional
+    window [start, stop) are answered without rescanning the window.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Weekly dataset with Ret (NaN rows are skipped, as in the Backtester).
+    cash_rate : float
+        Annualized cash rate, converted to weekly as in the Backtester.
+
+    Notes
+    -----
+    Strategy statistics only need the strategy's position changes: invested
+    segments read the asset sums, cash segments contribute the constant
+    weekly cash rate. Overlapping windows cost nothing extra.
+    """
+
+    def __init__(self, df: pd.DataFrame, cash_rate: float):
+        ret   = df["Ret"].to_numpy(dtype=float)
+        valid = ~np.isnan(ret)
+        r     = np.where(valid, ret, 0.0)
+
+        self.index       = df.index
+        self.cash_weekly = Backtester(cash_rate).cash_weekly
+        self._count = np.concatenate([[0], np.cumsum(valid)])
+        self._log   = np.concatenate([[0.0], np.cumsum(np.log1p(r))])
+        self._sum   = np.concatenate([[0.0], np.cumsum(r)])
+        self._sumsq = np.concatenate([[0.0], np.cumsum(r * r)])
+
+    # ------------------------------------------------------------
+    # Buy and hold
+    # ------------------------------------------------------------
+    def buyhold_apy(self, start: int, stop: int) -> float:
+        """APY of holding the asset over rows [start, stop)."""
+        final_value = float(np.exp(self._log[stop] - self._log[start]))
+        years = (self.index[stop - 1] - self.index[start]).days / 365.25
+        return final_value ** (1 / years) - 1 if years > 0 else 0.0
+
+    def stdev_buyhold(self, start: int, stop: int) -> float | None:
+        """Annualized weekly std dev of asset returns over rows [start, stop)."""
+        return self._annualized_std(
+            self._count[stop] - self._count[start],
+            self._sum[stop] - self._sum[start],
+            self._sumsq[stop] - self._sumsq[start],
+        )
+
+    # ------------------------------------------------------------
+    # Strategy
+    # ------------------------------------------------------------
+    def stdev_strategy(self, start: int, stop: int, positions) -> float | None:
+        """
+        Annualized weekly std dev of strategy returns over rows [start, stop),
+        for positions aligned with those rows (Backtester convention: the
+        position held at week t-1 earns week t's return).
+        """
+        pos = np.asarray(positions, dtype=np.int8)
+        held = np.empty_like(pos)
+        held[0]  = pos[0]
+        held[1:] = pos[:-1]
+
+        # Segment boundaries: rows where the held position changes
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(held)) + 1, [len(held)]]) + start
+        n = total = total_sq = 0.0
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            count = self._count[b] - self._count[a]
+            n += count
+            if held[a - start]:
+                total    += self._sum[b] - self._sum[a]
+                total_sq += self._sumsq[b] - self._sumsq[a]
+            else:
+                total    += self.cash_weekly * count
+                total_sq += self.cash_weekly ** 2 * count
+        return self._annualized_std(n, total, total_sq)
+
+    @staticmethod
+    def _annualized_std(n: float, total: float, total_sq: float) -> float | None:
+        if n < 2:
+            return None
+        var = (total_sq - total * total / n) / (n - 1)
+        return float(np.sqrt(max(var, 0.0)) * np.sqrt(52))
@@ -1,7 +1,7 @@
 import { useState, useEffect, useRef } from 'react'
 import { useSettings } from './hooks/useSettings'
 import { applyTheme } from './lib/themes'
-import { getConfig, saveConfig, fetchSecurities, getDateRange, addSecurity, removeSecurity, updateSecurityData, updateEconomicData, reorderSecurities, getEconomicDates } from './lib/api'
+import { getConfig, saveConfig, fetchSecurities, getDateRange, addSecurity, removeSecurity, updateSecurityData, updateEconomicData, updateAllData, reorderSecurities, getEconomicDates } from './lib/api'
 import { Header } from './components/Header'
 import { SettingsSheet } from './components/Settings'
 import { OptimizerTab } from './components/tabs/OptimizerTab'
@@ -9,7 +9,7 @@ import { BuyHoldTab } from './components/tabs/BuyHoldTab'
 import { SignalTab } from './components/tabs/SignalTab'
 import { SignalsTab } from './components/tabs/SignalsTab'
 import { WalkForwardTab } from './components/tabs/WalkForwardTab'
-import type { AppConfig, StrategyParams, ParamRanges } from './types'
+import type { AppConfig, FetchAllResult, StrategyParams, ParamRanges } from './types'
 
 type Tab = 'optimizer' | 'buyhold' | 'signal' | 'signals' | 'walkforward'
 
@@ -76,19 +76,28 @@ export default function App() {
     return alreadyCurrent
   }
 
+  function reloadDateRange(t: string) {
+    setStartDate('')
+    setEndDate('')
+    setDateRangeError(null)
+    getDateRange(t)
+      .then(r => { setDateRange(r); setDateRangeError(null) })
+      .catch((e: unknown) => { setDateRange(null); setDateRangeError(e instanceof Error ? e.message : String(e)) })
+  }
+
   async function handleFetchData(t: string): Promise<boolean> {
     const alreadyCurrent = await updateSecurityData(t)
-    if (t === ticker) {
-      setStartDate('')
-      setEndDate('')
-      setDateRangeError(null)
-      getDateRange(t)
-        .then(r => { setDateRange(r); setDateRangeError(null) })
-        .catch((e: unknown) => { setDateRange(null); setDateRangeError(e instanceof Error ? e.message : String(e)) })
-    }
+    if (t === ticker) reloadDateRange(t)
     return alreadyCurrent
   }
 
+  async function handleFetchAllData(): Promise<FetchAllResult> {
+    const result = await updateAllData()
+    getEconomicDates().then(setEconDates).catch(() => {})
+    if (ticker) reloadDateRange(ticker)
+    return result
+  }
+
   useEffect(() => {
     if (!ticker) return
     setConfig(null)
@@ -254,6 +263,7 @@ export default function App() {
           onReorderSecurities={handleReorderSecurities}
           onFetchData={handleFetchData}
           onFetchEconomicData={handleFetchEconomicData}
+          onFetchAllData={handleFetchAllData}
         />
       )}
 
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react'
 import { X, Trash2, RefreshCw, GripVertical } from 'lucide-react'
 import { themes } from '../lib/themes'
 import { NumInput } from './NumInput'
-import type { AppConfig, Settings } from '../types'
+import type { AppConfig, FetchAllResult, Settings } from '../types'
 
 interface Props {
   open: boolean
@@ -18,9 +18,10 @@ interface Props {
   onReorderSecurities: (tickers: string[]) => Promise<void>
   onFetchData: (ticker: string) => Promise<boolean>
   onFetchEconomicData: () => Promise<boolean>
+  onFetchAllData: () => Promise<FetchAllResult>
 }
 
-export function SettingsSheet({ open, onClose, settings, onUpdate, config, onSaveConfig, ticker, securities, onAddSecurity, onRemoveSecurity, onReorderSecurities, onFetchData, onFetchEconomicData }: Props) {
+export function SettingsSheet({ open, onClose, settings, onUpdate, config, onSaveConfig, ticker, securities, onAddSecurity, onRemoveSecurity, onReorderSecurities, onFetchData, onFetchEconomicData, onFetchAllData }: Props) {
   const [localConfig, setLocalConfig] = useState<AppConfig>(config)
   const [saveStatus, setSaveStatus]   = useState<'idle' | 'saving' | 'saved' | 'error'>('idle')
 
@@ -105,25 +106,23 @@ export function SettingsSheet({ open, onClose, settings, onUpdate, config, onSav
   async function handleUpdateAll() {
     setManageError(null)
     setUpdatingAll(true)
-    const tickers = [...localSecurities]
-    let anyFetched = false
-    for (let i = 0; i < tickers.length; i++) {
-      const t = tickers[i]
-      setUpdatingTickers(prev => new Set(prev).add(t))
-      try {
-        const alreadyCurrent = await onFetchData(t)
-        if (!alreadyCurrent) anyFetched = true
-      } catch (e) {
-        setManageError(`Error updating ${t}: ${String(e)}`)
-        setUpdatingTickers(prev => { const s = new Set(prev); s.delete(t); return s })
-        setUpdatingAll(false)
-        return
+    setUpdatingTickers(new Set(localSecurities))
+    try {
+      const result = await onFetchAllData()
+      const failed = [...Object.entries(result.securities), ...Object.entries(result.economic)]
+        .filter(([, r]) => r.error)
+      if (failed.length) {
+        setManageError(failed.map(([k, r]) => `Error updating ${k}: ${r.error}`).join('; '))
+      } else {
+        const anyFetched = Object.values(result.securities).some(r => !r.already_current)
+        setManageStatus(anyFetched ? 'All securities updated.' : 'All securities already up to date.')
       }
-      setUpdatingTickers(prev => { const s = new Set(prev); s.delete(t); return s })
-      if (i < tickers.length - 1) await new Promise(r => setTimeout(r, 1500))
+    } catch (e) {
+      setManageError(`Error updating securities: ${String(e)}`)
+    } finally {
+      setUpdatingTickers(new Set())
+      setUpdatingAll(false)
     }
-    setUpdatingAll(false)
-    setManageStatus(anyFetched ? 'All securities updated.' : 'All securities already up to date.')
   }
 
   async function handleUpdate(t: string) {
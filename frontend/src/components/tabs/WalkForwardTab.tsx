@@ -1,5 +1,5 @@
 import { useState, useRef } from 'react'
-import { streamWalkForward } from '../../lib/api'
+import { cancelJob, streamWalkForward } from '../../lib/api'
 import type {
   Settings,
   WalkForwardResponse,
@@ -229,9 +229,17 @@ export function WalkForwardTab({ ticker, settings }: Props) {
   const [result, setResult]     = useState<WalkForwardResponse | null>(null)
   const [error, setError]       = useState<string | null>(null)
   const abortRef = useRef<AbortController | null>(null)
+  // Server job of the current run: closing the stream alone leaves it running
+  const jobRef = useRef<string | null>(null)
+
+  function stop() {
+    abortRef.current?.abort()
+    if (jobRef.current) void cancelJob(jobRef.current).catch(() => {})
+    jobRef.current = null
+  }
 
   function handleRun() {
-    if (abortRef.current) abortRef.current.abort()
+    stop()
     setLoading(true)
     setError(null)
     setResult(null)
@@ -252,15 +260,16 @@ export function WalkForwardTab({ ticker, settings }: Props) {
       },
       {
         onProgress(current, total, status) { setProgress({ current, total, status }) },
-        onResult(data) { setResult(data); setLoading(false); setProgress(null) },
-        onError(msg) { setError(msg); setLoading(false); setProgress(null) },
+        onJob(jobId) { jobRef.current = jobId },
+        onResult(data) { jobRef.current = null; setResult(data); setLoading(false); setProgress(null) },
+        onError(msg) { jobRef.current = null; setError(msg); setLoading(false); setProgress(null) },
       },
     )
     abortRef.current = controller
   }
 
   function handleCancel() {
-    abortRef.current?.abort()
+    stop()
     setLoading(false)
     setProgress(null)
   }
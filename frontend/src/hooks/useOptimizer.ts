@@ -1,5 +1,5 @@
 import { useState, useRef } from 'react'
-import { streamOptimizer } from '../lib/api'
+import { cancelJob, streamOptimizer } from '../lib/api'
 import type { OptimizerResponse, OptimizerGrids } from '../types'
 
 export function useOptimizer() {
@@ -8,6 +8,14 @@ export function useOptimizer() {
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
   const abortRef = useRef<AbortController | null>(null)
+  // Server job of the current run: closing the stream alone leaves it running
+  const jobRef = useRef<string | null>(null)
+
+  function stop() {
+    abortRef.current?.abort()
+    if (jobRef.current) void cancelJob(jobRef.current).catch(() => {})
+    jobRef.current = null
+  }
 
   function run(
     ticker: string,
@@ -20,9 +28,7 @@ export function useOptimizer() {
     disabledFactors?: string[],
   ) {
     // Cancel any in-flight run
-    if (abortRef.current) {
-      abortRef.current.abort()
-    }
+    stop()
 
     setLoading(true)
     setError(null)
@@ -52,12 +58,17 @@ export function useOptimizer() {
       onProgress(current, total) {
         setProgress({ current, total })
       },
+      onJob(jobId) {
+        jobRef.current = jobId
+      },
       onResult(data) {
+        jobRef.current = null
         setResult(data)
         setLoading(false)
         setProgress(null)
       },
       onError(msg) {
+        jobRef.current = null
         setError(msg)
         setLoading(false)
         setProgress(null)
@@ -68,7 +79,7 @@ export function useOptimizer() {
   }
 
   function cancel() {
-    abortRef.current?.abort()
+    stop()
     setLoading(false)
     setProgress(null)
   }
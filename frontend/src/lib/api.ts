@@ -1,10 +1,29 @@
 import type {
-  AppConfig, BacktestResult, OptimizerRequest, OptimizerResponse,
+  AppConfig, BacktestResult, FetchAllResult, JobStatus, OptimizerRequest, OptimizerResponse,
   SignalResponse, StrategyParams, WalkForwardRequest, WalkForwardResponse,
+  WalkForwardStudyRequest, WalkForwardStudyResponse, WalkForwardStudyRow,
 } from '../types'
 
 const BASE = '/api'
 
+// Stable per-browser identity sent as X-User, so the server's per-user job
+// limits apply per browser rather than per proxy address.
+function clientId(): string {
+  const key = 'strat-opt-client-id'
+  let id = localStorage.getItem(key)
+  if (!id) {
+    id = typeof crypto.randomUUID === 'function'
+      ? crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+    localStorage.setItem(key, id)
+  }
+  return id
+}
+
+function jobHeaders(): Record<string, string> {
+  return { 'Content-Type': 'application/json', 'X-User': clientId() }
+}
+
 async function fetchJson<T>(url: string, init?: RequestInit): Promise<T> {
   const res = await fetch(url, init)
   if (!res.ok) {
@@ -44,6 +63,10 @@ export function updateSecurityData(ticker: string): Promise<boolean> {
   }).then(r => r.already_current)
 }
 
+export function updateAllData(): Promise<FetchAllResult> {
+  return fetchJson(`${BASE}/securities/fetch-all`, { method: 'POST' })
+}
+
 export function getConfig(ticker: string): Promise<AppConfig> {
   return fetchJson(`${BASE}/config?ticker=${encodeURIComponent(ticker)}`)
 }
@@ -118,8 +141,17 @@ export function runSignal(
   })
 }
 
+export function getJob(jobId: string): Promise<JobStatus> {
+  return fetchJson(`${BASE}/jobs/${encodeURIComponent(jobId)}`)
+}
+
+export function cancelJob(jobId: string): Promise<JobStatus> {
+  return fetchJson(`${BASE}/jobs/${encodeURIComponent(jobId)}/cancel`, { method: 'POST', headers: jobHeaders() })
+}
+
 interface OptimizerCallbacks {
   onProgress: (current: number, total: number) => void
+  onJob?: (jobId: string) => void
   onResult: (data: OptimizerResponse) => void
   onError: (msg: string) => void
 }
@@ -130,7 +162,7 @@ export function streamOptimizer(req: OptimizerRequest, cbs: OptimizerCallbacks):
     try {
       const res = await fetch(`${BASE}/run/optimizer`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: jobHeaders(),
         body: JSON.stringify(req),
         signal: controller.signal,
       })
@@ -142,6 +174,8 @@ export function streamOptimizer(req: OptimizerRequest, cbs: OptimizerCallbacks):
       await parseSSE(res, (type, data) => {
         if (type === 'progress') {
           cbs.onProgress(data.current as number, data.total as number)
+        } else if (type === 'job') {
+          cbs.onJob?.(data.job_id as string)
         } else if (type === 'result') {
           cbs.onResult(data as unknown as OptimizerResponse)
         } else if (type === 'error') {
@@ -157,6 +191,7 @@ export function streamOptimizer(req: OptimizerRequest, cbs: OptimizerCallbacks):
 
 interface WalkForwardCallbacks {
   onProgress: (current: number, total: number, status: string) => void
+  onJob?: (jobId: string) => void
   onResult: (data: WalkForwardResponse) => void
   onError: (msg: string) => void
 }
@@ -167,7 +202,7 @@ export function streamWalkForward(req: WalkForwardRequest, cbs: WalkForwardCallb
     try {
       const res = await fetch(`${BASE}/run/walk-forward`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: jobHeaders(),
         body: JSON.stringify(req),
         signal: controller.signal,
       })
@@ -179,6 +214,8 @@ export function streamWalkForward(req: WalkForwardRequest, cbs: WalkForwardCallb
       await parseSSE(res, (type, data) => {
         if (type === 'progress') {
           cbs.onProgress(data.current as number, data.total as number, (data.status as string) ?? '')
+        } else if (type === 'job') {
+          cbs.onJob?.(data.job_id as string)
         } else if (type === 'result') {
           cbs.onResult(data as unknown as WalkForwardResponse)
         } else if (type === 'error') {
@@ -192,6 +229,49 @@ export function streamWalkForward(req: WalkForwardRequest, cbs: WalkForwardCallb
   return controller
 }
 
+interface WalkForwardStudyCallbacks {
+  onProgress: (current: number, total: number, status: string) => void
+  onJob?: (jobId: string) => void
+  onRow: (row: WalkForwardStudyRow) => void
+  onResult: (data: WalkForwardStudyResponse) => void
+  onError: (msg: string) => void
+}
+
+export function streamWalkForwardStudy(req: WalkForwardStudyRequest, cbs: WalkForwardStudyCallbacks): AbortController {
+  const controller = new AbortController()
+  void (async () => {
+    try {
+      const res = await fetch(`${BASE}/run/walk-forward/study`, {
+        method: 'POST',
+        headers: jobHeaders(),
+        body: JSON.stringify(req),
+        signal: controller.signal,
+      })
+      if (!res.ok) {
+        const body = await res.text().catch(() => '')
+        cbs.onError(body || `HTTP ${res.status}`)
+        return
+      }
+      await parseSSE(res, (type, data) => {
+        if (type === 'progress') {
+          cbs.onProgress(data.current as number, data.total as number, (data.status as string) ?? '')
+        } else if (type === 'job') {
+          cbs.onJob?.(data.job_id as string)
+        } else if (type === 'row') {
+          cbs.onRow(data as unknown as WalkForwardStudyRow)
+        } else if (type === 'result') {
+          cbs.onResult(data as unknown as WalkForwardStudyResponse)
+        } else if (type === 'error') {
+          cbs.onError(data.message as string)
+        }
+      })
+    } catch (e) {
+      if ((e as Error).name !== 'AbortError') cbs.onError(String(e))
+    }
+  })()
+  return controller
+}
+
 // SSE frames are separated by \n\n; each frame has an "event: <type>" line and a "data: <json>" line.
 async function parseSSE(res: Response, onEvent: (type: string, data: Record<string, unknown>) => void) {
   const reader = res.body?.getReader()
@@ -46,6 +46,7 @@ export interface BacktestResult {
   trade_history: TradeEvent[]
   final_value: number
   apy: number
+  data_version?: string | null
 }
 
 export interface OptimizerResultRow {
@@ -67,6 +68,7 @@ export interface OptimizerResponse {
   best_params: StrategyParams
   best_result: BacktestResult
   all_results: OptimizerResultRow[]
+  data_version?: string | null
 }
 
 export interface SignalMetrics {
@@ -98,6 +100,7 @@ export interface SignalResponse {
   final_value: number
   data_start: string
   data_end: string
+  data_version?: string | null
 }
 
 export interface OptimizerRequest {
@@ -181,10 +184,50 @@ export interface WalkForwardRequest {
   window_type: 'anchored' | 'rolling'
   initial_training_months: number
   training_window_months: number
+  step_months?: number
   mode: 'validate' | 'discover'
   apy_tolerance_bps: number
   max_combinations: number
   seed_source: 'saved' | 'previous'
+  elimination_strategy?: 'exhaustive' | 'greedy' | 'beam'
+  beam_width?: number
+  max_elimination_evals?: number
+  job_id?: string
+}
+
+export interface FetchStatus {
+  already_current?: boolean
+  error?: string
+}
+
+export interface FetchAllResult {
+  ok: boolean
+  securities: Record<string, FetchStatus>
+  economic: Record<string, FetchStatus>
+}
+
+export interface JobRef {
+  job_id: string
+}
+
+export interface JobProgress {
+  current: number
+  total: number
+  status: string
+}
+
+export interface JobStatus {
+  job_id: string
+  kind: string
+  user: string
+  priority: number
+  status: 'queued' | 'running' | 'done' | 'error' | 'cancelled'
+  progress: JobProgress
+  queue_position: number | null
+  error: string | null
+  created_at: number
+  started_at: number | null
+  finished_at: number | null
 }
 
 export interface ValidateWindowResult {
@@ -212,6 +255,7 @@ export interface DiscoverWindowResult {
   edge: number | null
   trades: number
   is_partial: boolean
+  subsets_evaluated: number
 }
 
 export interface FactorStability {
@@ -221,7 +265,55 @@ export interface FactorStability {
 
 export interface WalkForwardResponse {
   mode: string
+  step_months?: number
+  job_id?: string
   validate_results?: ValidateWindowResult[]
   discover_results?: DiscoverWindowResult[]
   factor_stability?: Record<string, FactorStability>
+  data_version?: string | null
+}
+
+export interface WalkForwardStudyConfig {
+  window_size_months: number
+  window_type?: 'anchored' | 'rolling'
+  initial_training_months?: number
+  training_window_months?: number
+  step_months?: number
+}
+
+export interface WalkForwardStudyRequest {
+  ticker: string
+  input_type: string
+  mode: 'validate' | 'discover'
+  configs: WalkForwardStudyConfig[]
+  apy_tolerance_bps?: number
+  max_combinations?: number
+  seed_source?: 'saved' | 'previous'
+  elimination_strategy?: 'exhaustive' | 'greedy' | 'beam'
+  beam_width?: number
+  max_elimination_evals?: number
+}
+
+export interface WalkForwardStudyRow {
+  window_size_months: number
+  window_type: string
+  initial_training_months: number
+  training_window_months: number
+  step_months: number
+  windows: number
+  partial_windows: number
+  avg_apy: number | null
+  avg_insample_apy: number | null
+  avg_buyhold_apy: number | null
+  avg_edge: number | null
+  win_rate: number | null
+  trades: number
+  cells_evaluated: number
+  cells_reused: number
+}
+
+export interface WalkForwardStudyResponse {
+  mode: string
+  rows: WalkForwardStudyRow[]
+  data_version?: string | null
 }
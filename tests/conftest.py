@@ -3,5 +3,7 @@ from pathlib import Path
 
 # Make backend modules importable
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+# Make API support modules (models, jobs) importable
+sys.path.insert(1, str(Path(__file__).parent.parent / "api"))
 # Make test helpers importable
 sys.path.insert(0, str(Path(__file__).parent))
@@ -0,0 +1,65 @@
+"""
+Local HTTP server standing in for Alpha Vantage and FRED.
+
+    GET /query?symbol=SPHY...           -> weekly adjusted CSV for the symbol
+    GET /fred?series_id=DGS2...         -> FRED observations JSON
+
+Every request is recorded in `requests` as (path, query dict). Symbols listed
+in `fail` get HTTP 500.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PRICE_CSV = (
+    "timestamp,open,high,low,close,adjusted close,volume,dividend amount\n"
+    "2024-01-12,10,10,10,10,10.1,100,0\n"
+    "2024-01-05,10,10,10,10,10.0,100,0\n"
+)
+
+
+class ProviderStub:
+    def __init__(self):
+        self.requests = []
+        self.fail = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query  = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                stub.requests.append((parsed.path, query))
+                if parsed.path == "/query" and query.get("symbol") not in stub.fail:
+                    self._send(200, "text/csv", PRICE_CSV)
+                elif parsed.path == "/fred":
+                    body = {"observations": [{"date": "2024-01-12", "value": "3.5"}]}
+                    self._send(200, "application/json", json.dumps(body))
+                else:
+                    self._send(500, "text/plain", "stub failure")
+
+            def _send(self, status, content_type, body):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def count(self, path: str) -> int:
+        return sum(1 for p, _ in self.requests if p == path)
@@ -0,0 +1,76 @@
+"""
+Compact Alpha Vantage refresh: merging the latest bars into stored history.
+"""
+import pandas as pd
+
+from alpha_vantage import compact_url, merge_compact
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "adjusted close", "volume", "dividend amount"]
+
+
+def _bars(rows):
+    """rows: (date, close, adjusted close, dividend), any order → AV layout, newest first."""
+    df = pd.DataFrame([{"timestamp": d, "open": c, "high": c, "low": c, "close": c,
+                        "adjusted close": a, "volume": 100, "dividend amount": div}
+                       for d, c, a, div in rows], columns=COLUMNS)
+    return df.sort_values("timestamp", ascending=False).reset_index(drop=True)
+
+
+HISTORY = _bars([
+    ("2024-01-05", 20.0, 19.0, 0.0),
+    ("2024-01-12", 20.2, 19.19, 0.0),
+    ("2024-01-19", 20.4, 19.38, 0.0),
+    ("2024-01-26", 20.1, 19.095, 0.0),
+    ("2024-02-02", 20.3, 19.285, 0.0),
+])
+
+
+def test_new_weeks_are_appended_when_nothing_was_readjusted():
+    compact = _bars([
+        ("2024-01-19", 20.4, 19.38, 0.0),
+        ("2024-01-26", 20.1, 19.095, 0.0),
+        ("2024-02-02", 20.3, 19.285, 0.0),
+        ("2024-02-09", 20.5, 19.475, 0.0),
+    ])
+    merged = merge_compact(HISTORY, compact)
+    assert list(merged.columns) == COLUMNS
+    assert merged["timestamp"].tolist() == ["2024-02-09", "2024-02-02", "2024-01-26",
+                                            "2024-01-19", "2024-01-12", "2024-01-05"]
+    assert merged["adjusted close"].tolist()[-2:] == [19.19, 19.0]
+
+
+def test_dividend_in_compact_window_rescales_older_history():
+    # A dividend paid on 2024-02-09 scales every earlier adjusted close by 0.99
+    compact = _bars([
+        ("2024-01-19", 20.4, round(19.38 * 0.99, 4), 0.0),
+        ("2024-01-26", 20.1, round(19.095 * 0.99, 4), 0.0),
+        ("2024-02-02", 20.3, round(19.285 * 0.99, 4), 0.0),
+        ("2024-02-09", 20.3, 20.3, 0.2),
+    ])
+    merged = merge_compact(HISTORY, compact).set_index("timestamp")
+    assert merged.loc["2024-01-12", "adjusted close"] == round(19.19 * 0.99, 4)
+    assert merged.loc["2024-01-05", "adjusted close"] == round(19.0 * 0.99, 4)
+    assert merged.loc["2024-01-05", "close"] == 20.0
+    assert merged.loc["2024-02-09", "dividend amount"] == 0.2
+
+
+def test_unreconcilable_compact_needs_full_refetch():
+    gap = _bars([("2024-03-01", 21.0, 21.0, 0.0), ("2024-03-08", 21.1, 21.1, 0.0)])
+    assert merge_compact(HISTORY, gap) is None
+
+    # Overlapping weeks disagree on the adjustment factor
+    inconsistent = _bars([
+        ("2024-01-26", 20.1, 19.095 * 0.99, 0.0),
+        ("2024-02-02", 20.3, 19.285 * 0.95, 0.0),
+    ])
+    assert merge_compact(HISTORY, inconsistent) is None
+
+    # Raw closes changed
+    revised = _bars([("2024-01-26", 25.0, 19.095, 0.0), ("2024-02-02", 20.3, 19.285, 0.0)])
+    assert merge_compact(HISTORY, revised) is None
+
+
+def test_compact_url():
+    assert compact_url("https://x.test/query?symbol=A&outputsize=full&apikey=k") == \
+        "https://x.test/query?symbol=A&outputsize=compact&apikey=k"
+    assert compact_url("https://x.test/query?symbol=A") is None
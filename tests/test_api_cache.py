@@ -0,0 +1,120 @@
+"""
+ApiCache: TTL per provider, memory LRU, disk persistence; ApiSource reuse.
+"""
+import threading
+
+import pytest
+
+import api_cache
+import data_source
+from api_cache import ApiCache
+from data_source import ApiSource, ApiData
+
+AV_URL   = "https://www.alphavantage.co/query?symbol=SPHY&apikey=secret"
+FRED_URL = "https://api.stlouisfed.org/fred/series/observations"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_is_per_provider(tmp_path):
+    clock = _Clock()
+    cache = ApiCache(tmp_path, ttls={"alphavantage.co": 100, "stlouisfed.org": 10}, clock=clock)
+    cache.put(AV_URL, "av")
+    cache.put(FRED_URL, "fred", params={"series_id": "DGS2"})
+    clock.now += 50
+    assert cache.get(AV_URL) == "av"
+    assert cache.get(FRED_URL, {"series_id": "DGS2"}) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_entries_survive_restart_without_exposing_keys(tmp_path):
+    clock = _Clock()
+    ApiCache(tmp_path, clock=clock).put(AV_URL, "timestamp,close\n")
+    fresh = ApiCache(tmp_path, clock=clock)
+    assert fresh.get(AV_URL) == "timestamp,close\n"
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get(AV_URL) == "timestamp,close\n"
+    assert fresh.stats()["memory_hits"] == 1
+    assert all("secret" not in p.read_text() for p in tmp_path.iterdir())
+
+
+def test_memory_lru_is_bounded(tmp_path):
+    cache = ApiCache(None, max_entries=2, max_bytes=10)
+    cache.put("https://a.test/1", "12345")
+    cache.put("https://a.test/2", "12345")
+    cache.get("https://a.test/1")
+    cache.put("https://a.test/3", "1")            # over max_bytes: evicts /2
+    assert cache.get("https://a.test/2") is None
+    assert cache.get("https://a.test/1") == "12345"
+    assert cache.stats()["bytes"] == 6
+
+
+def test_disk_store_is_pruned_oldest_first(tmp_path):
+    cache = ApiCache(tmp_path, max_disk_bytes=300)
+    for i in range(5):
+        cache.put(f"https://a.test/{i}", "x" * 100)
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 300
+    assert len(list(tmp_path.iterdir())) < 5
+
+
+def test_concurrent_writers_to_one_directory(tmp_path, monkeypatch):
+    failed, real_replace = [], api_cache.os.replace
+
+    def replace(src, dst):
+        try:
+            real_replace(src, dst)
+        except OSError as exc:
+            failed.append(exc)
+            raise
+
+    monkeypatch.setattr(api_cache.os, "replace", replace)
+    caches = [ApiCache(tmp_path) for _ in range(4)]
+    bodies = [f"body-{i}-" + "x" * 200_000 for i in range(4)]
+    start = threading.Barrier(4)
+
+    def write(cache, body):
+        start.wait()
+        for _ in range(10):
+            cache.put(AV_URL, body)
+
+    threads = [threading.Thread(target=write, args=pair) for pair in zip(caches, bodies)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert failed == []
+    assert ApiCache(tmp_path).get(AV_URL) in bodies
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_api_source_fetches_once_and_does_not_cache_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_source, "api_cache", ApiCache(tmp_path))
+    calls = []
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, params=None):
+        calls.append(url)
+        return _Response(bodies.pop(0))
+
+    monkeypatch.setattr(data_source.requests, "get", fake_get)
+    bodies = ['{"Note": "rate limit"}', "timestamp,close\n2024-01-05,10\n"]
+
+    with pytest.raises(ValueError, match="rate limit"):
+        ApiSource(AV_URL, ApiData.CSV)
+    first  = ApiSource(AV_URL, ApiData.CSV)
+    second = ApiSource(AV_URL, ApiData.CSV)
+    assert len(calls) == 2
+    assert (first.from_cache, second.from_cache) == (False, True)
+    assert second.data.equals(first.data)
@@ -0,0 +1,58 @@
+"""
+SingleFlight: concurrent identical calls share one computation.
+"""
+import threading
+import time
+
+import pytest
+
+from coalesce import SingleFlight
+
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+
+def test_concurrent_callers_share_one_run():
+    flights, runs, results = SingleFlight(), [], []
+    started = threading.Event()
+
+    def compute():
+        runs.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {"value": 42}
+
+    _run_concurrently(5, lambda: results.append(flights.do("k", compute)))
+    assert len(runs) == 1
+    assert len(results) == 5 and all(r is results[0] for r in results)
+    assert flights.stats == {"calls": 5, "shared": 4}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    flights, runs = SingleFlight(), []
+    assert flights.do("a", lambda: runs.append("a") or 1) == 1
+    assert flights.do("a", lambda: runs.append("a") or 2) == 2
+    assert flights.do("b", lambda: runs.append("b") or 3) == 3
+    assert runs == ["a", "a", "b"]
+
+
+def test_error_is_raised_to_every_waiter():
+    flights, errors = SingleFlight(), []
+
+    def compute():
+        time.sleep(0.1)
+        raise ValueError("bad range")
+
+    def call():
+        with pytest.raises(ValueError, match="bad range"):
+            flights.do("k", compute)
+        errors.append(1)
+
+    _run_concurrently(3, call)
+    assert len(errors) == 3
+    assert flights.do("k", lambda: "ok") == "ok"
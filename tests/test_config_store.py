@@ -0,0 +1,58 @@
+"""
+ConfigStore: parsed config cached until the file changes; locked, atomic edits.
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from config_store import ConfigStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path / "securities_config.json"
+    p.write_text(json.dumps({"securities": {"SPHY": {"name": "a"}}}))
+    return p
+
+
+def test_load_is_cached_until_the_file_changes(path):
+    store = ConfigStore(path)
+    first = store.load()
+    assert store.load() is first
+
+    path.write_text(json.dumps({"securities": {"JNK": {"name": "b"}}}))
+    os.utime(path, ns=(0, 10**9))
+    assert list(store.load()["securities"]) == ["JNK"]
+
+
+def test_edit_writes_atomically_and_discards_on_error(path):
+    store = ConfigStore(path)
+    with store.edit() as full:
+        full["securities"]["JNK"] = {"name": "b"}
+    assert list(json.loads(path.read_text())["securities"]) == ["SPHY", "JNK"]
+    assert list(store.load()["securities"]) == ["SPHY", "JNK"]
+    assert not path.with_suffix(".tmp").exists()
+
+    with pytest.raises(KeyError):
+        with store.edit() as full:
+            del full["securities"]["SPHY"]
+            raise KeyError("abort")
+    assert list(store.load()["securities"]) == ["SPHY", "JNK"]
+    assert list(json.loads(path.read_text())["securities"]) == ["SPHY", "JNK"]
+
+
+def test_concurrent_edits_do_not_lose_updates(path):
+    store = ConfigStore(path)
+
+    def add(i):
+        with store.edit() as full:
+            full["securities"][f"T{i}"] = {"name": str(i)}
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(json.loads(path.read_text())["securities"]) == 21
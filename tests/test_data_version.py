@@ -0,0 +1,95 @@
+"""
+Data-version tokens: stable for unchanged contents, changed by any edit to a series read.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import data_source
+import provider_stub
+from api_cache import ApiCache
+from data_loader import WeeklyDataLoader
+from fred import Fred
+from provider_stub import ProviderStub
+from series_store import SeriesStore
+
+INPUTS_DIR = Path(__file__).parent.parent / "inputs"
+FILES = ["sphy-weekly-adjusted.csv", "BAMLH0A0HYM2.csv", "DGS10.csv", "DGS2.csv"]
+
+pytestmark = pytest.mark.skipif(not all((INPUTS_DIR / f).exists() for f in FILES), reason="inputs missing")
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    for name in FILES:
+        shutil.copy(INPUTS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def _revise_last_value(path: Path) -> None:
+    lines = path.read_text().rstrip("\n").split("\n")
+    date, _ = lines[-1].split(",")
+    lines[-1] = f"{date},9.99"
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_store_loader_version_is_known_before_loading(input_dir, tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    loader = WeeklyDataLoader("csv", input_dir, "SPHY", store=store)
+    up_front = loader.data_version("2020-01-01", None)
+    loader.load("2020-01-01")
+    assert loader.version == up_front
+
+    # Same contents from a fresh store and loader: same token; other range: different
+    fresh = WeeklyDataLoader("csv", input_dir, "SPHY", store=SeriesStore(tmp_path / "t.sqlite"))
+    assert fresh.data_version("2020-01-01") == up_front
+    assert fresh.data_version("2021-01-01") != up_front
+
+
+def test_version_follows_contents_not_file_times(input_dir, tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    before = WeeklyDataLoader("csv", input_dir, "SPHY", store=store).data_version()
+    plain = WeeklyDataLoader("csv", input_dir, "SPHY")
+    plain.load()
+    plain_before = plain.version
+
+    os.utime(input_dir / "DGS2.csv", ns=(0, 10**9))
+    assert WeeklyDataLoader("csv", input_dir, "SPHY", store=store).data_version() == before
+
+    _revise_last_value(input_dir / "DGS2.csv")
+    assert WeeklyDataLoader("csv", input_dir, "SPHY", store=store).data_version() != before
+    plain.load()
+    assert plain.version != plain_before
+
+
+def test_storeless_version_is_known_before_loading(input_dir):
+    up_front = WeeklyDataLoader("csv", input_dir, "SPHY").data_version("2020-01-01")
+    loader = WeeklyDataLoader("csv", input_dir, "SPHY")
+    loader.load("2020-01-01")
+    assert loader.version == up_front
+
+
+def test_api_version_follows_provider_responses(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_source, "api_cache", ApiCache(None))
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "k")
+    monkeypatch.setenv("FRED_API_KEY", "k")
+    with ProviderStub() as stub:
+        monkeypatch.setenv("ALPHA_VANTAGE_URL", f"{stub.url}/query?symbol={{ticker}}&apikey={{apikey}}")
+        monkeypatch.setenv("FRED_URL", stub.url + "/fred")
+        before = WeeklyDataLoader("api", tmp_path, "SPHY").data_version()
+        assert WeeklyDataLoader("api", tmp_path, "SPHY").data_version() == before
+
+        data_source.api_cache.clear()
+        monkeypatch.setattr(provider_stub, "PRICE_CSV", provider_stub.PRICE_CSV.replace("10.1", "10.2"))
+        assert WeeklyDataLoader("api", tmp_path, "SPHY").data_version() != before
+
+
+def test_sources_expose_versions(input_dir):
+    first = Fred("csv", input_dir, series_id="DGS2", col_name="DGS2")
+    assert first.version is None
+    first.get_data()
+    other_col = Fred("csv", input_dir, series_id="DGS2", col_name="y2")
+    other_col.get_data()
+    assert first.version and other_col.version != first.version
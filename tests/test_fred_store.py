@@ -0,0 +1,90 @@
+"""
+FredStore: append-only merges, in-place correction of revised trailing values.
+"""
+import pandas as pd
+
+import data_source
+from api_cache import ApiCache
+from fred import Fred
+from fred_store import FredStore, REVISION_DAYS
+from provider_stub import ProviderStub
+
+
+def _obs(pairs):
+    return [{"date": d, "value": v} for d, v in pairs]
+
+
+def _daily(start, n, value="4.00"):
+    return [(d.strftime("%Y-%m-%d"), value) for d in pd.date_range(start, periods=n, freq="D")]
+
+
+def test_first_merge_writes_full_series(tmp_path):
+    store = FredStore(tmp_path, "DGS2")
+    store.merge(_obs(_daily("2024-01-01", 5)))
+    df = pd.read_csv(tmp_path / "DGS2.csv")
+    assert list(df.columns) == ["date", "value"] and len(df) == 5
+    assert store.meta() == {"last_date": "2024-01-05", "rows": 5}
+    assert store.fetch_start() == str((pd.Timestamp("2024-01-05")
+                                       - pd.Timedelta(days=REVISION_DAYS)).date())
+
+
+def test_new_observations_are_appended_without_rewriting_history(tmp_path):
+    store = FredStore(tmp_path, "DGS2")
+    store.merge(_obs(_daily("2020-01-01", 1500)))
+    before = (tmp_path / "DGS2.csv").read_bytes()
+
+    # Refresh window: the unchanged last 30 days plus two new days
+    window = _daily("2024-01-10", 30) + [("2024-02-09", "4.10"), ("2024-02-10", ".")]
+    result = store.merge(_obs([p for p in window if p[0] >= "2024-01-10"]))
+
+    after = (tmp_path / "DGS2.csv").read_bytes()
+    assert after.startswith(before)
+    assert result == {"appended": 2, "revised": 0, "written": len(after) - len(before)}
+    assert after.endswith(b"2024-02-09,4.10\n2024-02-10,\n")
+    assert store.meta() == {"last_date": "2024-02-10", "rows": 1502}
+
+
+def test_revised_trailing_value_is_corrected_in_place(tmp_path):
+    store = FredStore(tmp_path, "DGS2")
+    store.merge(_obs(_daily("2024-01-01", 10)))
+    result = store.merge(_obs([("2024-01-08", "4.25"), ("2024-01-09", "4.00"),
+                               ("2024-01-10", "4.00"), ("2024-01-11", "4.30")]))
+    df = pd.read_csv(tmp_path / "DGS2.csv", dtype=str)
+    assert result["appended"] == 1 and result["revised"] == 1
+    assert df["value"].tolist() == ["4.00"] * 7 + ["4.25", "4.00", "4.00", "4.30"]
+    assert store.meta()["rows"] == 11
+
+
+def test_equal_values_in_other_formats_are_left_alone(tmp_path):
+    path = tmp_path / "DGS10.csv"
+    path.write_bytes(b"date,value\r\r\n2024-01-01,6.380\r\r\n2024-01-02,6.300\r\r\n")
+    store = FredStore(tmp_path, "DGS10")
+    assert store.last_date() == "2024-01-02"
+    assert store.merge(_obs([("2024-01-02", "6.3")]))["written"] == 0
+
+    store.merge(_obs([("2024-01-02", "6.3"), ("2024-01-03", "6.4")]))
+    assert path.read_bytes().endswith(b"2024-01-02,6.300\r\r\n2024-01-03,6.4\n")
+    assert pd.read_csv(path)["value"].tolist() == [6.38, 6.3, 6.4]
+
+
+def test_marker_is_rebuilt_after_outside_edit(tmp_path):
+    store = FredStore(tmp_path, "DGS2")
+    store.merge(_obs(_daily("2024-01-01", 3)))
+    with open(tmp_path / "DGS2.csv", "a") as f:
+        f.write("2024-01-04,4.50\n")
+    assert store.meta() == {"last_date": "2024-01-04", "rows": 4}
+
+
+def test_weekly_api_fetch_is_not_merged_into_daily_store(tmp_path, monkeypatch):
+    FredStore(tmp_path, "DGS2").merge(_obs(_daily("2024-01-01", 5)))
+    before = (tmp_path / "DGS2.csv").read_bytes()
+    monkeypatch.setattr(data_source, "api_cache", ApiCache(None))
+    monkeypatch.setenv("FRED_API_KEY", "k")
+    with ProviderStub() as stub:
+        monkeypatch.setenv("FRED_URL", stub.url + "/fred")
+        fred = Fred("api", tmp_path, series_id="DGS2", col_name="value")
+        df = fred.get_data()
+
+    assert stub.requests[0][1]["frequency"] == "wef"
+    assert df["value"].tolist() == [3.5]
+    assert (tmp_path / "DGS2.csv").read_bytes() == before
@@ -0,0 +1,150 @@
+"""
+JobScheduler: priority order, per-user caps, cancellation and event replay.
+"""
+import asyncio
+import threading
+import time
+
+from jobs import JobScheduler, JobCancelled, PRIORITY_SHORT, PRIORITY_LONG
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while job.status not in ("done", "error", "cancelled"):
+        assert time.time() < deadline, f"job {job.id} still {job.status}"
+        time.sleep(0.01)
+
+
+def _blocked(gate, name, order):
+    def work(progress, emit, cancel_event):
+        gate.wait(5)
+        order.append(name)
+        return name
+    return work
+
+
+def test_short_jobs_run_before_queued_long_jobs():
+    scheduler = JobScheduler(workers=1, per_user=1)
+    gate, order = threading.Event(), []
+    first = scheduler.submit("x", _blocked(gate, "first", order), user="a")
+    while first.status != "running":
+        time.sleep(0.01)
+    long_job  = scheduler.submit("x", _blocked(gate, "long", order), user="b", priority=PRIORITY_LONG)
+    short_job = scheduler.submit("x", _blocked(gate, "short", order), user="c", priority=PRIORITY_SHORT)
+    assert scheduler.position(short_job) == 1
+    gate.set()
+    _wait(long_job)
+    assert order == ["first", "short", "long"]
+    assert short_job.result == "short"
+
+
+def test_per_user_cap_lets_other_users_through():
+    scheduler = JobScheduler(workers=2, per_user=1)
+    gate, order = threading.Event(), []
+    scheduler.submit("x", _blocked(gate, "a1", order), user="a")
+    a2 = scheduler.submit("x", lambda p, e, c: order.append("a2"), user="a")
+    b1 = scheduler.submit("x", lambda p, e, c: order.append("b1"), user="b")
+    _wait(b1)
+    assert order == ["b1"] and a2.status == "queued"
+    gate.set()
+    _wait(a2)
+    assert order == ["b1", "a1", "a2"]
+
+
+def test_anonymous_jobs_are_not_capped():
+    scheduler = JobScheduler(workers=2, per_user=1)
+    gate, order = threading.Event(), []
+    first = scheduler.submit("x", _blocked(gate, "first", order))
+    second = scheduler.submit("x", _blocked(gate, "second", order))
+    deadline = time.time() + 5
+    while second.status != "running":
+        assert time.time() < deadline, "anonymous job waited behind another"
+        time.sleep(0.01)
+    assert first.status == "running"
+    gate.set()
+    _wait(second)
+
+
+def test_job_user_ignores_the_proxy_socket_address():
+    import main
+    from starlette.requests import Request
+
+    def request(headers):
+        return Request({"type": "http", "client": ("127.0.0.1", 5000),
+                        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]})
+
+    assert main._job_user(request({})) == ""
+    assert main._job_user(request({"X-Forwarded-For": "203.0.113.5, 10.0.0.1"})) == "203.0.113.5"
+    assert main._job_user(request({"X-User": "tab-1", "X-Forwarded-For": "203.0.113.5"})) == "tab-1"
+
+
+def test_cancel_queued_and_running_jobs():
+    scheduler = JobScheduler(workers=1, per_user=1)
+
+    def cooperative(progress, emit, cancel_event):
+        while True:
+            if cancel_event.is_set():
+                raise JobCancelled()
+            progress(1, 2, "working")
+            time.sleep(0.01)
+
+    running = scheduler.submit("x", cooperative, user="a")
+    queued = scheduler.submit("x", lambda p, e, c: "never", user="b")
+    while running.status != "running":
+        time.sleep(0.01)
+    scheduler.cancel(queued.id)
+    assert queued.status == "cancelled"
+    scheduler.cancel(running.id, reason="stop")
+    _wait(running)
+    assert running.status == "cancelled" and running.error == "stop"
+
+
+def test_late_subscriber_gets_replayed_events_and_result():
+    scheduler = JobScheduler(workers=1)
+
+    def work(progress, emit, cancel_event):
+        progress(1, 2, "half")
+        emit("row", {"n": 1})
+        return 42
+
+    job = scheduler.submit("x", work)
+    _wait(job)
+
+    async def drain():
+        queue = job.subscribe(asyncio.get_running_loop())
+        items = []
+        while not items or items[-1][0] != "result":
+            items.append(await asyncio.wait_for(queue.get(), 1.0))
+        return items
+
+    items = asyncio.run(drain())
+    assert ("event", "row", {"n": 1}) in items
+    assert items[-1] == ("result", 42)
+
+
+def test_resubmitting_active_job_id_attaches_to_it():
+    scheduler = JobScheduler(workers=1)
+    gate = threading.Event()
+    job = scheduler.submit("x", _blocked(gate, "a", []), job_id="abc")
+    assert scheduler.submit("x", lambda p, e, c: None, job_id="abc") is job
+    gate.set()
+    _wait(job)
+    assert scheduler.submit("x", lambda p, e, c: None, job_id="abc") is not job
+
+
+def test_timeout_cancels_unattached_running_job():
+    scheduler = JobScheduler(workers=1)
+
+    def cooperative(progress, emit, cancel_event):
+        while not cancel_event.is_set():
+            time.sleep(0.01)
+        raise JobCancelled()
+
+    slow = scheduler.submit("x", cooperative, timeout=0.05, timeout_message="too slow")
+    _wait(slow)
+    assert slow.status == "cancelled" and slow.error == "too slow"
+
+    quick = scheduler.submit("x", lambda p, e, c: 1, timeout=0.05)
+    _wait(quick)
+    time.sleep(0.1)
+    assert quick.status == "done" and not quick.cancel_event.is_set()
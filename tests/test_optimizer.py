@@ -0,0 +1,143 @@
+"""
+GenericOptimizer incremental re-optimization on real SPHY CSV data.
+
+A run on truncated price history followed by a run on the full history must
+produce the same ranking as a single full run.
+"""
+import json
+import shutil
+import threading
+import pytest
+import pandas as pd
+from pathlib import Path
+
+from data_loader import WeeklyDataLoader
+from optimizer_generic import GenericOptimizer
+
+INPUTS_DIR = Path(__file__).parent.parent / "inputs"
+TICKER = "SPHY"
+
+_FILES = [
+    f"{TICKER.lower()}-weekly-adjusted.csv",
+    "BAMLH0A0HYM2.csv",
+    "DGS10.csv",
+    "DGS2.csv",
+]
+
+pytestmark = pytest.mark.skipif(
+    not all((INPUTS_DIR / f).exists() for f in _FILES),
+    reason="Integration CSV files missing from inputs/ — fetch data first",
+)
+
+_GRIDS = {
+    "MA":           [20, 40],
+    "DROP":         [0.01, 0.02],
+    "CHG4":         [0.15],
+    "RET3":         [-0.03, -0.02],
+    "YIELD10_CHG4": [0.15],
+    "YIELD2_CHG4":  [0.10],
+    "CURVE_CHG4":   [0.30],
+    "SPREAD_DELTA": [2, 3],
+    "YIELD10_DELTA": [2],
+}
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    d = tmp_path / "inputs"
+    d.mkdir()
+    for f in _FILES:
+        shutil.copy(INPUTS_DIR / f, d / f)
+    return d
+
+
+def _optimizer(input_dir, state_dir=None):
+    return GenericOptimizer("csv", input_dir, cash_rate=0.04, param_grids=_GRIDS,
+                            start_date="2015-01-01", state_dir=state_dir)
+
+
+def test_incremental_matches_full_run(input_dir, tmp_path):
+    price_path = input_dir / _FILES[0]
+    full_text = price_path.read_text()
+    lines = full_text.splitlines(keepends=True)
+    # Price CSV is newest-first: drop the 10 most recent weeks
+    price_path.write_text(lines[0] + "".join(lines[11:]))
+
+    state_dir = tmp_path / "state"
+    _optimizer(input_dir, state_dir).run(TICKER, start_invested=1)
+    assert len(list(state_dir.glob(f"{TICKER.lower()}-optimizer-state-*.json"))) == 1
+
+    price_path.write_text(full_text)
+    opt = _optimizer(input_dir, state_dir)
+    calls = []
+    orig = opt._run_full
+    opt._run_full = lambda *a, **k: calls.append(1) or orig(*a, **k)
+    best_inc, results_inc, _ = opt.run(TICKER, start_invested=1)
+    assert calls == [], "expected an incremental update, got a full re-run"
+
+    best_full, results_full, _ = _optimizer(input_dir).run(TICKER, start_invested=1)
+
+    assert best_inc == best_full
+    pd.testing.assert_frame_equal(results_inc, results_full, rtol=1e-9)
+
+
+def test_revised_history_forces_full_run(input_dir, tmp_path):
+    state_dir = tmp_path / "state"
+    _optimizer(input_dir, state_dir).run(TICKER, start_invested=1)
+
+    # Revise the most recent spread observation
+    fred_path = input_dir / "BAMLH0A0HYM2.csv"
+    df = pd.read_csv(fred_path)
+    df.loc[df.index[-1], "value"] = "9.99"
+    df.to_csv(fred_path, index=False)
+
+    opt = _optimizer(input_dir, state_dir)
+    calls = []
+    orig = opt._run_full
+    opt._run_full = lambda *a, **k: calls.append(1) or orig(*a, **k)
+    opt.run(TICKER, start_invested=1)
+    assert calls == [1]
+
+
+def test_states_for_different_grids_do_not_overwrite_each_other(input_dir, tmp_path):
+    state_dir = tmp_path / "state"
+    _optimizer(input_dir, state_dir).run(TICKER, start_invested=1)
+    other = GenericOptimizer("csv", input_dir, cash_rate=0.04, param_grids={**_GRIDS, "MA": [30]},
+                             start_date="2015-01-01", state_dir=state_dir)
+    other.run(TICKER, start_invested=1)
+    assert len(list(state_dir.glob(f"{TICKER.lower()}-optimizer-state-*.json"))) == 2
+
+    opt = _optimizer(input_dir, state_dir)
+    calls = []
+    orig = opt._run_full
+    opt._run_full = lambda *a, **k: calls.append(1) or orig(*a, **k)
+    opt.run(TICKER, start_invested=1)
+    assert calls == [], "the first grid's state was lost to the second run"
+
+
+def test_concurrent_state_saves_for_one_key(input_dir, tmp_path):
+    state_dir = tmp_path / "state"
+    opt = _optimizer(input_dir, state_dir)
+    opt.run(TICKER, start_invested=1)
+    (path,) = state_dir.glob("*.json")
+    saved = opt._load_state(TICKER, json.loads(path.read_text())["key"])
+    frame = WeeklyDataLoader("csv", input_dir, TICKER).load(start_date="2015-01-01")
+    rows = saved["combos"]
+    errors, start = [], threading.Barrier(4)
+
+    def save():
+        start.wait()
+        try:
+            for _ in range(25):
+                opt._save_state(TICKER, saved["key"], frame, rows)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert json.loads(path.read_text())["key"] == saved["key"]
+    assert list(state_dir.glob("*.tmp")) == []
@@ -0,0 +1,146 @@
+"""
+Bulk data refresh: token bucket pacing, pooled fetches against a provider stub,
+and the /api/securities/fetch-all endpoint fetching each FRED series once.
+"""
+import asyncio
+import json
+import os
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from api_cache import ApiCache
+from config_store import ConfigStore
+from provider_stub import PRICE_CSV, ProviderStub
+from refresh import TokenBucket, fetch_all
+from result_cache import ResultCache
+from series_store import SeriesStore, price_series
+
+
+class _FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_paces_beyond_burst():
+    t = _FakeTime()
+    bucket = TokenBucket(5, per=60.0, clock=t.clock, sleep=t.sleep)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    asyncio.run(take(7))
+    assert t.now == pytest.approx(24.0)       # 5 immediately, then one per 12s
+    assert len(t.slept) == 2
+
+
+def test_fetch_all_requests_each_item_once_and_isolates_failures():
+    with ProviderStub() as stub:
+        stub.fail.add("BAD")
+        prices = {s: f"{stub.url}/query?symbol={s}" for s in ("SPHY", "HYMB", "BAD")}
+        fred = {s: (f"{stub.url}/fred", {"series_id": s}) for s in ("DGS2", "DGS10")}
+        got_prices, got_fred = asyncio.run(
+            fetch_all(prices, fred, TokenBucket(100), TokenBucket(100), max_connections=2))
+
+    assert stub.count("/query") == 3 and stub.count("/fred") == 2
+    assert got_prices["SPHY"].startswith("timestamp")
+    assert isinstance(got_prices["BAD"], Exception)
+    assert got_fred["DGS2"]["observations"][0]["value"] == "3.5"
+
+
+def _point_main_at(stub, tmp_path, monkeypatch, tickers, av_query="symbol={ticker}&apikey={apikey}"):
+    import main
+
+    inputs = tmp_path / "inputs"
+    inputs.mkdir(exist_ok=True)
+    config = tmp_path / "securities_config.json"
+    config.write_text(json.dumps({"securities": {t: {} for t in tickers}}))
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "k")
+    monkeypatch.setenv("ALPHA_VANTAGE_URL", f"{stub.url}/query?{av_query}")
+    monkeypatch.setenv("FRED_API_KEY", "k")
+    monkeypatch.setenv("FRED_URL", stub.url + "/fred")
+    monkeypatch.setattr(main, "INPUT_DIR", inputs)
+    monkeypatch.setattr(main, "CONFIG", ConfigStore(config))
+    monkeypatch.setattr(main, "api_cache", ApiCache(tmp_path / "api"))
+    monkeypatch.setattr(main, "SERIES_STORE", SeriesStore(tmp_path / "series.sqlite"))
+    monkeypatch.setattr(main, "AV_BUCKET", TokenBucket(100))
+    monkeypatch.setattr(main, "_fred_last_fetched", None)
+    return main, inputs
+
+
+def test_fetch_all_endpoint(tmp_path, monkeypatch):
+    with ProviderStub() as stub:
+        stub.fail.add("BAD")
+        main, inputs = _point_main_at(stub, tmp_path, monkeypatch, ["SPHY", "HYMB", "BAD"])
+        client = TestClient(main.app)
+        body = client.post("/api/securities/fetch-all").json()
+        again = client.post("/api/securities/fetch-all").json()
+
+    assert body["ok"] is False
+    assert body["securities"]["SPHY"] == {"already_current": False}
+    assert "error" in body["securities"]["BAD"]
+    assert all(r == {"already_current": False} for r in body["economic"].values())
+    assert (inputs / "hymb-weekly-adjusted.csv").exists()
+    assert (inputs / "DGS2.csv").read_text().strip().endswith("2024-01-12,3.5")
+
+    # Second refresh: cached prices and recently fetched FRED make no calls for them
+    assert again["securities"]["SPHY"] == {"already_current": True}
+    assert all(r == {"already_current": True} for r in again["economic"].values())
+    assert stub.count("/fred") == 3
+    assert stub.count("/query") == 4           # three tickers, then BAD again
+
+
+def test_stored_history_is_refreshed_with_compact_responses(tmp_path, monkeypatch):
+    history = PRICE_CSV + "2023-12-29,10,10,10,10,9.9,100,0\n"
+    with ProviderStub() as stub:
+        main, inputs = _point_main_at(stub, tmp_path, monkeypatch, ["SPHY", "HYMB"],
+                                      av_query="symbol={ticker}&outputsize=full&apikey={apikey}")
+        (inputs / "sphy-weekly-adjusted.csv").write_text(history)
+        # HYMB's stored raw closes disagree with the provider: merge refused, full refetch
+        (inputs / "hymb-weekly-adjusted.csv").write_text(history.replace(",10,10,10,10,", ",9,9,9,9,"))
+        os.utime(inputs / "sphy-weekly-adjusted.csv", (0, 0))
+        os.utime(inputs / "hymb-weekly-adjusted.csv", (0, 0))
+
+        body = TestClient(main.app).post("/api/securities/fetch-all").json()
+
+    sizes = [(q["symbol"], q["outputsize"]) for p, q in stub.requests if p == "/query"]
+    assert sorted(sizes) == [("HYMB", "compact"), ("HYMB", "full"), ("SPHY", "compact")]
+    assert body["securities"] == {"SPHY": {"already_current": False}, "HYMB": {"already_current": False}}
+    sphy = pd.read_csv(inputs / "sphy-weekly-adjusted.csv")
+    assert sphy["timestamp"].tolist() == ["2024-01-12", "2024-01-05", "2023-12-29"]
+    assert len(pd.read_csv(inputs / "hymb-weekly-adjusted.csv")) == 2
+    assert main.SERIES_STORE.meta(price_series("SPHY"))["first_date"] == "2023-12-29"
+
+
+def test_cache_hit_rewrites_only_a_stale_csv(tmp_path, monkeypatch):
+    with ProviderStub() as stub:
+        main, inputs = _point_main_at(stub, tmp_path, monkeypatch, ["SPHY"])
+    monkeypatch.setattr(main, "RESULTS", ResultCache())
+    url, csv_path = main._av_url("SPHY"), inputs / "sphy-weekly-adjusted.csv"
+    main.api_cache.put(url, PRICE_CSV)
+
+    # No CSV yet: the cached response is written out and stale results dropped
+    main.RESULTS.put("backtest", "result", tag="SPHY")
+    assert main._price_csv_current("SPHY", url)
+    assert csv_path.exists() and main.RESULTS.get("backtest") is None
+
+    # CSV newer than the cached response: left alone, results kept
+    main.RESULTS.put("backtest", "result", tag="SPHY")
+    written = csv_path.stat().st_mtime_ns
+    assert main._price_csv_current("SPHY", url)
+    assert csv_path.stat().st_mtime_ns == written and main.RESULTS.get("backtest") == "result"
+
+    # CSV older than the cached response: rewritten
+    os.utime(csv_path, (0, 0))
+    assert main._price_csv_current("SPHY", url)
+    assert csv_path.stat().st_mtime > 0 and main.RESULTS.get("backtest") is None
@@ -0,0 +1,60 @@
+"""
+ResultCache: LRU eviction by entries and bytes, tag invalidation, stats.
+"""
+from pydantic import BaseModel
+
+from result_cache import ResultCache
+
+
+class _Payload(BaseModel):
+    text: str
+
+
+def test_evicts_least_recently_used_entry():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", _Payload(text="a"))
+    cache.put("b", _Payload(text="b"))
+    assert cache.get("a").text == "a"          # "b" is now least recently used
+    cache.put("c", _Payload(text="c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_bounds_total_size():
+    one = len(_Payload(text="x" * 100).model_dump_json())
+    cache = ResultCache(max_entries=100, max_bytes=2 * one)
+    for key in "abc":
+        cache.put(key, _Payload(text="x" * 100))
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 2 * one
+    assert cache.get("a") is None
+
+    # A result larger than the whole budget is returned but not kept
+    big = _Payload(text="x" * 1000)
+    assert cache.put("big", big) is big
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_invalidate_by_tag_and_all():
+    cache = ResultCache()
+    cache.put(("signal", "SPHY", 1), _Payload(text="1"), tag="SPHY")
+    cache.put(("buyhold", "SPHY", 1), _Payload(text="2"), tag="SPHY")
+    cache.put(("signal", "HYMB", 1), _Payload(text="3"), tag="HYMB")
+    assert cache.invalidate("SPHY") == 2
+    assert cache.get(("signal", "SPHY", 1)) is None
+    assert cache.get(("signal", "HYMB", 1)) is not None
+    assert cache.invalidate() == 1
+    assert cache.stats()["bytes"] == 0
+
+
+def test_hit_and_miss_counts():
+    cache = ResultCache()
+    assert cache.get("k") is None
+    cache.put("k", _Payload(text="v"))
+    cache.get("k")
+    cache.get("k")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert abs(stats["hit_rate"] - 2 / 3) < 1e-12
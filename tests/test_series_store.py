@@ -0,0 +1,151 @@
+"""
+SeriesStore: range reads, coverage metadata, CSV sync; loader parity with CSV reads.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from data_loader import WeeklyDataLoader
+from series_store import SeriesStore, fred_series
+
+INPUTS_DIR = Path(__file__).parent.parent / "inputs"
+
+
+def test_upsert_read_range_and_meta(tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    store.upsert("fred:X", [("2024-01-01", 1.0), ("2024-01-02", None), ("2024-01-03", 3.0)])
+    store.upsert("fred:X", [("2024-01-03", 3.5), ("2024-01-04", None)])
+
+    df = store.read("fred:X", start="2024-01-02", end="2024-01-03")
+    assert df["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-02", "2024-01-03"]
+    assert pd.isna(df["value"].iloc[0]) and df["value"].iloc[1] == 3.5
+
+    meta = store.meta("fred:X")
+    assert (meta["first_date"], meta["last_date"], meta["last_valid_date"], meta["rows"]) == \
+        ("2024-01-01", "2024-01-04", "2024-01-03", 4)
+    assert store.last_date_until("fred:X", "2024-01-02") == "2024-01-02"
+    assert store.meta("fred:Y") is None
+
+
+def test_sync_csv_reimports_only_when_file_changes(tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    path = tmp_path / "DGS2.csv"
+    path.write_text("date,value\n2024-01-01,4.0\n2024-01-02,.\n")
+    assert store.sync_csv(fred_series("DGS2"), path, "date", "value")
+    assert not store.sync_csv(fred_series("DGS2"), path, "date", "value")
+
+    path.write_text("date,value\n2024-01-02,4.1\n2024-01-03,4.2\n")
+    os.utime(path, ns=(0, 10**9))
+    assert store.sync_csv(fred_series("DGS2"), path, "date", "value")
+    assert store.read(fred_series("DGS2"))["value"].tolist() == [4.1, 4.2]
+
+
+@pytest.mark.skipif(not (INPUTS_DIR / "sphy-weekly-adjusted.csv").exists(), reason="inputs missing")
+@pytest.mark.parametrize("start, end", [(None, None), ("2018-03-07", "2019-11-15"), ("2024-01-01", None)])
+def test_loader_through_store_matches_csv_loader(tmp_path, start, end):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    expected = WeeklyDataLoader("csv", INPUTS_DIR, "SPHY").load(start, end)
+    got = WeeklyDataLoader("csv", INPUTS_DIR, "SPHY", store=store).load(start, end)
+
+    # TR is rebased to the first row read; returns built from it are unchanged
+    cols = [c for c in expected.columns if c not in ("TR", "TR_factor", "close_prev")]
+    assert list(got.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(got[cols], expected[cols], rtol=1e-12)
+
+
+@pytest.mark.skipif(not (INPUTS_DIR / "sphy-weekly-adjusted.csv").exists(), reason="inputs missing")
+def test_loader_through_store_reports_out_of_range_like_csv_loader(tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    with pytest.raises(ValueError) as expected:
+        WeeklyDataLoader("csv", INPUTS_DIR, "SPHY").load("2099-01-01")
+    with pytest.raises(ValueError) as got:
+        WeeklyDataLoader("csv", INPUTS_DIR, "SPHY", store=store).load("2099-01-01")
+    assert str(got.value) == str(expected.value)
+
+
+def test_index_tracks_content_hash_and_fetch_time(tmp_path):
+    store = SeriesStore(tmp_path / "s.sqlite")
+    path = tmp_path / "DGS2.csv"
+    path.write_text("date,value\n2024-01-01,.\n2024-01-02,4.0\n")
+    store.sync_csv(fred_series("DGS2"), path, "date", "value")
+    meta = store.meta(fred_series("DGS2"))
+    assert (meta["first_valid_date"], meta["fetched_at"]) == ("2024-01-02", None)
+
+    store.upsert(fred_series("DGS2"), [("2024-01-02", 4.0)], source=path, fetched_at=123.0)
+    same = store.meta(fred_series("DGS2"))
+    assert same["content_hash"] == meta["content_hash"] and same["fetched_at"] == 123.0
+
+    store.upsert(fred_series("DGS2"), [("2024-01-02", 4.1)], source=path)
+    revised = store.meta(fred_series("DGS2"))
+    assert revised["content_hash"] != meta["content_hash"] and revised["fetched_at"] == 123.0
+
+    # A fresh instance reads the index back from the database
+    assert SeriesStore(tmp_path / "s.sqlite").meta(fred_series("DGS2")) == revised
+
+
+def test_index_from_older_schema_is_backfilled(tmp_path):
+    import sqlite3
+    db = tmp_path / "s.sqlite"
+    with sqlite3.connect(db) as conn:
+        conn.executescript("""
+            CREATE TABLE observations (series TEXT NOT NULL, date TEXT NOT NULL, value REAL,
+                                       PRIMARY KEY (series, date)) WITHOUT ROWID;
+            CREATE TABLE series_meta (series TEXT PRIMARY KEY, first_date TEXT, last_date TEXT,
+                                      last_valid_date TEXT, rows INTEGER NOT NULL, source_size INTEGER,
+                                      source_mtime_ns INTEGER, updated_at REAL NOT NULL);
+            INSERT INTO observations VALUES ('fred:X', '2024-01-01', 1.0);
+            INSERT INTO series_meta VALUES ('fred:X', '2024-01-01', '2024-01-01', '2024-01-01', 1, 10, 20, 0);
+        """)
+    meta = SeriesStore(db).meta("fred:X")
+    assert meta["content_hash"] and meta["first_valid_date"] == "2024-01-01"
+    assert (meta["source_size"], meta["source_mtime_ns"]) == (10, 20)
+
+
+def test_economic_dates_answer_with_etag(tmp_path, monkeypatch):
+    import main
+    from fastapi.testclient import TestClient
+
+    for series_id in ("BAMLH0A0HYM2", "DGS2", "DGS10"):
+        (tmp_path / f"{series_id}.csv").write_text("date,value\n2024-01-01,1.0\n2024-01-02,.\n")
+    monkeypatch.setattr(main, "INPUT_DIR", tmp_path)
+    monkeypatch.setattr(main, "SERIES_STORE", SeriesStore(tmp_path / "s.sqlite"))
+    client = TestClient(main.app)
+
+    first = client.get("/api/economic-data/dates")
+    assert first.json() == {"spread": "2024-01-01", "dgs2": "2024-01-01", "dgs10": "2024-01-01"}
+    etag = first.headers["etag"]
+    assert client.get("/api/economic-data/dates", headers={"If-None-Match": etag}).status_code == 304
+
+    (tmp_path / "DGS2.csv").write_text("date,value\n2024-01-01,1.0\n2024-01-02,2.0\n")
+    changed = client.get("/api/economic-data/dates", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["dgs2"] == "2024-01-02"
+
+
+def test_economic_dates_cover_configured_indicators(tmp_path, monkeypatch):
+    import json
+    import main
+    from config_store import ConfigStore
+    from fastapi.testclient import TestClient
+
+    def fred(series_id):
+        return {"provider": "fred", "series_id": series_id}
+
+    config = tmp_path / "securities_config.json"
+    config.write_text(json.dumps({"securities": {
+        "SPHY": {},
+        "HYBB": {"data_sources": {"indicators": {
+            "credit_spread": fred("BAMLH0A1HYBB"), "yield_10y": fred("DGS10"),
+            "yield_2y": fred("DGS2"), "inflation": fred("T10YIE")}}},
+    }}))
+    for series_id in ("BAMLH0A0HYM2", "DGS2", "DGS10", "BAMLH0A1HYBB", "T10YIE"):
+        (tmp_path / f"{series_id}.csv").write_text("date,value\n2024-01-01,1.0\n")
+    monkeypatch.setattr(main, "CONFIG", ConfigStore(config))
+    monkeypatch.setattr(main, "INPUT_DIR", tmp_path)
+    monkeypatch.setattr(main, "SERIES_STORE", SeriesStore(tmp_path / "s.sqlite"))
+
+    dates = TestClient(main.app).get("/api/economic-data/dates").json()
+    # Default series keep their labels; a second credit spread is labelled by its ID
+    assert dates == {"spread": "2024-01-01", "dgs10": "2024-01-01", "dgs2": "2024-01-01",
+                     "bamlh0a1hybb": "2024-01-01", "t10yie": "2024-01-01"}
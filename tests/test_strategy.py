@@ -329,3 +329,64 @@ def test_evaluate_buy_all_ignored_passes():
     df = _buy_df()
     strat = GenericStrategy(_BASE_PARAMS, ignore=_ALL_BUY)
     assert strat.evaluate_buy(df.iloc[-1], df, df.index[-1], last_action_was_sell=True)
+
+
+# ===========================================================================
+# resume(): continuing from a saved end state
+# ===========================================================================
+
+def test_resume_matches_single_run():
+    """Run over a prefix, then resume over the remaining rows → same as one full run."""
+    n = 30
+    spread = np.full(n, 3.0)
+    spread[5] = 3.6    # sell at row 5
+    spread[20] = 3.6   # sell again at row 20, after the split point
+    df = _make_and_apply(n, spread=spread)
+    ignore = (_ALL_SELL - {"CHG4"}) | _ALL_BUY
+
+    full = GenericStrategy(_BASE_PARAMS, ignore=ignore)
+    positions_full, buys_full, sells_full = full.run(df, start_invested=1)
+
+    split = 12
+    head = GenericStrategy(_BASE_PARAMS, ignore=ignore)
+    positions_head, buys_head, sells_head = head.run(df.iloc[:split], start_invested=1)
+    tail = GenericStrategy(_BASE_PARAMS, ignore=ignore)
+    positions_tail, buys_tail, sells_tail = tail.resume(df, head.state, n - split)
+
+    assert positions_head + positions_tail == positions_full
+    assert buys_head + buys_tail == buys_full
+    assert sells_head + sells_tail == sells_full
+    assert tail.state == full.state
+
+
+def test_run_exposes_end_state():
+    n = 10
+    spread = np.full(n, 3.0)
+    spread[5] = 3.6
+    df = _make_and_apply(n, spread=spread)
+    strat = GenericStrategy(_BASE_PARAMS, ignore=_ALL - {"CHG4"})
+    strat.run(df, start_invested=1)
+    assert strat.state["was_sold"] is True
+
+
+def test_row_states_resume_matches_full_run():
+    """Resuming from row_states()[k] over the rest of df reproduces the full run's tail."""
+    n = 30
+    spread = np.full(n, 3.0)
+    spread[5] = 3.6
+    spread[20] = 3.6
+    df = _make_and_apply(n, spread=spread)
+    ignore = (_ALL_SELL - {"CHG4"}) | _ALL_BUY
+
+    strat = GenericStrategy(_BASE_PARAMS, ignore=ignore)
+    positions, _, _ = strat.run(df, start_invested=1)
+    states = strat.row_states(df, start_invested=1)
+
+    assert [s["invested"] for s in states] == positions
+    assert states[4]["was_sold"] is False
+    assert states[5]["was_sold"] is True
+
+    k = 12
+    tail = GenericStrategy(_BASE_PARAMS, ignore=ignore)
+    tail_positions, _, _ = tail.resume(df, states[k - 1], n - k)
+    assert tail_positions == positions[k:]
@@ -0,0 +1,431 @@
+"""
+WalkForwardEngine on real SPHY CSV data.
+
+Skipped automatically if any required input file is missing.
+"""
+import itertools
+import json
+import threading
+from types import SimpleNamespace
+import pytest
+from pathlib import Path
+
+import walk_forward
+from strategy_generic import PARAM_NAMES
+from walk_forward import WalkForwardEngine
+
+INPUTS_DIR = Path(__file__).parent.parent / "inputs"
+TICKER = "SPHY"
+
+_REQUIRED = [
+    INPUTS_DIR / f"{TICKER.lower()}-weekly-adjusted.csv",
+    INPUTS_DIR / "BAMLH0A0HYM2.csv",
+    INPUTS_DIR / "DGS10.csv",
+    INPUTS_DIR / "DGS2.csv",
+]
+
+pytestmark = pytest.mark.skipif(
+    not all(f.exists() for f in _REQUIRED),
+    reason="Integration CSV files missing from inputs/ — fetch data first",
+)
+
+
+def _load_sphy_config():
+    cfg = json.loads(
+        (Path(__file__).parent.parent / "api" / "securities_config.json").read_text()
+    )
+    sec = cfg["securities"][TICKER]
+    params_cfg = sec["parameters"]
+    params, ignore = {}, set()
+    for factor, v in {**params_cfg["sell_triggers"], **params_cfg["buy_conditions"]}.items():
+        params[factor] = v["default"]
+        if v["ignore"]:
+            ignore.add(factor)
+    return params, ignore, sec["cash_rate"], sec["start_invested"]
+
+
+_PARAMS, _IGNORE, _CASH_RATE, _START_INVESTED = _load_sphy_config()
+
+
+def _engine(**kwargs):
+    # config is only consulted by discover-mode range refinement
+    return WalkForwardEngine("csv", INPUTS_DIR, TICKER, _CASH_RATE, _START_INVESTED,
+                             config=None, **kwargs)
+
+
+def _validate(engine, **kwargs):
+    args = dict(window_size_months=12, window_type="anchored",
+                initial_training_months=36, training_window_months=36)
+    args.update(kwargs)
+    return engine.run_validate(seed_params=_PARAMS, seed_ignore=_IGNORE, **args)
+
+
+# ---------------------------------------------------------------------------
+# Validate mode
+# ---------------------------------------------------------------------------
+
+def test_validate_windows_are_contiguous():
+    rows = _validate(_engine())
+    assert len(rows) > 5
+    for prev, cur in zip(rows, rows[1:]):
+        assert prev["test_end"] < cur["test_start"]
+
+
+def test_validate_overlapping_windows_share_back_to_back_results():
+    back_to_back = {r["test_start"]: r for r in _validate(_engine())}
+    overlapping = _validate(_engine(), step_months=3)
+    assert len(overlapping) > 3 * (len(back_to_back) - 1)
+    for prev, cur in zip(overlapping, overlapping[1:]):
+        assert prev["test_start"] < cur["test_start"]
+    full = [r for r in overlapping if not r["is_partial"]]
+    assert any(a["test_end"] >= b["test_start"] for a, b in zip(full, full[1:]))
+    shared = [r for r in overlapping if r["test_start"] in back_to_back]
+    assert shared
+    for r in shared:
+        assert r == back_to_back[r["test_start"]]
+
+
+def test_step_months_must_be_positive():
+    with pytest.raises(ValueError):
+        _validate(_engine(), step_months=0)
+
+
+def test_validate_process_pool_matches_serial(monkeypatch):
+    monkeypatch.setattr(walk_forward, "POOL_MIN_WORK", 0)
+    progress = []
+    serial = _validate(_engine())
+    pooled = _validate(_engine(max_workers=2),
+                       progress_callback=lambda c, t, s: progress.append((c, t)))
+    assert pooled == serial
+    assert progress and progress[-1][0] == progress[-1][1]
+
+
+def test_validate_runs_serially_below_pool_threshold(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("small validate run started a process pool")
+
+    monkeypatch.setattr(WalkForwardEngine, "_run_windows_parallel", no_pool)
+    assert _validate(_engine(max_workers=4)) == _validate(_engine())
+
+
+def _count_calls(monkeypatch, name):
+    calls = []
+    original = getattr(WalkForwardEngine, name)
+
+    def counted(self, *args, **kwargs):
+        calls.append(args[1]["test_start"])
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(WalkForwardEngine, name, counted)
+    return calls
+
+
+def test_window_cache_recomputes_only_windows_reaching_new_rows(tmp_path, monkeypatch):
+    full_prepare = WalkForwardEngine._prepare_base
+
+    def without_last_weeks(self):
+        df = full_prepare(self)
+        self._raw = self._raw[:-20]
+        return df.iloc[:-20]
+
+    monkeypatch.setattr(WalkForwardEngine, "_prepare_base", without_last_weeks)
+    earlier = _validate(_engine(cache_dir=tmp_path))
+    monkeypatch.setattr(WalkForwardEngine, "_prepare_base", full_prepare)
+
+    expected = _validate(_engine())
+    calls = _count_calls(monkeypatch, "_validate_window")
+    rows = _validate(_engine(cache_dir=tmp_path))
+    assert rows == expected
+    # Only the windows whose test period reaches the appended weeks were re-run
+    assert 0 < len(calls) < len(rows)
+    assert [r for r in rows if r["test_start"] not in calls] == \
+           [r for r in earlier if r["test_start"] not in calls]
+
+    calls.clear()
+    assert _validate(_engine(cache_dir=tmp_path)) == rows
+    assert calls == []
+
+
+def test_window_cache_keeps_windows_from_earlier_runs(tmp_path, monkeypatch):
+    full_prepare = WalkForwardEngine._prepare_base
+    full = _validate(_engine(cache_dir=tmp_path))
+
+    # A run on a year less data produces fewer windows; it must not drop the rest
+    def without_last_year(self):
+        df = full_prepare(self)
+        self._raw = self._raw[:-52]
+        return df.iloc[:-52]
+
+    monkeypatch.setattr(WalkForwardEngine, "_prepare_base", without_last_year)
+    assert len(_validate(_engine(cache_dir=tmp_path))) < len(full)
+    monkeypatch.setattr(WalkForwardEngine, "_prepare_base", full_prepare)
+
+    calls = _count_calls(monkeypatch, "_validate_window")
+    assert _validate(_engine(cache_dir=tmp_path)) == full
+    assert calls == []
+
+
+def test_concurrent_cache_saves_merge_and_never_raise(tmp_path, monkeypatch):
+    path = tmp_path / "sphy-walk-forward-x.json"
+    engines = []
+    for i in range(8):
+        engine = _engine()
+        engine._cache = {"path": path, "key": "k", "saved": {},
+                         "windows": {f"w{i}": {"data": "d", "output": i}}}
+        engines.append(engine)
+    threads = [threading.Thread(target=e._cache_save) for e in engines]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(json.loads(path.read_text())["windows"]) == [f"w{i}" for i in range(8)]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    # A failed write is logged, not raised out of the run's finally block
+    def fail(*args):
+        raise PermissionError("locked")
+
+    monkeypatch.setattr(walk_forward.os, "replace", fail)
+    engines[0]._cache_save()
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_window_cache_reuses_discover_windows(tmp_path, monkeypatch):
+    config = SimpleNamespace(sell_triggers={}, buy_conditions={})
+    args = (24, "rolling", 36, 36, _PARAMS, 10.0, 20, "previous")
+
+    def engine():
+        return WalkForwardEngine("csv", INPUTS_DIR, TICKER, _CASH_RATE, _START_INVESTED,
+                                 config, cache_dir=tmp_path)
+
+    first = engine().run_discover(*args)
+    calls = _count_calls(monkeypatch, "_discover_window")
+    assert engine().run_discover(*args) == first
+    assert calls == []
+    # A different request does not read the other run's windows
+    engine().run_discover(*args[:-1], "saved")
+    assert calls
+
+
+def test_discover_resumes_from_checkpoint(tmp_path, monkeypatch):
+    config = SimpleNamespace(sell_triggers={}, buy_conditions={})
+    args = (12, "anchored", 36, 36, _PARAMS, 10.0, 20, "previous")
+    checkpoint = tmp_path / "job.json"
+
+    def engine():
+        return WalkForwardEngine("csv", INPUTS_DIR, TICKER, _CASH_RATE, _START_INVESTED, config)
+
+    expected = engine().run_discover(*args)
+
+    # Interrupt as the fifth window starts
+    cancel = threading.Event()
+    interrupted = engine().run_discover(
+        *args, checkpoint_path=checkpoint, cancel_event=cancel,
+        progress_callback=lambda c, t, s: cancel.set() if c > 4 * 5 else None)
+    saved = json.loads(checkpoint.read_text())
+    assert len(saved["windows"]) == 4
+    assert set(saved) == {"key", "windows"}
+    assert len(interrupted[0]) < len(expected[0])
+
+    calls = _count_calls(monkeypatch, "_discover_window")
+    assert engine().run_discover(*args, checkpoint_path=checkpoint) == expected
+    n_windows = len(json.loads(checkpoint.read_text())["windows"])
+    assert n_windows >= len(expected[0])
+    assert len(calls) == n_windows - 4
+
+
+def test_finished_discover_job_removes_its_checkpoint(tmp_path, monkeypatch):
+    import os
+    import main
+    from fastapi.testclient import TestClient
+
+    checkpoints = tmp_path / "jobs"
+    monkeypatch.setattr(main, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(main, "CHECKPOINT_DIR", checkpoints)
+    job_id = "0" * 32
+    body = {"ticker": TICKER, "mode": "discover", "max_combinations": 20, "job_id": job_id}
+    with TestClient(main.app).stream("POST", "/api/run/walk-forward", json=body) as response:
+        events = "".join(response.iter_text())
+    assert "event: result" in events
+    assert not (checkpoints / f"{job_id}.json").exists()
+
+    # Checkpoints left by interrupted jobs are pruned once stale
+    stale, recent = checkpoints / f"{'1' * 32}.json", checkpoints / f"{'2' * 32}.json"
+    for path in (stale, recent):
+        path.write_text("{}")
+    os.utime(stale, (0, 0))
+    assert main._prune_checkpoints(max_age_days=1) == 1
+    assert not stale.exists() and recent.exists()
+
+
+# ---------------------------------------------------------------------------
+# Discover-mode factor elimination
+# ---------------------------------------------------------------------------
+
+def test_ignore_set_batch_matches_run_params():
+    """Batched per-factor masks give the same (apy, trades) as a full run per ignore set."""
+    engine = _engine()
+    base_df = engine._prepare_base()
+    engine._ensure_ma(base_df, int(_PARAMS["MA"]))
+    bounds = engine._bounds(base_df, "2013-01-01", "2019-12-31")
+    train_df = base_df.iloc[bounds[0]:bounds[1]]
+
+    ignore_sets = [set(), {"CHG4"}, {"MA", "DROP"}, {"RET3", "YIELD2_CHG4", "SPREAD_DELTA"},
+                   {"CHG4", "RET3", "YIELD10_CHG4", "YIELD2_CHG4", "CURVE_CHG4"}]
+    batched = engine._run_ignore_sets(base_df, bounds, _PARAMS, ignore_sets)
+    expected = [engine._run_params(train_df, _PARAMS, ignore) for ignore in ignore_sets]
+
+    assert batched == expected
+
+
+def _elimination_inputs():
+    engine = _engine()
+    base_df = engine._prepare_base()
+    bounds = engine._bounds(base_df, "2013-01-01", "2019-12-31")
+    (baseline_apy, _), = engine._run_ignore_sets(base_df, bounds, _PARAMS, [set()])
+    candidates = ["CHG4", "RET3", "YIELD2_CHG4", "CURVE_CHG4", "DROP", "SPREAD_DELTA"]
+    return engine, base_df, bounds, candidates, baseline_apy
+
+
+@pytest.mark.parametrize("strategy,beam_width,budget", [
+    ("exhaustive", 3, 20),
+    ("greedy",     1, 1000),
+    ("beam",       2, 15),
+])
+def test_elimination_respects_budget(strategy, beam_width, budget):
+    engine, base_df, bounds, candidates, baseline_apy = _elimination_inputs()
+    elimination = {"strategy": strategy, "beam_width": beam_width, "max_evals": budget}
+    best_ignore, evaluated = engine._eliminate_combinations(
+        base_df, bounds, _PARAMS, candidates, baseline_apy, 0.001, elimination)
+
+    k = len(candidates)
+    assert 0 < evaluated <= budget
+    if strategy == "greedy":
+        assert evaluated <= k * (k + 1) // 2
+    assert best_ignore <= set(candidates)
+
+
+def test_exhaustive_elimination_covers_all_subsets():
+    engine, base_df, bounds, candidates, baseline_apy = _elimination_inputs()
+    elimination = {"strategy": "exhaustive", "beam_width": 3, "max_evals": 10_000}
+    _, evaluated = engine._eliminate_combinations(
+        base_df, bounds, _PARAMS, candidates, baseline_apy, 0.001, elimination)
+    assert evaluated == 2 ** len(candidates) - 1
+
+
+# ---------------------------------------------------------------------------
+# Discover-mode grid search
+# ---------------------------------------------------------------------------
+
+_GRIDS = {**{k: [_PARAMS[k]] for k in _PARAMS},
+          "MA": [20, 40, 50], "DROP": [0.01, 0.02], "CHG4": [0.2, 0.25],
+          "SPREAD_DELTA": [1, 2, 3], "YIELD10_DELTA": [1, 2]}
+
+
+def test_grid_search_chunks_match_per_combo_runs(monkeypatch):
+    monkeypatch.setattr(walk_forward, "GRID_CHUNK", 7)
+    monkeypatch.setattr(walk_forward, "GRID_PROGRESS_SECONDS", 0.0)
+    engine = _engine()
+    base_df = engine._prepare_base()
+    bounds = engine._bounds(base_df, "2012-01-01", "2020-12-31")
+    ignore = {"YIELD2_CHG4"}
+
+    statuses = []
+    best = engine._grid_search(base_df, _GRIDS, ignore, bounds,
+                               progress_callback=lambda c, t, s: statuses.append(s))
+
+    combos = [dict(zip(PARAM_NAMES, c))
+              for c in itertools.product(*[_GRIDS[k] for k in PARAM_NAMES])]
+    fresh = _engine()
+    scored = [(fresh._run_on_window(base_df, p, ignore, bounds), i) for i, p in enumerate(combos)]
+    # Highest APY, then fewest trades, then first in grid order
+    (_, i) = min(scored, key=lambda s: (-s[0][0], s[0][1], s[1]))
+    assert best == {k: combos[i][k] for k in PARAM_NAMES}
+    assert statuses and all("/s" in s for s in statuses)
+
+
+def test_cell_and_carry_caches_stay_bounded(monkeypatch):
+    monkeypatch.setattr(walk_forward, "CELL_CACHE_SIZE", 64)
+    monkeypatch.setattr(walk_forward, "CARRY_CACHE_SIZE", 64)
+    engine = _engine()
+    base_df = engine._prepare_base()
+    engine._reset_shared(base_df)
+    bounds = engine._bounds(base_df, base_df.index[0], "2020-12-31")
+    for n in (2, 4, 8):
+        grids = {**_GRIDS, "MA": list(range(20, 20 + 5 * n, 5)), "DROP": [n + 0.01 * i for i in range(n)]}
+        before = engine._cells_evaluated
+        engine._grid_search(base_df, grids, set(), bounds)
+        assert engine._cells_evaluated - before == n * n * 12
+        assert len(engine._cells) <= 64 and len(engine._carry) <= 64
+
+
+def test_anchored_carry_matches_fresh_evaluation():
+    """Results carried from a shorter anchored window equal a from-scratch run on the longer one."""
+    carried = _engine()
+    base_df = carried._prepare_base()
+    short = carried._bounds(base_df, base_df.index[0], "2017-12-31")
+    long = carried._bounds(base_df, base_df.index[0], "2021-12-31")
+    ignore_sets = [set(), {"CHG4"}, {"MA", "DROP"}, {"RET3", "SPREAD_DELTA"}]
+    params = {**_PARAMS, "MA": 30}
+
+    carried._run_ignore_sets(base_df, short, _PARAMS, ignore_sets)
+    carried._run_on_window(base_df, params, _IGNORE, short)
+    assert carried._carried(long, _PARAMS, {"CHG4"}) is not None
+
+    fresh = _engine()
+    assert (carried._run_ignore_sets(base_df, long, _PARAMS, ignore_sets)
+            == fresh._run_ignore_sets(base_df, long, _PARAMS, ignore_sets))
+    assert (carried._run_on_window(base_df, params, _IGNORE, long)
+            == fresh._run_on_window(base_df, params, _IGNORE, long))
+
+
+# ---------------------------------------------------------------------------
+# Window-configuration study
+# ---------------------------------------------------------------------------
+
+_STUDY_CONFIGS = [
+    {"window_size_months": 12, "window_type": "anchored"},
+    {"window_size_months": 12, "window_type": "anchored", "step_months": 6},
+    {"window_size_months": 12, "window_type": "rolling", "training_window_months": 36},
+]
+
+
+def test_study_matches_individual_runs():
+    # No per-factor ranges: refinement grids fall back to unit steps
+    config = SimpleNamespace(sell_triggers={}, buy_conditions={})
+    kwargs = dict(apy_tolerance_bps=10.0, max_combinations=20, seed_source="saved")
+
+    study = WalkForwardEngine("csv", INPUTS_DIR, TICKER, _CASH_RATE, _START_INVESTED, config)
+    rows = study.run_study(_STUDY_CONFIGS, "discover", _PARAMS, **kwargs)
+    assert len(rows) == len(_STUDY_CONFIGS)
+
+    single = WalkForwardEngine("csv", INPUTS_DIR, TICKER, _CASH_RATE, _START_INVESTED, config)
+    for cfg, row in zip(_STUDY_CONFIGS, rows):
+        results, _ = single.run_discover(
+            cfg["window_size_months"], cfg["window_type"], 36,
+            cfg.get("training_window_months", 36), _PARAMS,
+            step_months=cfg.get("step_months"), **kwargs)
+        expected = WalkForwardEngine._summarize(results, "outsample_apy")
+        assert {k: row[k] for k in expected} == expected
+
+    # The overlapping anchored config re-tests every back-to-back window
+    assert rows[1]["cells_reused"] > 0
+    assert rows[1]["cells_evaluated"] < rows[0]["cells_evaluated"] * 2
+
+
+def test_validate_study_reuses_overlapping_windows():
+    rows = _engine().run_study(_STUDY_CONFIGS[:2], "validate", _PARAMS, _IGNORE)
+    for cfg, row in zip(_STUDY_CONFIGS, rows):
+        results = _validate(_engine(), step_months=cfg.get("step_months"))
+        expected = WalkForwardEngine._summarize(results, "strategy_apy")
+        assert {k: row[k] for k in expected} == expected
+
+    assert rows[0]["cells_evaluated"] == rows[0]["windows"] and rows[0]["cells_reused"] == 0
+    # Every back-to-back window is also a window of the overlapping config
+    assert rows[1]["cells_reused"] == rows[0]["windows"]
+    assert rows[1]["cells_evaluated"] == rows[1]["windows"] - rows[0]["windows"]
+
+
+def test_study_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        _engine().run_study(_STUDY_CONFIGS, "bogus", _PARAMS)
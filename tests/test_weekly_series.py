@@ -0,0 +1,65 @@
+"""
+Config-driven indicator loading: shared weekly series cache, extra FRED series as columns.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import data_loader
+from data_loader import DEFAULT_INDICATORS, WeeklyDataLoader, indicator_columns
+from series_store import SeriesStore
+from weekly_series import WeeklySeriesCache
+
+INPUTS_DIR = Path(__file__).parent.parent / "inputs"
+FILES = ["sphy-weekly-adjusted.csv", "hymb-weekly-adjusted.csv", "BAMLH0A0HYM2.csv", "DGS10.csv", "DGS2.csv"]
+
+pytestmark = pytest.mark.skipif(not all((INPUTS_DIR / f).exists() for f in FILES), reason="inputs missing")
+
+
+@pytest.fixture
+def input_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "weekly_cache", WeeklySeriesCache())
+    for name in FILES:
+        shutil.copy(INPUTS_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+def test_indicator_columns_from_config():
+    config = {
+        "credit_spread": {"provider": "fred", "series_id": "BAMLH0A0HYM2"},
+        "yield_10y":     {"provider": "fred", "series_id": "DGS10"},
+        "yield_2y":      {"provider": "fred", "series_id": "DGS2"},
+        "term":          {"provider": "fred", "series_id": "T10Y3M"},
+    }
+    assert indicator_columns(config) == {**DEFAULT_INDICATORS, "T10Y3M": "T10Y3M"}
+    with pytest.raises(ValueError):
+        indicator_columns({"vix": {"provider": "cboe", "series_id": "VIX"}})
+
+
+@pytest.mark.parametrize("use_store", [False, True])
+def test_series_resampled_once_and_shared_across_tickers(input_dir, tmp_path, use_store):
+    store = SeriesStore(tmp_path / "s.sqlite") if use_store else None
+    WeeklyDataLoader("csv", input_dir, "SPHY", store=store).load()
+    WeeklyDataLoader("csv", input_dir, "HYMB", store=store).load("2020-01-01")
+    assert data_loader.weekly_cache.stats() == {"hits": 3, "misses": 3, "entries": 3}
+
+    # A changed series is resampled again; the others are still shared
+    (input_dir / "DGS2.csv").write_text((input_dir / "DGS2.csv").read_text() + "2099-01-01,1.0\n")
+    os.utime(input_dir / "DGS2.csv", ns=(0, 10**9))
+    WeeklyDataLoader("csv", input_dir, "SPHY", store=store).load()
+    assert data_loader.weekly_cache.stats()["misses"] == 4
+
+
+@pytest.mark.parametrize("use_store", [False, True])
+def test_extra_series_is_one_more_column(input_dir, tmp_path, use_store):
+    shutil.copy(input_dir / "DGS10.csv", input_dir / "T10Y3M.csv")
+    store = SeriesStore(tmp_path / "s.sqlite") if use_store else None
+    base = WeeklyDataLoader("csv", input_dir, "SPHY", store=store).load("2018-01-01")
+    extra = WeeklyDataLoader("csv", input_dir, "SPHY", store=store,
+                             indicators={**DEFAULT_INDICATORS, "T10Y3M": "T10Y3M"}).load("2018-01-01")
+
+    assert [c for c in extra.columns if c not in base.columns] == ["T10Y3M"]
+    assert extra["T10Y3M"].equals(extra["DGS10"].rename("T10Y3M"))
+    assert extra.drop(columns="T10Y3M").equals(base)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from helpers import make_weekly_df
+from backtester import Backtester
+from window_stats import WindowStatsIndex
+
+
+def _df(n=60):
+    rng = np.random.default_rng(7)
+    df = make_weekly_df(n)
+    df["Ret"] = rng.normal(0.001, 0.01, n)
+    df.iloc[0, df.columns.get_loc("Ret")] = np.nan   # loader leaves the first Ret NaN
+    return df
+
+
+@pytest.mark.parametrize("start,stop", [(0, 60), (0, 10), (5, 30), (20, 60)])
+def test_buyhold_matches_backtester(start, stop):
+    df = _df()
+    stats = WindowStatsIndex(df, cash_rate=0.04)
+    window = df.iloc[start:stop]
+    expected = Backtester(0.04).run(window, [1] * len(window), [], [])["apy"]
+    assert stats.buyhold_apy(start, stop) == pytest.approx(expected, rel=1e-12)
+
+    rets = window["Ret"].dropna()
+    assert stats.stdev_buyhold(start, stop) == pytest.approx(rets.std() * np.sqrt(52), rel=1e-9)
+
+
+@pytest.mark.parametrize("start,stop", [(0, 60), (5, 30), (20, 60)])
+def test_strategy_stdev_matches_backtester(start, stop):
+    df = _df()
+    stats = WindowStatsIndex(df, cash_rate=0.04)
+    window = df.iloc[start:stop]
+    positions = [1 if (i // 7) % 2 == 0 else 0 for i in range(len(window))]
+    out = Backtester(0.04).run(window, positions, [], [])["df"]
+    expected = out["StratRet"].dropna().std() * np.sqrt(52)
+    assert stats.stdev_strategy(start, stop, positions) == pytest.approx(expected, rel=1e-9)
+
+
+def test_too_few_returns_gives_none():
+    stats = WindowStatsIndex(_df(), cash_rate=0.04)
+    assert stats.stdev_buyhold(0, 2) is None        # one valid return (first is NaN)
+    assert stats.stdev_strategy(0, 2, [1, 0]) is None